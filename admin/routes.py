@@ -4,7 +4,7 @@ Admin Routes Module
 Routes for admin panel functionality including content moderation and event management.
 """
 
-from flask import render_template, redirect, url_for, flash, request, current_app
+from flask import render_template, redirect, url_for, flash, request, current_app, jsonify
 from flask_login import login_required, current_user
 from datetime import datetime
 import os
@@ -15,9 +15,9 @@ from utils.decorators import admin_required
 from utils.constants import FLASH_SUCCESS, FLASH_ERROR, FLASH_WARNING, DEFAULT_PER_PAGE
 from utils.image_utils import save_event_image, delete_file, get_event_image_path
 from utils.query_helpers import paginate_query
-from services import EventService, ResearchService
+from services import EventService, ForumService, MessageService, ResearchService, UserService
 from utils.email_utils import send_event_notification, send_research_status_email, send_announcement_email, is_mail_configured
-from utils.notification_utils import send_research_approved_notification, send_research_rejected_notification
+from utils.notification_utils import get_notification_stats, send_research_approved_notification, send_research_rejected_notification
 from sqlalchemy.exc import IntegrityError
 import json
 
@@ -97,6 +97,7 @@ def edit_user(user_id):
             return redirect(url_for('admin.edit_user', user_id=user.id))
             
         user.name = name
+        MessageService.forget_display_name(user.id)
         user.email = email
         
         role_val = request.form.get('role')
@@ -130,6 +131,7 @@ def delete_user(user_id):
     user = User.query.get_or_404(user_id)
 
     try:
+        ForumService.release_user_activity(user.id)
         db.session.delete(user)
         db.session.commit()
         flash('User deleted successfully.', FLASH_SUCCESS)
@@ -152,14 +154,15 @@ def manage_posts():
     author = request.args.get('author', '')
 
     query = Post.query
+    ordering = [Post.created_at.desc()]
 
     if search:
-        query = query.filter(Post.title.contains(search) | Post.content.contains(search))
+        query, ordering = ForumService.apply_search(query, search)
     if author:
         from models import Profile
         query = query.join(User).join(Profile).filter(Profile.full_name.contains(author))
 
-    posts = paginate_query(query.order_by(Post.created_at.desc()), page)
+    posts = paginate_query(query.order_by(*ordering), page)
 
     return render_template('admin/posts.html',
                          posts=posts,
@@ -263,8 +266,7 @@ def delete_comment(comment_id):
     comment = Comment.query.get_or_404(comment_id)
 
     try:
-        db.session.delete(comment)
-        db.session.commit()
+        ForumService.delete_comment(comment)
         flash('Comment deleted successfully.', FLASH_SUCCESS)
     except Exception:
         db.session.rollback()
@@ -690,7 +692,7 @@ def send_announcement():
             flash('Subject and body are required.', FLASH_ERROR)
             return redirect(url_for('admin.send_announcement'))
         
-        query = User.query.filter(User.email.isnot(None))
+        criteria = [User.email.isnot(None)]
         
         if target_status:
             from models import UserRole
@@ -702,11 +704,11 @@ def send_announcement():
             if 'researcher' in target_status:
                 target_roles.append(UserRole.RESEARCHER)
             if target_roles:
-                query = query.filter(User.role.in_(target_roles))
+                criteria.append(User.role.in_(target_roles))
         
-        recipients = query.all()
+        recipient_count = UserService.count_recipients(*criteria)
         
-        if not recipients:
+        if not recipient_count:
             flash('No users match the selected criteria.', FLASH_WARNING)
             return redirect(url_for('admin.send_announcement'))
         
@@ -718,7 +720,7 @@ def send_announcement():
             subject=subject,
             body=body,
             target_filter=target_filter,
-            recipient_count=len(recipients),
+            recipient_count=recipient_count,
             created_by=current_user.id
         )
         
@@ -726,6 +728,7 @@ def send_announcement():
             db.session.add(announcement)
             db.session.commit()
             
+            recipients = UserService.iter_recipients(*criteria)
             success_count, failure_count, error_msg = send_announcement_email(announcement, recipients)
             
             announcement.success_count = success_count
@@ -752,6 +755,16 @@ def send_announcement():
     return render_template('admin/send_announcement.html', mail_configured=mail_configured, mail_error=mail_error)
 
 
+# ==================== Notification Stats ====================
+
+@admin_bp.route('/notifications/stats')
+@login_required
+@admin_required
+def notification_stats():
+    """Return notification counts by window, type and status as JSON."""
+    return jsonify(get_notification_stats())
+
+
 # ==================== Test Email ====================
 
 @admin_bp.route('/test-email', methods=['GET', 'POST'])
@@ -772,7 +785,7 @@ def test_email():
             return redirect(url_for('admin.test_email'))
         
         try:
-            from utils.email_utils import send_email
+            from utils.email_utils import deliver_email
             from flask import render_template_string
             
             subject = "PSRA Email Test"
@@ -808,7 +821,8 @@ def test_email():
             </html>
             """
             
-            success, error = send_email(subject, [recipient], html_template)
+            # Deliver inline rather than via the outbox so the result reflects the SMTP settings
+            success, error = deliver_email(subject, [recipient], html_template)
             
             if success:
                 flash(f'Test email sent successfully to {recipient}!', FLASH_SUCCESS)
@@ -16,9 +16,20 @@ import csv
 import json
 
 from config import Config
-from models import db, User, Message, Post, Comment, Event, Research, Researcher, ProfileClaim, ApplicationStatus
-from services import EventService, MessageService, ResearchService
-from utils.constants import FLASH_SUCCESS, FLASH_ERROR
+from models import db, User, Post, Comment, Event, Research, Researcher, ProfileClaim, ApplicationStatus
+from services import EventService, ForumService, MessageService, ResearchService
+from utils.constants import (
+    AUTOCOMPLETE_MAX_AGE,
+    FLASH_SUCCESS,
+    FLASH_ERROR,
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_PRUNE_CHUNK_SIZE,
+    TYPING_STATE_MAX_ENTRIES,
+    TYPING_STATE_TTL,
+)
+from utils.socketio_queue import create_client_manager
+from utils.stats_cache import get_home_stats, init_stats_cache
+from utils.ttl_cache import TTLCache
 from extensions import oauth
 from werkzeug.middleware.proxy_fix import ProxyFix
 
@@ -33,8 +44,9 @@ app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=1)
 # Initialize extensions
 db.init_app(app)
 migrate = Migrate(app, db)
+init_stats_cache(app)
 mail = Mail(app)
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio = SocketIO(app, cors_allowed_origins="*", client_manager=create_client_manager(app))
 
 # Initialize LoginManager
 login_manager = LoginManager()
@@ -99,7 +111,7 @@ def load_user(user_id):
 def inject_unread_messages():
     """Make unread message count available to all templates."""
     if current_user.is_authenticated:
-        unread_count = Message.query.filter_by(receiver_id=current_user.id, is_read=False).count()
+        unread_count = MessageService.get_unread_total(current_user.id)
         return {'unread_message_count': unread_count}
     return {'unread_message_count': 0}
 
@@ -127,21 +139,11 @@ app.register_blueprint(hub_bp, url_prefix='/hub')
 @app.route('/')
 def home():
     """Display home page with recent posts and stats."""
-    from models import University
-
     recent_posts = Post.query.order_by(Post.created_at.desc()).limit(5).all()
 
-    active_members_count = User.query.count()
-    research_pubs_count = Research.query.filter_by(is_approved=True).count()
-    events_hosted_count = Event.query.count()
-    partner_unis_count = University.query.filter_by(is_active=True).count()
-
     return render_template('home.html',
                            recent_posts=recent_posts,
-                           active_members_count=active_members_count,
-                           research_pubs_count=research_pubs_count,
-                           events_hosted_count=events_hosted_count,
-                           partner_unis_count=partner_unis_count)
+                           **get_home_stats())
 
 
 @app.route('/dashboard')
@@ -255,7 +257,7 @@ def research():
     
     # Get filter choices and statistics
     year_choices = ResearchService.get_year_choices()
-    researchers = ResearchService.get_all_researchers()
+    researchers = ResearchService.get_researcher_choices()
     statistics = ResearchService.get_research_statistics()
     
     return render_template(
@@ -278,7 +280,7 @@ def research():
 @app.route('/researchers')
 def researchers():
     """Display all researchers page."""
-    researchers_list = ResearchService.get_all_researchers()
+    researchers_list = ResearchService.get_researchers_with_counts()
     statistics = ResearchService.get_research_statistics()
     
     return render_template(
@@ -374,13 +376,20 @@ def submit_research():
 
 @app.route('/api/search-researchers')
 def api_search_researchers():
-    """API endpoint to search researchers for autocomplete."""
+    """API endpoint to search researchers for autocomplete.
+    
+    Responses carry an ETag and may be reused by the browser for
+    AUTOCOMPLETE_MAX_AGE seconds, so repeated prefixes are not re-fetched.
+    """
     query = request.args.get('q', '')
     if len(query) < 2:
         return jsonify([])
     
-    researchers = ResearchService.search_researchers(query, limit=10)
-    return jsonify([{'id': r.id, 'name': r.name} for r in researchers])
+    response = jsonify(ResearchService.search_researchers(query, limit=10))
+    response.cache_control.public = True
+    response.cache_control.max_age = AUTOCOMPLETE_MAX_AGE
+    response.add_etag()
+    return response.make_conditional(request)
 
 
 @app.route('/events')
@@ -524,14 +533,15 @@ def get_next_event():
 @login_required
 def get_unread_count():
     """Get unread message count for current user."""
-    unread_count = Message.query.filter_by(receiver_id=current_user.id, is_read=False).count()
+    unread_count = MessageService.get_unread_total(current_user.id)
     return {'count': unread_count}
 
 
 # ==================== SocketIO Event Handlers ====================
 
-# Global dict to track typing status
-typing_users = {}
+# Senders currently shown as typing, per (conversation, sender); repeat typing_start
+# events are dropped while an entry lives, and entries expire if typing_stop never arrives
+typing_users = TTLCache(maxsize=TYPING_STATE_MAX_ENTRIES, ttl=TYPING_STATE_TTL)
 
 
 @socketio.on('join')
@@ -577,14 +587,17 @@ def handle_typing_start(data):
 
     if sender_id and receiver_id:
         conversation_id = f"{min(sender_id, receiver_id)}_{max(sender_id, receiver_id)}"
-        if conversation_id not in typing_users:
-            typing_users[conversation_id] = {}
-        typing_users[conversation_id][sender_id] = True
+        key = (conversation_id, sender_id)
+        already_typing = key in typing_users
+        typing_users.set(key, True)
+        if already_typing:
+            # The receiver is already showing the indicator
+            return
 
         # Notify the receiver
         receiver_room = f"user_{receiver_id}"
-        user = User.query.get(sender_id)
-        emit('typing_started', {'user_id': sender_id, 'user_name': user.name}, room=receiver_room)
+        user_name = MessageService.get_display_name(sender_id)
+        emit('typing_started', {'user_id': sender_id, 'user_name': user_name}, room=receiver_room)
 
 
 @socketio.on('typing_stop')
@@ -595,8 +608,7 @@ def handle_typing_stop(data):
 
     if sender_id and receiver_id:
         conversation_id = f"{min(sender_id, receiver_id)}_{max(sender_id, receiver_id)}"
-        if conversation_id in typing_users and sender_id in typing_users[conversation_id]:
-            typing_users[conversation_id][sender_id] = False
+        typing_users.pop((conversation_id, sender_id))
 
         # Notify the receiver
         receiver_room = f"user_{receiver_id}"
@@ -605,31 +617,56 @@ def handle_typing_stop(data):
 
 @socketio.on('mark_read')
 def handle_mark_read(data):
-    """Mark messages as read and notify sender."""
+    """Mark messages as read up to a watermark and notify sender."""
     user_id = data.get('user_id')
     other_user_id = data.get('other_user_id')
+    # The watermark comes from the client; anything but a positive ID means "everything"
+    try:
+        up_to_id = int(data.get('up_to_id'))
+    except (TypeError, ValueError):
+        up_to_id = None
+    if up_to_id is not None and up_to_id < 1:
+        up_to_id = None
 
     if user_id and other_user_id:
-        count = MessageService.mark_messages_as_read(user_id, other_user_id)
+        result = MessageService.mark_read_up_to(user_id, other_user_id, up_to_id)
         
-        if count > 0:
-            # Notify sender that messages were read
+        if result['count'] > 0:
+            # Notify sender once with the watermark rather than per message
             sender_room = f"user_{other_user_id}"
             emit('messages_read', {
                 'reader_id': user_id,
-                'read_at': datetime.utcnow().isoformat()
+                'up_to_id': result['up_to_id'],
+                'read_at': result['read_at'].isoformat()
             }, room=sender_room)
 
 
 # ==================== CLI Commands for Notifications ====================
 
 import click
-from utils.notification_utils import send_scheduled_event_reminders, send_new_research_alert
-from utils.email_utils import send_event_reminder_email, send_new_research_email
+from utils.notification_utils import (
+    NotificationLogWriter,
+    prune_notification_logs,
+    send_scheduled_event_reminders,
+    send_new_research_alert,
+)
+from utils.constants import EMAIL_DISPATCH_WORKERS, NOTIFICATION_LOG_CHUNK_SIZE, NOTIFICATION_PRUNE_CHUNK_SIZE
+
+
+def echo_log_throughput(log_writer):
+    """Report how fast notification log rows were written."""
+    click.echo(
+        f'Logged {log_writer.written} notifications in {log_writer.write_seconds:.2f}s '
+        f'({log_writer.rows_per_second:.0f} rows/s).'
+    )
 
 
 @app.cli.command('send-event-reminders')
-def send_event_reminders_command():
+@click.option('--workers', default=EMAIL_DISPATCH_WORKERS, show_default=True,
+              help='Threads rendering and sending reminders')
+@click.option('--log-chunk-size', default=NOTIFICATION_LOG_CHUNK_SIZE, show_default=True,
+              help='Notification log rows written per bulk insert')
+def send_event_reminders_command(workers, log_chunk_size):
     """Send event reminder notifications to users who have them enabled.
     
     This command should be scheduled to run daily via a cron job or task scheduler.
@@ -638,10 +675,13 @@ def send_event_reminders_command():
     click.echo('Sending event reminders...')
     
     try:
-        count = send_scheduled_event_reminders(
-            send_email_func=send_event_reminder_email
-        )
+        with NotificationLogWriter(log_chunk_size) as log_writer:
+            count = send_scheduled_event_reminders(
+                log_writer=log_writer,
+                max_workers=workers
+            )
         click.echo(f'Successfully sent {count} event reminders.')
+        echo_log_throughput(log_writer)
     except Exception as e:
         click.echo(f'Error sending event reminders: {str(e)}', err=True)
         raise
@@ -649,7 +689,11 @@ def send_event_reminders_command():
 
 @app.cli.command('send-new-research-alerts')
 @click.option('--research-id', type=int, help='Send alert for a specific research ID')
-def send_new_research_alerts_command(research_id):
+@click.option('--workers', default=EMAIL_DISPATCH_WORKERS, show_default=True,
+              help='Threads rendering and sending alerts')
+@click.option('--log-chunk-size', default=NOTIFICATION_LOG_CHUNK_SIZE, show_default=True,
+              help='Notification log rows written per bulk insert')
+def send_new_research_alerts_command(research_id, workers, log_chunk_size):
     """Send new research publication alerts to subscribed users.
     
     If research-id is provided, sends alert for that specific research.
@@ -665,10 +709,12 @@ def send_new_research_alerts_command(research_id):
                 click.echo(f'Research with ID {research_id} not found.', err=True)
                 return
             
-            count = send_new_research_alert(
-                research=research,
-                send_email_func=send_new_research_email
-            )
+            with NotificationLogWriter(log_chunk_size) as log_writer:
+                count = send_new_research_alert(
+                    research=research,
+                    log_writer=log_writer,
+                    max_workers=workers
+                )
             click.echo(f'Sent {count} alerts for research: {research.title[:50]}...')
         else:
             # Send alerts for research approved in last 24 hours
@@ -680,14 +726,17 @@ def send_new_research_alerts_command(research_id):
             ).all()
             
             total_sent = 0
-            for research in new_researches:
-                count = send_new_research_alert(
-                    research=research,
-                    send_email_func=send_new_research_email
-                )
-                total_sent += count
+            with NotificationLogWriter(log_chunk_size) as log_writer:
+                for research in new_researches:
+                    count = send_new_research_alert(
+                        research=research,
+                        log_writer=log_writer,
+                        max_workers=workers
+                    )
+                    total_sent += count
             
             click.echo(f'Sent {total_sent} alerts for {len(new_researches)} new research publications.')
+        echo_log_throughput(log_writer)
     except Exception as e:
         click.echo(f'Error sending new research alerts: {str(e)}', err=True)
         raise
@@ -696,38 +745,171 @@ def send_new_research_alerts_command(research_id):
 @app.cli.command('notification-stats')
 def notification_stats_command():
     """Display notification statistics."""
-    from models import NotificationLog
-    from datetime import timedelta
+    from utils.notification_utils import get_notification_stats
     
-    # Get stats for different time periods
-    now = datetime.utcnow()
+    stats = get_notification_stats()
+    by_type = stats['by_type']
     
-    # Last 24 hours
-    day_ago = now - timedelta(hours=24)
-    day_count = NotificationLog.query.filter(NotificationLog.sent_at >= day_ago).count()
+    click.echo('\n=== Notification Statistics ===')
+    click.echo(f"Last 24 hours: {stats['last_24_hours']}")
+    click.echo(f"Last 7 days: {stats['last_7_days']}")
+    click.echo(f"Last 30 days: {stats['last_30_days']}")
+    click.echo('\nBy Type:')
+    click.echo(f"  Event Reminders: {by_type.get('event_reminder', 0)}")
+    click.echo(f"  New Research Alerts: {by_type.get('new_research', 0)}")
+    click.echo(f"  Research Status Updates: {by_type.get('research_status', 0)}")
+    click.echo(f"  Total: {stats['total']}")
+    click.echo('\nBy Status:')
+    for status, count in sorted(stats['by_status'].items()):
+        click.echo(f'  {status.title()}: {count}')
+
+
+@app.cli.command('prune-notification-logs')
+@click.option('--days', type=int, default=None,
+              help='Keep raw rows from this many days (default: NOTIFICATION_LOG_RETENTION_DAYS)')
+@click.option('--chunk-size', default=NOTIFICATION_PRUNE_CHUNK_SIZE, show_default=True,
+              help='Rows rolled up and deleted per transaction')
+def prune_notification_logs_command(days, chunk_size):
+    """Roll old notification log rows into daily counts and delete them.
+    
+    Keeps the notification log small; notification stats keep reporting
+    pruned rows from the daily rollup. Safe to re-run after an interruption.
+    Schedule it daily with cron.
+    """
+    if days is None:
+        days = app.config['NOTIFICATION_LOG_RETENTION_DAYS']
+    if days < 1 or chunk_size < 1:
+        raise click.BadParameter('--days and --chunk-size must be positive')
+    
+    click.echo(f'Pruning notification logs older than {days} days...')
+    result = prune_notification_logs(days, chunk_size=chunk_size)
+    click.echo(
+        f"Rolled up and deleted {result['deleted']} rows across {result['days']} days "
+        f"in {result['chunks']} chunks."
+    )
+
+
+@app.cli.command('rebuild-research-stats')
+def rebuild_research_stats_command():
+    """Rebuild the research statistics snapshot from the research table.
     
-    # Last 7 days
-    week_ago = now - timedelta(days=7)
-    week_count = NotificationLog.query.filter(NotificationLog.sent_at >= week_ago).count()
+    The snapshot is kept up to date by the admin research actions; run this
+    after importing or editing researches outside them.
+    """
+    click.echo('Rebuilding research statistics...')
+    count = ResearchService.rebuild_research_statistics()
+    click.echo(f'Wrote {count} research statistics rows.')
+
+
+@app.cli.command('reconcile-post-counts')
+def reconcile_post_counts_command():
+    """Recount likes and comments and fix post counters that drifted.
     
-    # Last 30 days
-    month_ago = now - timedelta(days=30)
-    month_count = NotificationLog.query.filter(NotificationLog.sent_at >= month_ago).count()
+    The counters are kept up to date by the forum and admin actions; run
+    this after deleting likes or comments outside them.
+    """
+    click.echo('Reconciling post counters...')
+    fixed = ForumService.reconcile_post_counts()
+    click.echo(f'Corrected {fixed} posts.')
+
+
+@app.cli.command('rebuild-search-index')
+@click.option('--index', 'tables', multiple=True, type=click.Choice(['research_search', 'forum_search', 'comment_search']),
+              help='Index to rebuild (repeatable; default all).')
+def rebuild_search_index_command(tables):
+    """Rebuild the full-text search indexes from their source tables.
     
-    # By type
-    event_reminders = NotificationLog.query.filter_by(notification_type='event_reminder').count()
-    research_alerts = NotificationLog.query.filter_by(notification_type='new_research').count()
-    status_updates = NotificationLog.query.filter_by(notification_type='research_status').count()
+    The indexes follow ORM changes automatically; run this after bulk SQL
+    edits or restoring a backup made without them.
+    """
+    from utils.search_index import rebuild_search_indexes
     
-    click.echo('\n=== Notification Statistics ===')
-    click.echo(f'Last 24 hours: {day_count}')
-    click.echo(f'Last 7 days: {week_count}')
-    click.echo(f'Last 30 days: {month_count}')
-    click.echo('\nBy Type:')
-    click.echo(f'  Event Reminders: {event_reminders}')
-    click.echo(f'  New Research Alerts: {research_alerts}')
-    click.echo(f'  Research Status Updates: {status_updates}')
-    click.echo(f'  Total: {event_reminders + research_alerts + status_updates}')
+    click.echo('Rebuilding search indexes...')
+    count = rebuild_search_indexes(tables or None)
+    if count:
+        click.echo(f'Rebuilt {count} search indexes.')
+    else:
+        click.echo('This database has no full-text search support; searches use substring matching.')
+
+
+@app.cli.command('rebuild-message-counters')
+def rebuild_message_counters_command():
+    """Rebuild per-conversation unread counts and latest-message pointers.
+    
+    Recomputes the denormalized counters on conversation participants from
+    the message table. Safe to run at any time to repair drift.
+    """
+    click.echo('Rebuilding message counters...')
+    count = MessageService.rebuild_counters()
+    click.echo(f'Rebuilt counters for {count} conversation participants.')
+
+
+@app.cli.command('email-worker')
+@click.option('--once', is_flag=True, help='Deliver one batch and exit instead of polling')
+@click.option('--batch-size', default=OUTBOX_BATCH_SIZE, show_default=True, help='Messages claimed per batch')
+@click.option('--interval', default=5.0, show_default=True, help='Seconds to wait when the outbox is empty')
+def email_worker_command(once, batch_size, interval):
+    """Deliver queued emails from the outbox.
+    
+    Runs until interrupted, retrying failed messages with backoff and
+    dead-lettering those that keep failing. Run it as a separate service
+    alongside the web workers.
+    """
+    import time
+    from services import OutboxService
+    
+    click.echo('Email worker started.')
+    while True:
+        stats = OutboxService.process_batch(batch_size)
+        processed = stats['sent'] + stats['retried'] + stats['dead']
+        if processed:
+            click.echo(f"Sent {stats['sent']}, retrying {stats['retried']}, dead-lettered {stats['dead']}.")
+        if once:
+            break
+        if processed < batch_size:
+            time.sleep(interval)
+
+
+@app.cli.command('email-outbox')
+@click.option('--requeue-dead', is_flag=True, help='Move dead-lettered emails back to the queue')
+def email_outbox_command(requeue_dead):
+    """Show outbox counts by status, optionally requeueing dead letters."""
+    from services import OutboxService
+    
+    if requeue_dead:
+        count = OutboxService.requeue_dead()
+        click.echo(f'Requeued {count} dead-lettered emails.')
+    
+    click.echo('\n=== Email Outbox ===')
+    for status, count in OutboxService.get_counts().items():
+        click.echo(f'{status.title()}: {count}')
+
+
+@app.cli.command('email-outbox-prune')
+@click.option('--sent-days', type=int, default=None,
+              help='Keep delivered emails from this many days (default: OUTBOX_SENT_RETENTION_DAYS)')
+@click.option('--dead-days', type=int, default=None,
+              help='Keep dead-lettered emails from this many days (default: OUTBOX_DEAD_RETENTION_DAYS)')
+@click.option('--chunk-size', default=OUTBOX_PRUNE_CHUNK_SIZE, show_default=True,
+              help='Rows deleted per transaction')
+def email_outbox_prune_command(sent_days, dead_days, chunk_size):
+    """Delete delivered and dead-lettered emails past their retention.
+    
+    Keeps the outbox from growing with every mailing; pending emails are
+    never touched. Safe to re-run after an interruption. Schedule it daily
+    with cron.
+    """
+    from services import OutboxService
+    
+    if sent_days is None:
+        sent_days = app.config['OUTBOX_SENT_RETENTION_DAYS']
+    if dead_days is None:
+        dead_days = app.config['OUTBOX_DEAD_RETENTION_DAYS']
+    if sent_days < 0 or dead_days < 0 or chunk_size < 1:
+        raise click.BadParameter('--sent-days and --dead-days must not be negative, --chunk-size must be positive')
+    
+    result = OutboxService.prune(sent_days, dead_days, chunk_size=chunk_size)
+    click.echo(f"Deleted {result['sent']} sent and {result['dead']} dead-lettered emails.")
 
 
 # ==================== Application Entry Point ====================
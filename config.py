@@ -37,6 +37,27 @@ class Config:
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER', os.environ.get('MAIL_USERNAME'))
+    # Messages sent over one SMTP connection before it is reopened
+    MAIL_MAX_PER_CONNECTION = int(os.environ.get('MAIL_MAX_PER_CONNECTION', 100))
+    # Concurrent SMTP connections a campaign may open to MAIL_SERVER
+    MAIL_MAX_CONNECTIONS_PER_HOST = int(os.environ.get('MAIL_MAX_CONNECTIONS_PER_HOST', 4))
+    # Queue outgoing mail for the `flask email-worker` process instead of sending inline
+    MAIL_USE_OUTBOX = os.environ.get('MAIL_USE_OUTBOX', 'True').lower() == 'true'
+    
+    # Raw notification log rows older than this are rolled up by `flask prune-notification-logs`
+    NOTIFICATION_LOG_RETENTION_DAYS = int(os.environ.get('NOTIFICATION_LOG_RETENTION_DAYS', 90))
+    # Delivered and dead-lettered outbox emails older than these are deleted by `flask email-outbox-prune`
+    OUTBOX_SENT_RETENTION_DAYS = int(os.environ.get('OUTBOX_SENT_RETENTION_DAYS', 7))
+    OUTBOX_DEAD_RETENTION_DAYS = int(os.environ.get('OUTBOX_DEAD_RETENTION_DAYS', 30))
+    
+    # Home page counters: empty for a per-process cache, sqlite:///<path> or redis://... to share it
+    STATS_CACHE_URL = os.environ.get('STATS_CACHE_URL', '')
+    # Seconds cached counters live; bounds staleness in other workers when the cache is per-process
+    STATS_CACHE_TTL = int(os.environ.get('STATS_CACHE_TTL', 60))
+    
+    # Socket.IO fan-out between worker processes: empty (default) for a single process,
+    # sqlite:///<path> for workers on one host, redis://... for several hosts
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE', '')
 
 
 class DevelopmentConfig(Config):
@@ -68,6 +89,7 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
+    SOCKETIO_MESSAGE_QUEUE = ''
 
 
 # Configuration dictionary for easy access
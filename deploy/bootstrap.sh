@@ -91,6 +91,8 @@ User=$APP_USER
 Group=www-data
 WorkingDirectory=$APP_DIR
 Environment="PATH=$APP_DIR/venv/bin"
+# Both workers run on this host, so a shared SQLite file fans out Socket.IO emits between them
+Environment="SOCKETIO_MESSAGE_QUEUE=sqlite:///socketio_queue.db"
 # Loading .env variables automatically (requires python-dotenv in app, or EnvironmentFile if preferred)
 # Since we have 1GB RAM, using 2 workers and 2 threads to be conservative.
 ExecStart=$APP_DIR/venv/bin/gunicorn --workers 2 --threads 2 --bind 127.0.0.1:8000 --access-logfile - --error-logfile - app:app
@@ -101,10 +103,34 @@ RestartSec=5s
 WantedBy=multi-user.target
 EOF
 
-echo "-> Reloading systemd and enabling Gunicorn service..."
+# Background worker that delivers queued emails from the outbox
+WORKER_SERVICE_FILE="/etc/systemd/system/psra_email_worker.service"
+
+cat <<EOF > "$WORKER_SERVICE_FILE"
+[Unit]
+Description=PSRA-Flask email outbox worker
+After=network.target
+
+[Service]
+User=$APP_USER
+Group=www-data
+WorkingDirectory=$APP_DIR
+Environment="PATH=$APP_DIR/venv/bin"
+Environment="FLASK_APP=app"
+ExecStart=$APP_DIR/venv/bin/flask email-worker
+Restart=on-failure
+RestartSec=5s
+
+[Install]
+WantedBy=multi-user.target
+EOF
+
+echo "-> Reloading systemd and enabling Gunicorn and email worker services..."
 systemctl daemon-reload
 systemctl enable psra_flask.service
 systemctl start psra_flask.service
+systemctl enable psra_email_worker.service
+systemctl start psra_email_worker.service
 
 # Check Gunicorn Status
 if systemctl is-active --quiet psra_flask.service; then
@@ -115,9 +141,9 @@ else
     exit 1
 fi
 
-# 9. Grant the flaskapp user sudo access JUST for restarting the Gunicorn service (needed for update.sh)
+# 9. Grant the flaskapp user sudo access JUST for restarting the app services (needed for update.sh)
 echo "-> Configuring sudoers for deployment script..."
-echo "$APP_USER ALL=(ALL) NOPASSWD: /bin/systemctl restart psra_flask.service" > "/etc/sudoers.d/$APP_USER"
+echo "$APP_USER ALL=(ALL) NOPASSWD: /bin/systemctl restart psra_flask.service, /bin/systemctl restart psra_email_worker.service" > "/etc/sudoers.d/$APP_USER"
 chmod 0440 "/etc/sudoers.d/$APP_USER"
 
 # 10. Configure Nginx
@@ -50,6 +50,7 @@ pip install -r requirements.txt
 echo "-> Restarting Gunicorn service..."
 # Use sudo to restart the service (flaskapp user has NOPASSWD access configured in bootstrap.sh)
 sudo systemctl restart psra_flask.service
+sudo systemctl restart psra_email_worker.service
 
 # 5. Check Service Status
 echo "-> Verifying Gunicorn status..."
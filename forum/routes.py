@@ -4,17 +4,20 @@ Forum Routes Module
 Routes for forum functionality including posts, comments, profiles, and messaging.
 """
 
-from flask import render_template, redirect, url_for, flash, request, current_app
+from flask import abort, render_template, redirect, url_for, flash, request, current_app
 from flask_login import login_user, logout_user, login_required, current_user
 from datetime import datetime
 import json
 
+from sqlalchemy.orm import joinedload
+
 from . import forum_bp
 from .forms import LoginForm, RegisterForm, PostForm, CommentForm, ProfileForm, PasswordChangeForm, MessageForm, MentorshipSettingsForm
-from models import db, User, UserRole, Profile, StudentProfile, AlumniProfile, ResearcherProfile, Post, Comment, Like, Message
+from models import db, User, UserRole, Profile, StudentProfile, AlumniProfile, ResearcherProfile, Post, Message
 from utils import get_user_timeline, safe_json_parse, FLASH_SUCCESS, FLASH_ERROR
 from utils.image_utils import process_profile_picture
-from services import MessageService, UserService
+from utils.constants import COMMENT_PAGE_SIZE, FORUM_PAGE_SIZE, HISTORY_PAGE_SIZE, MAX_PER_PAGE
+from services import ForumService, MessageService, UserService
 
 
 def resolve_role_and_track(account_type):
@@ -127,29 +130,38 @@ def terms():
 
 @forum_bp.route('/')
 def forum_main():
-    """Display main forum page with posts."""
+    """Display one page of the forum feed."""
     search = request.args.get('search')
-    
-    query = Post.query
+    cursor = request.args.get('cursor')
+    limit = request.args.get('limit', FORUM_PAGE_SIZE, type=int)
+    limit = max(1, min(limit, MAX_PER_PAGE))
+
+    viewer_id = current_user.id if current_user.is_authenticated else None
+
+    next_cursor = next_page = None
     if search:
-        query = query.filter(Post.title.contains(search) | Post.content.contains(search))
-    
-    posts = query.order_by(Post.created_at.desc()).all()
+        page = request.args.get('page', 1, type=int)
+        entries, next_page = ForumService.search_posts(search, page=page, per_page=limit, viewer_id=viewer_id)
+        first_page = page <= 1
+    else:
+        entries, next_cursor = ForumService.get_feed_page(limit=limit, cursor=cursor, viewer_id=viewer_id)
+        first_page = not cursor
 
     # Return JSON for AJAX requests
     if request.headers.get('Accept') == 'application/json':
-        posts_data = [{
-            'id': post.id,
-            'title': post.title,
-            'content': post.content[:200] + '...' if len(post.content) > 200 else post.content,
-            'author': post.author.name,
-            'created_at': post.created_at.strftime('%B %d, %Y at %I:%M %p'),
-            'likes': len(post.likes),
-            'comments': len(post.comments)
-        } for post in posts]
-        return {'posts': posts_data}
+        return {
+            'posts': [ForumService.get_feed_entry_data(entry) for entry in entries],
+            'next_cursor': next_cursor,
+            'next_page': next_page
+        }
+
+    # The header count is shown on the first page only; count when it is not the page itself
+    total_posts = None
+    if first_page:
+        total_posts = ForumService.count_posts(search) if next_cursor or next_page else len(entries)
 
-    return render_template('forum_main.html', posts=posts, search=search)
+    return render_template('forum_main.html', entries=entries, next_cursor=next_cursor, next_page=next_page,
+                           total_posts=total_posts, search=search)
 
 
 @forum_bp.route('/create', methods=['GET', 'POST'])
@@ -173,25 +185,39 @@ def create_post():
 @forum_bp.route('/post/<int:post_id>')
 def post_detail(post_id):
     """Display a single post with comments."""
-    post = Post.query.get_or_404(post_id)
-    comments = Comment.query.filter_by(post_id=post_id).order_by(Comment.created_at.asc()).all()
+    post = Post.query.options(joinedload(Post.author).joinedload(User.profile)).get_or_404(post_id)
+    # Only the first page is rendered; later pages are fetched with "load more"
+    comments, next_cursor = ForumService.get_comment_page(post_id)
+    liked = current_user.is_authenticated and ForumService.has_liked(current_user.id, post_id)
     form = CommentForm()
-    return render_template('post_detail.html', post=post, comments=comments, form=form)
+    return render_template('post_detail.html', post=post, comments=comments, next_cursor=next_cursor,
+                           liked=liked, form=form)
+
+
+@forum_bp.route('/post/<int:post_id>/comments')
+def post_comments(post_id):
+    """Return a later page of a post's comments as JSON for "load more"."""
+    if not db.session.query(Post.id).filter_by(id=post_id).first():
+        abort(404)
+    cursor = request.args.get('cursor')
+    limit = request.args.get('limit', COMMENT_PAGE_SIZE, type=int)
+    limit = max(1, min(limit, MAX_PER_PAGE))
+
+    comments, next_cursor = ForumService.get_comment_page(post_id, cursor=cursor, limit=limit)
+    return {
+        'comments': [ForumService.get_comment_data(comment) for comment in comments],
+        'next_cursor': next_cursor
+    }
 
 
 @forum_bp.route('/post/<int:post_id>/comment', methods=['POST'])
 @login_required
 def add_comment(post_id):
     """Add a comment to a post."""
+    Post.query.get_or_404(post_id)
     form = CommentForm()
     if form.validate_on_submit():
-        comment = Comment(
-            post_id=post_id,
-            user_id=current_user.id,
-            content=form.content.data
-        )
-        db.session.add(comment)
-        db.session.commit()
+        ForumService.add_comment(post_id, current_user.id, form.content.data)
     return redirect(url_for('forum.post_detail', post_id=post_id))
 
 
@@ -199,14 +225,11 @@ def add_comment(post_id):
 @login_required
 def toggle_like(post_id):
     """Toggle like on a post."""
-    like = Like.query.filter_by(user_id=current_user.id, post_id=post_id).first()
-    if like:
-        db.session.delete(like)
-    else:
-        like = Like(user_id=current_user.id, post_id=post_id)
-        db.session.add(like)
-    db.session.commit()
-    return {'likes': len(Post.query.get(post_id).likes)}
+    result = ForumService.toggle_like(current_user.id, post_id)
+    if result is None:
+        abort(404)
+    liked, likes = result
+    return {'likes': likes, 'liked': liked}
 
 
 # ==================== Profile Routes ====================
@@ -255,6 +278,7 @@ def edit_profile():
 
         # Update basic fields
         current_user.name = profile_form.name.data
+        MessageService.forget_display_name(current_user.id)
         current_user.role = role
         current_user.headline = profile_form.headline.data
         current_user.location = profile_form.location.data
@@ -375,8 +399,9 @@ def mentorship_settings():
 @login_required
 def messages():
     """Display all conversations for current user."""
-    conversations = MessageService.get_conversations(current_user.id)
-    return render_template('messages.html', conversations=conversations)
+    cursor = request.args.get('cursor')
+    conversations, next_cursor = MessageService.get_inbox_page(current_user.id, cursor=cursor)
+    return render_template('messages.html', conversations=conversations, next_cursor=next_cursor)
 
 
 @forum_bp.route('/messages/send/<int:user_id>', methods=['GET', 'POST'])
@@ -435,15 +460,34 @@ def conversation(user_id):
         flash('You cannot view messages with yourself.', FLASH_ERROR)
         return redirect(url_for('forum.messages'))
 
-    # Get grouped messages
-    grouped_messages = MessageService.get_grouped_messages(current_user.id, user_id)
+    # Only the newest page is rendered; older pages are fetched on scroll
+    messages, before_id = MessageService.get_history_page(current_user.id, user_id)
+    grouped_messages = MessageService.group_messages_by_date(messages)
     
     # Mark received messages as read
     MessageService.mark_messages_as_read(current_user.id, user_id)
 
     form = MessageForm()
     today = datetime.now().date()
-    return render_template('conversation.html', grouped_messages=grouped_messages, other_user=other_user, form=form, today=today)
+    return render_template('conversation.html', grouped_messages=grouped_messages, other_user=other_user,
+                           form=form, today=today, before_id=before_id)
+
+
+@forum_bp.route('/messages/conversation/<int:user_id>/history')
+@login_required
+def conversation_history(user_id):
+    """Return an older page of a conversation as JSON for scroll-back."""
+    before_id = request.args.get('before_id', type=int)
+    limit = request.args.get('limit', HISTORY_PAGE_SIZE, type=int)
+    limit = max(1, min(limit, MAX_PER_PAGE))
+
+    messages, next_before_id = MessageService.get_history_page(
+        current_user.id, user_id, before_id=before_id, limit=limit
+    )
+    return {
+        'messages': [MessageService.get_message_data(message) for message in messages],
+        'next_before_id': next_before_id
+    }
 
 
 @forum_bp.route('/messages/reply/<int:user_id>', methods=['POST'])
@@ -0,0 +1,79 @@
+"""Backfill conversation_id on legacy messages
+
+Revision ID: 3c9e1f7a2b40
+Revises: a1bdfc5b0d2c
+Create Date: 2026-10-17 09:12:41.503218
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9e1f7a2b40'
+down_revision = 'a1bdfc5b0d2c'
+branch_labels = None
+depends_on = None
+
+
+metadata = sa.MetaData()
+
+conversations = sa.Table(
+    'conversations', metadata,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('created_at', sa.DateTime),
+)
+
+conversation_participants = sa.Table(
+    'conversation_participants', metadata,
+    sa.Column('conversation_id', sa.Integer, primary_key=True),
+    sa.Column('user_id', sa.Integer, primary_key=True),
+)
+
+
+def upgrade():
+    # Messages sent before the conversation tables existed have no
+    # conversation_id. The inbox is now resolved through those tables,
+    # so attach every legacy message to its pair's conversation.
+    bind = op.get_bind()
+    pairs = bind.execute(sa.text(
+        'SELECT DISTINCT sender_id, receiver_id FROM message WHERE conversation_id IS NULL'
+    )).fetchall()
+
+    resolved = set()
+    for sender_id, receiver_id in pairs:
+        first, second = min(sender_id, receiver_id), max(sender_id, receiver_id)
+        if (first, second) in resolved:
+            continue
+        resolved.add((first, second))
+
+        existing = bind.execute(sa.text(
+            'SELECT cp1.conversation_id FROM conversation_participants cp1 '
+            'JOIN conversation_participants cp2 ON cp1.conversation_id = cp2.conversation_id '
+            'WHERE cp1.user_id = :first AND cp2.user_id = :second'
+        ), {'first': first, 'second': second}).first()
+
+        if existing:
+            conversation_id = existing[0]
+        else:
+            result = bind.execute(conversations.insert().values(created_at=datetime.utcnow()))
+            conversation_id = result.inserted_primary_key[0]
+            participant_ids = {first, second}
+            bind.execute(conversation_participants.insert(), [
+                {'conversation_id': conversation_id, 'user_id': user_id}
+                for user_id in participant_ids
+            ])
+
+        bind.execute(sa.text(
+            'UPDATE message SET conversation_id = :conversation_id '
+            'WHERE conversation_id IS NULL AND ('
+            '(sender_id = :first AND receiver_id = :second) OR '
+            '(sender_id = :second AND receiver_id = :first))'
+        ), {'conversation_id': conversation_id, 'first': first, 'second': second})
+
+
+def downgrade():
+    # Data-only migration: the assigned conversations are valid either way.
+    pass
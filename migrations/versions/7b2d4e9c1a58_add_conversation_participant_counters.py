@@ -0,0 +1,49 @@
+"""Add unread_count and last_message_id to conversation participants
+
+Revision ID: 7b2d4e9c1a58
+Revises: 3c9e1f7a2b40
+Create Date: 2026-10-17 11:03:27.118402
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2d4e9c1a58'
+down_revision = '3c9e1f7a2b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('conversation_participants', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('unread_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('last_message_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_conversation_participants_user_id'), ['user_id'], unique=False)
+        batch_op.create_foreign_key('fk_conversation_participants_last_message_id_message',
+                                    'message', ['last_message_id'], ['id'], ondelete='SET NULL')
+
+    # Backfill the counters from existing messages
+    op.execute(
+        'UPDATE conversation_participants SET '
+        'unread_count = ('
+        '  SELECT COUNT(*) FROM message'
+        '  WHERE message.conversation_id = conversation_participants.conversation_id'
+        '  AND message.receiver_id = conversation_participants.user_id'
+        '  AND message.is_read = false'
+        '), '
+        'last_message_id = ('
+        '  SELECT message.id FROM message'
+        '  WHERE message.conversation_id = conversation_participants.conversation_id'
+        '  ORDER BY message.created_at DESC, message.id DESC LIMIT 1'
+        ')'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('conversation_participants', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_conversation_participants_last_message_id_message', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_conversation_participants_user_id'))
+        batch_op.drop_column('last_message_id')
+        batch_op.drop_column('unread_count')
@@ -0,0 +1,94 @@
+"""Index forum comments separately
+
+Revision ID: a3d7f1c9e520
+Revises: f4b8d2e6a931
+Create Date: 2026-10-19 11:08:52.374016
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3d7f1c9e520'
+down_revision = 'f4b8d2e6a931'
+branch_labels = None
+depends_on = None
+
+
+POST_SOURCE = 'SELECT post.id AS id, post.title AS title, post.content AS content FROM post'
+COMMENT_SOURCE = 'SELECT comment.id AS id, comment.post_id AS post_id, comment.content AS content FROM comment'
+
+
+def folded_source(comments):
+    # The previous layout: comments folded into one document per post
+    return (
+        'SELECT post.id AS id, post.title AS title, post.content AS content, '
+        f'(SELECT {comments} FROM comment WHERE comment.post_id = post.id) AS comments '
+        'FROM post'
+    )
+
+
+SQLITE_FOLDED_SOURCE = folded_source("group_concat(comment.content, ' ')")
+POSTGRESQL_FOLDED_SOURCE = folded_source("string_agg(comment.content, ' ')")
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute('DROP TABLE forum_search')
+        op.execute("CREATE VIRTUAL TABLE forum_search USING fts5(title, content, tokenize='porter unicode61')")
+        op.execute(
+            'INSERT INTO forum_search (rowid, title, content) '
+            f'SELECT src.id, src.title, src.content FROM ({POST_SOURCE}) AS src'
+        )
+        op.execute(
+            "CREATE VIRTUAL TABLE comment_search "
+            "USING fts5(content, post_id UNINDEXED, tokenize='porter unicode61')"
+        )
+        op.execute(
+            'INSERT INTO comment_search (rowid, content, post_id) '
+            f'SELECT src.id, src.content, src.post_id FROM ({COMMENT_SOURCE}) AS src'
+        )
+    elif dialect == 'postgresql':
+        op.execute(
+            'UPDATE forum_search SET document = '
+            "setweight(to_tsvector('english', coalesce(src.title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(src.content, '')), 'B') "
+            f'FROM ({POST_SOURCE}) AS src WHERE src.id = forum_search.id'
+        )
+        op.execute(
+            'CREATE TABLE comment_search '
+            '(id INTEGER PRIMARY KEY, post_id INTEGER NOT NULL, document TSVECTOR NOT NULL)'
+        )
+        op.execute(
+            'INSERT INTO comment_search (id, post_id, document) '
+            "SELECT src.id, src.post_id, setweight(to_tsvector('english', coalesce(src.content, '')), 'C') "
+            f'FROM ({COMMENT_SOURCE}) AS src'
+        )
+        op.execute('CREATE INDEX ix_comment_search_document ON comment_search USING GIN (document)')
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute('DROP TABLE comment_search')
+        op.execute('DROP TABLE forum_search')
+        op.execute(
+            "CREATE VIRTUAL TABLE forum_search "
+            "USING fts5(title, content, comments, tokenize='porter unicode61')"
+        )
+        op.execute(
+            'INSERT INTO forum_search (rowid, title, content, comments) '
+            'SELECT src.id, src.title, src.content, src.comments '
+            f'FROM ({SQLITE_FOLDED_SOURCE}) AS src'
+        )
+    elif dialect == 'postgresql':
+        op.execute('DROP TABLE comment_search')
+        op.execute(
+            'UPDATE forum_search SET document = '
+            "setweight(to_tsvector('english', coalesce(src.title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(src.content, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(src.comments, '')), 'C') "
+            f'FROM ({POSTGRESQL_FOLDED_SOURCE}) AS src WHERE src.id = forum_search.id'
+        )
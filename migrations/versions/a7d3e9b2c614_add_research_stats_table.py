@@ -0,0 +1,51 @@
+"""Add research stats snapshot table
+
+Revision ID: a7d3e9b2c614
+Revises: f2a6c8d1e047
+Create Date: 2026-10-17 23:05:48.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3e9b2c614'
+down_revision = 'f2a6c8d1e047'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    research_stats = op.create_table('research_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('dimension', sa.String(length=20), nullable=False),
+    sa.Column('value', sa.String(length=200), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('dimension', 'value', name='uq_research_stats_dimension_value')
+    )
+
+    # Backfill from the approved researches already in the table
+    research = sa.table('research',
+        sa.column('id', sa.Integer),
+        sa.column('department', sa.String),
+        sa.column('year', sa.Integer),
+        sa.column('researcher_id', sa.Integer),
+        sa.column('is_approved', sa.Boolean),
+    )
+    approved = research.c.is_approved == sa.true()
+    columns = ['dimension', 'value', 'count']
+    op.execute(research_stats.insert().from_select(columns, sa.select(
+        sa.literal('total'), sa.literal(''), sa.func.count(research.c.id)
+    ).where(approved).having(sa.func.count(research.c.id) > 0)))
+    for dimension, column in [('department', research.c.department),
+                              ('year', research.c.year),
+                              ('researcher', research.c.researcher_id)]:
+        op.execute(research_stats.insert().from_select(columns, sa.select(
+            sa.literal(dimension), sa.cast(column, sa.String), sa.func.count(research.c.id)
+        ).where(approved).group_by(column)))
+
+
+def downgrade():
+    op.drop_table('research_stats')
@@ -0,0 +1,58 @@
+"""Add forum full-text search index
+
+Revision ID: b6f0d3c8e215
+Revises: e8c4a2f6b193
+Create Date: 2026-10-18 10:27:05.861342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6f0d3c8e215'
+down_revision = 'e8c4a2f6b193'
+branch_labels = None
+depends_on = None
+
+
+def source(comments):
+    # Comments are folded into one document per post
+    return (
+        'SELECT post.id AS id, post.title AS title, post.content AS content, '
+        f'(SELECT {comments} FROM comment WHERE comment.post_id = post.id) AS comments '
+        'FROM post'
+    )
+
+
+SQLITE_SOURCE = source("group_concat(comment.content, ' ')")
+POSTGRESQL_SOURCE = source("string_agg(comment.content, ' ')")
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE forum_search "
+            "USING fts5(title, content, comments, tokenize='porter unicode61')"
+        )
+        op.execute(
+            'INSERT INTO forum_search (rowid, title, content, comments) '
+            'SELECT src.id, src.title, src.content, src.comments '
+            f'FROM ({SQLITE_SOURCE}) AS src'
+        )
+    elif dialect == 'postgresql':
+        op.execute('CREATE TABLE forum_search (id INTEGER PRIMARY KEY, document TSVECTOR NOT NULL)')
+        op.execute(
+            'INSERT INTO forum_search (id, document) '
+            "SELECT src.id, setweight(to_tsvector('english', coalesce(src.title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(src.content, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(src.comments, '')), 'C') "
+            f'FROM ({POSTGRESQL_SOURCE}) AS src'
+        )
+        op.execute('CREATE INDEX ix_forum_search_document ON forum_search USING GIN (document)')
+
+
+def downgrade():
+    if op.get_bind().dialect.name in ('sqlite', 'postgresql'):
+        op.execute('DROP TABLE forum_search')
@@ -0,0 +1,42 @@
+"""Add notification campaigns and notification log dedupe index
+
+Revision ID: b8e2d5f4a913
+Revises: e5f19b7c2d83
+Create Date: 2026-10-17 21:04:12.583190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e2d5f4a913'
+down_revision = 'e5f19b7c2d83'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('notification_campaign',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('notification_type', sa.String(length=50), nullable=False),
+    sa.Column('reference_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('last_user_id', sa.Integer(), nullable=False),
+    sa.Column('sent_count', sa.Integer(), nullable=False),
+    sa.Column('failed_count', sa.Integer(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('notification_type', 'reference_id', name='uq_notification_campaign_type_reference')
+    )
+    with op.batch_alter_table('notification_log', schema=None) as batch_op:
+        batch_op.create_index('ix_notification_log_type_reference_user', ['notification_type', 'reference_id', 'user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('notification_log', schema=None) as batch_op:
+        batch_op.drop_index('ix_notification_log_type_reference_user')
+
+    op.drop_table('notification_campaign')
@@ -0,0 +1,26 @@
+"""Add comment thread index
+
+Revision ID: c2a9e7d4f068
+Revises: b6f0d3c8e215
+Create Date: 2026-10-18 11:48:32.207915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2a9e7d4f068'
+down_revision = 'b6f0d3c8e215'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('comment', schema=None) as batch_op:
+        batch_op.create_index('ix_comment_post_created_id', ['post_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('comment', schema=None) as batch_op:
+        batch_op.drop_index('ix_comment_post_created_id')
@@ -0,0 +1,28 @@
+"""Add notification log indexes for stats
+
+Revision ID: c3f7a1e9d452
+Revises: b8e2d5f4a913
+Create Date: 2026-10-17 21:47:36.104928
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f7a1e9d452'
+down_revision = 'b8e2d5f4a913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('notification_log', schema=None) as batch_op:
+        batch_op.create_index('ix_notification_log_type_status', ['notification_type', 'status'], unique=False)
+        batch_op.create_index('ix_notification_log_sent_at', ['sent_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('notification_log', schema=None) as batch_op:
+        batch_op.drop_index('ix_notification_log_sent_at')
+        batch_op.drop_index('ix_notification_log_type_status')
@@ -0,0 +1,26 @@
+"""Add composite index for keyset conversation history
+
+Revision ID: d4a8c3e61f27
+Revises: 7b2d4e9c1a58
+Create Date: 2026-10-17 13:41:09.662185
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a8c3e61f27'
+down_revision = '7b2d4e9c1a58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('message', schema=None) as batch_op:
+        batch_op.create_index('ix_message_conversation_created_id', ['conversation_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('message', schema=None) as batch_op:
+        batch_op.drop_index('ix_message_conversation_created_id')
@@ -0,0 +1,49 @@
+"""Add research full-text search index
+
+Revision ID: d9b4f1a7e350
+Revises: a7d3e9b2c614
+Create Date: 2026-10-17 23:41:19.275830
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9b4f1a7e350'
+down_revision = 'a7d3e9b2c614'
+branch_labels = None
+depends_on = None
+
+
+SOURCE = (
+    'SELECT research.id AS id, research.title AS title, researcher.name AS researcher_name '
+    'FROM research JOIN researcher ON researcher.id = research.researcher_id'
+)
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE research_search "
+            "USING fts5(title, researcher_name, tokenize='porter unicode61')"
+        )
+        op.execute(
+            'INSERT INTO research_search (rowid, title, researcher_name) '
+            f'SELECT src.id, src.title, src.researcher_name FROM ({SOURCE}) AS src'
+        )
+    elif dialect == 'postgresql':
+        op.execute('CREATE TABLE research_search (id INTEGER PRIMARY KEY, document TSVECTOR NOT NULL)')
+        op.execute(
+            'INSERT INTO research_search (id, document) '
+            "SELECT src.id, setweight(to_tsvector('english', coalesce(src.title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(src.researcher_name, '')), 'B') "
+            f'FROM ({SOURCE}) AS src'
+        )
+        op.execute('CREATE INDEX ix_research_search_document ON research_search USING GIN (document)')
+
+
+def downgrade():
+    if op.get_bind().dialect.name in ('sqlite', 'postgresql'):
+        op.execute('DROP TABLE research_search')
@@ -0,0 +1,35 @@
+"""Add like_count and comment_count to post
+
+Revision ID: e8c4a2f6b193
+Revises: d9b4f1a7e350
+Create Date: 2026-10-18 09:12:44.503117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8c4a2f6b193'
+down_revision = 'd9b4f1a7e350'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('post', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('like_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill the counters from existing likes and comments
+    op.execute(
+        'UPDATE post SET '
+        'like_count = (SELECT COUNT(*) FROM "like" WHERE "like".post_id = post.id), '
+        'comment_count = (SELECT COUNT(*) FROM comment WHERE comment.post_id = post.id)'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('post', schema=None) as batch_op:
+        batch_op.drop_column('comment_count')
+        batch_op.drop_column('like_count')
@@ -0,0 +1,32 @@
+"""Add notification daily stats rollup table
+
+Revision ID: f2a6c8d1e047
+Revises: c3f7a1e9d452
+Create Date: 2026-10-17 22:31:05.417263
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a6c8d1e047'
+down_revision = 'c3f7a1e9d452'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('notification_daily_stat',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('notification_type', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('day', 'notification_type', 'status', name='uq_notification_daily_stat_day_type_status')
+    )
+
+
+def downgrade():
+    op.drop_table('notification_daily_stat')
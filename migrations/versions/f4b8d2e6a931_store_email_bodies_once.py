@@ -0,0 +1,88 @@
+"""Store email bodies once
+
+Revision ID: f4b8d2e6a931
+Revises: c2a9e7d4f068
+Create Date: 2026-10-19 10:26:14.583120
+
+"""
+import hashlib
+import json
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4b8d2e6a931'
+down_revision = 'c2a9e7d4f068'
+branch_labels = None
+depends_on = None
+
+
+metadata = sa.MetaData()
+
+email_body = sa.Table(
+    'email_body', metadata,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('digest', sa.String(64)),
+    sa.Column('html_body', sa.Text),
+    sa.Column('text_body', sa.Text),
+    sa.Column('created_at', sa.DateTime),
+)
+
+
+def upgrade():
+    op.create_table('email_body',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('digest', sa.String(length=64), nullable=False),
+    sa.Column('html_body', sa.Text(), nullable=False),
+    sa.Column('text_body', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('digest')
+    )
+    with op.batch_alter_table('email_outbox', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('body_id', sa.Integer(), nullable=True))
+
+    # Move queued content into email_body, one row per distinct body, with
+    # the digest OutboxService.store_body computes
+    bind = op.get_bind()
+    body_ids = {}
+    rows = bind.execute(sa.text('SELECT id, html_body, text_body FROM email_outbox')).fetchall()
+    for entry_id, html_body, text_body in rows:
+        digest = hashlib.sha256(json.dumps([html_body, text_body]).encode()).hexdigest()
+        if digest not in body_ids:
+            result = bind.execute(email_body.insert().values(
+                digest=digest, html_body=html_body, text_body=text_body, created_at=datetime.utcnow()
+            ))
+            body_ids[digest] = result.inserted_primary_key[0]
+        bind.execute(sa.text('UPDATE email_outbox SET body_id = :body_id WHERE id = :id'),
+                     {'body_id': body_ids[digest], 'id': entry_id})
+
+    with op.batch_alter_table('email_outbox', schema=None) as batch_op:
+        batch_op.alter_column('body_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_index(batch_op.f('ix_email_outbox_body_id'), ['body_id'], unique=False)
+        batch_op.create_foreign_key('fk_email_outbox_body_id_email_body', 'email_body', ['body_id'], ['id'])
+        batch_op.drop_column('html_body')
+        batch_op.drop_column('text_body')
+
+
+def downgrade():
+    with op.batch_alter_table('email_outbox', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('html_body', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('text_body', sa.Text(), nullable=True))
+
+    op.execute(
+        'UPDATE email_outbox SET '
+        'html_body = (SELECT html_body FROM email_body WHERE email_body.id = email_outbox.body_id), '
+        'text_body = (SELECT text_body FROM email_body WHERE email_body.id = email_outbox.body_id)'
+    )
+
+    with op.batch_alter_table('email_outbox', schema=None) as batch_op:
+        batch_op.alter_column('html_body', existing_type=sa.Text(), nullable=False)
+        batch_op.drop_constraint('fk_email_outbox_body_id_email_body', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_email_outbox_body_id'))
+        batch_op.drop_column('body_id')
+
+    op.drop_table('email_body')
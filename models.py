@@ -354,6 +354,9 @@ class Post(db.Model):
     content = db.Column(db.Text, nullable=False)
     image_url = db.Column(db.String(200), default=None)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Denormalized counters, maintained by ForumService
+    like_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    comment_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     comments = db.relationship('Comment', backref='post', lazy=True, cascade='all, delete-orphan')
     likes = db.relationship('Like', backref='post', lazy=True, cascade='all, delete-orphan')
@@ -367,6 +370,8 @@ class Comment(db.Model):
 
     author = db.relationship('User', back_populates='comments')
 
+    __table_args__ = (db.Index('ix_comment_post_created_id', 'post_id', 'created_at', 'id'),)
+
 class Like(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -399,6 +404,8 @@ class Message(db.Model):
     sender = db.relationship('User', foreign_keys=[sender_id], backref='sent_messages')
     receiver = db.relationship('User', foreign_keys=[receiver_id], backref='received_messages')
 
+    __table_args__ = (db.Index('ix_message_conversation_created_id', 'conversation_id', 'created_at', 'id'),)
+
 
 class Researcher(db.Model):
     """Model for researchers (doctors and students) who author research papers."""
@@ -445,6 +452,20 @@ class Research(db.Model):
         ]
 
 
+class ResearchStat(db.Model):
+    """Approved research counts per dimension value, kept in step by ResearchService."""
+    __tablename__ = 'research_stats'
+    id = db.Column(db.Integer, primary_key=True)
+    dimension = db.Column(db.String(20), nullable=False)  # 'total', 'department', 'year' or 'researcher'
+    value = db.Column(db.String(200), nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (db.UniqueConstraint('dimension', 'value', name='uq_research_stats_dimension_value'),)
+
+    def __repr__(self):
+        return f'<ResearchStat {self.dimension}={self.value}: {self.count}>'
+
+
 class Announcement(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     subject = db.Column(db.String(200), nullable=False)
@@ -558,10 +579,14 @@ class Conversation(db.Model):
 class ConversationParticipant(db.Model):
     __tablename__ = 'conversation_participants'
     conversation_id = db.Column(db.Integer, db.ForeignKey('conversations.id', ondelete='CASCADE'), primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True, index=True)
+    # Denormalized counters maintained by MessageService (rebuild with `flask rebuild-message-counters`)
+    unread_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    last_message_id = db.Column(db.Integer, db.ForeignKey('message.id', ondelete='SET NULL'), nullable=True)
     
     conversation = db.relationship('Conversation', back_populates='participants')
     user = db.relationship('User', backref='conversations_participated')
+    last_message = db.relationship('Message', foreign_keys=[last_message_id])
 
 class NotificationLog(db.Model):
     """Model to track sent notifications."""
@@ -577,5 +602,86 @@ class NotificationLog(db.Model):
     
     user = db.relationship('User', backref='notification_logs')
     
+    __table_args__ = (
+        # Dedupe lookups for resumable campaigns ("was this user already sent this alert?")
+        db.Index('ix_notification_log_type_reference_user', 'notification_type', 'reference_id', 'user_id'),
+        # Stats grouping and time windows (see get_notification_stats)
+        db.Index('ix_notification_log_type_status', 'notification_type', 'status'),
+        db.Index('ix_notification_log_sent_at', 'sent_at'),
+    )
+    
     def __repr__(self):
         return f'<NotificationLog {self.notification_type} to {self.recipient_email}>'
+
+
+class NotificationDailyStat(db.Model):
+    """Daily notification counts kept after raw NotificationLog rows are pruned."""
+    __tablename__ = 'notification_daily_stat'
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    notification_type = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (db.UniqueConstraint('day', 'notification_type', 'status', name='uq_notification_daily_stat_day_type_status'),)
+
+    def __repr__(self):
+        return f'<NotificationDailyStat {self.day} {self.notification_type} {self.status}: {self.count}>'
+
+
+class NotificationCampaign(db.Model):
+    """Progress of one mass notification, so an interrupted run resumes instead of restarting."""
+    __tablename__ = 'notification_campaign'
+    id = db.Column(db.Integer, primary_key=True)
+    notification_type = db.Column(db.String(50), nullable=False)
+    reference_id = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='running')  # running, completed
+    last_user_id = db.Column(db.Integer, nullable=False, default=0)  # every recipient up to this ID is handled
+    sent_count = db.Column(db.Integer, nullable=False, default=0)
+    failed_count = db.Column(db.Integer, nullable=False, default=0)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    completed_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (db.UniqueConstraint('notification_type', 'reference_id', name='uq_notification_campaign_type_reference'),)
+
+    def __repr__(self):
+        return f'<NotificationCampaign {self.notification_type} {self.reference_id} {self.status}>'
+
+
+class EmailBody(db.Model):
+    """Rendered email content, stored once however many outbox rows send it."""
+    __tablename__ = 'email_body'
+    id = db.Column(db.Integer, primary_key=True)
+    digest = db.Column(db.String(64), unique=True, nullable=False)  # SHA-256 of the content
+    html_body = db.Column(db.Text, nullable=False)
+    text_body = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<EmailBody {self.id}>'
+
+
+class EmailOutbox(db.Model):
+    """Outbound email waiting to be delivered by the `flask email-worker` process."""
+    __tablename__ = 'email_outbox'
+    id = db.Column(db.Integer, primary_key=True)
+    subject = db.Column(db.String(255), nullable=False)
+    sender = db.Column(db.String(120), nullable=True)
+    recipients = db.Column(db.Text, nullable=False)  # JSON list of addresses
+    body_id = db.Column(db.Integer, db.ForeignKey('email_body.id'), nullable=False, index=True)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, sending, sent, dead
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = db.Column(db.String(32), nullable=True)
+    locked_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    body = db.relationship('EmailBody')
+
+    __table_args__ = (db.Index('ix_email_outbox_status_next_attempt', 'status', 'next_attempt_at'),)
+
+    def __repr__(self):
+        return f'<EmailOutbox {self.id} {self.status}>'
@@ -0,0 +1,59 @@
+"""
+Measure the per-message cost of rendering an email body.
+
+Compares render_template_string, which compiles the template on every
+call, with the compiled-template registry in utils.email_utils. Usage:
+
+    python scripts/bench_email_templates.py --messages 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+# Add parent directory to path so we can import from app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# app binds to DATABASE_URL when imported; load the test settings first so that is sqlite://
+import tests  # noqa: F401
+
+
+def per_message_us(render, messages):
+    start = time.perf_counter()
+    for i in range(messages):
+        render(i)
+    return (time.perf_counter() - start) / messages * 1_000_000
+
+
+def run(messages):
+    from flask import render_template_string
+    from app import app
+    from utils.email_utils import EVENT_REMINDER_TEMPLATE, render_email_template
+
+    event = SimpleNamespace(title='Journal Club', presenter='Dr. Example', event_url='https://example.com/join')
+
+    def context(i):
+        return dict(user=SimpleNamespace(name=f'Member {i}'), event=event,
+                    event_date_str='May 01, 2026', event_time_str='06:30 PM')
+
+    with app.test_request_context():
+        uncached = per_message_us(
+            lambda i: render_template_string(EVENT_REMINDER_TEMPLATE, **context(i)), messages
+        )
+        cached = per_message_us(
+            lambda i: render_email_template('event_reminder', EVENT_REMINDER_TEMPLATE, **context(i)), messages
+        )
+
+    print(f'{messages} event reminder renders')
+    print(f'  render_template_string:   {uncached:8.1f} us/message')
+    print(f'  compiled-template cache:  {cached:8.1f} us/message')
+    print(f'  speedup: {uncached / cached:.1f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=2000)
+    args = parser.parse_args()
+    run(args.messages)
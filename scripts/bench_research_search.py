@@ -0,0 +1,99 @@
+"""
+Measure research search over a synthetic corpus.
+
+Compares the old ``ILIKE '%term%'`` scan with the full-text index used by
+ResearchService.filter_researches, on an in-memory SQLite database.
+Multi-word queries match more papers with the index, because the words may
+appear in any order rather than as one contiguous phrase. Usage:
+
+    python scripts/bench_research_search.py --papers 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path so we can import from app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# The corpus goes in a throwaway database: the tests package sets DATABASE_URL to sqlite://
+import tests  # noqa: F401
+
+WORDS = (
+    'nanoparticle insulin delivery hepatic toxicity paracetamol antibiotic prescribing audit oral '
+    'tablet formulation stability solubility kinetics receptor binding assay clinical outcome cohort '
+    'adherence diabetes hypertension malaria plant extract antioxidant microbial resistance dissolution '
+    'polymer hydrogel transdermal patch bioavailability pharmacokinetic model pediatric dosing survey'
+).split()
+QUERIES = ['insulin', 'hepatic toxicity', 'transdermal patch stability', 'osman']
+
+
+def seed(papers):
+    from models import db, Research, Researcher
+    from services import ResearchService
+    from utils.search_index import rebuild_search_indexes
+
+    rng = random.Random(1)
+    authors = [{'id': i, 'name': f'Dr. {rng.choice(WORDS).title()} {i} {"Osman" if i % 50 == 0 else "Ali"}',
+                'is_registered_user': False} for i in range(1, 2001)]
+    departments = [value for value, _ in ResearchService.DEPARTMENT_CHOICES if value != 'all']
+    rows = [{
+        'title': ' '.join(rng.choice(WORDS) for _ in range(8)).capitalize(),
+        'department': rng.choice(departments),
+        'year': rng.randint(2000, 2025),
+        'researcher_id': rng.randint(1, len(authors)),
+        'researcher_type': 'doctor',
+        'is_approved': True,
+    } for _ in range(papers)]
+    db.session.execute(Researcher.__table__.insert(), authors)
+    db.session.execute(Research.__table__.insert(), rows)
+    db.session.commit()
+
+    start = time.perf_counter()
+    rebuild_search_indexes()
+    return time.perf_counter() - start
+
+
+def substring_search(term):
+    from sqlalchemy import or_
+    from models import Research, Researcher
+
+    pattern = f'%{term}%'
+    return Research.query.filter(Research.is_approved == True).join(Researcher).filter(
+        or_(Research.title.ilike(pattern), Researcher.name.ilike(pattern))
+    ).order_by(Research.year.desc(), Research.title).paginate(page=1, per_page=12, error_out=False)
+
+
+def per_query_ms(search, term, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        page = search(term)
+    return (time.perf_counter() - start) / repeat * 1000, page.total
+
+
+def run(papers, repeat):
+    from app import app
+    from models import db
+    from services import ResearchService
+
+    with app.app_context():
+        db.create_all()
+        index_seconds = seed(papers)
+        print(f'{papers} papers, index built in {index_seconds:.2f}s')
+        print(f'  {"query":30} {"ILIKE scan":>12} {"full-text":>12} {"matches":>9}')
+        for term in QUERIES:
+            scan_ms, scan_total = per_query_ms(substring_search, term, repeat)
+            fts_ms, fts_total = per_query_ms(
+                lambda q: ResearchService.filter_researches(search_query=q, per_page=12), term, repeat
+            )
+            print(f'  {term:30} {scan_ms:9.1f} ms {fts_ms:9.1f} ms {fts_total:>5}/{scan_total}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--papers', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.papers, args.repeat)
@@ -0,0 +1,56 @@
+"""
+Compare per-message SMTP connections with the pooled sender.
+
+Runs against the local stand-in SMTP server from the test suite, which
+sleeps for --handshake-ms on every new connection to model TCP/TLS/AUTH
+setup. Usage:
+
+    python scripts/bench_smtp_pool.py --messages 500 --handshake-ms 20
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path so we can import from app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# The stand-in SMTP server ships with the test suite
+from tests.smtp_stub import stub_mail_server
+
+
+def run(messages, handshake_ms):
+    from app import app
+    from utils.email_utils import build_message, deliver_email, deliver_emails
+
+    with app.app_context(), stub_mail_server(handshake_delay=handshake_ms / 1000) as server:
+        start = time.perf_counter()
+        for i in range(messages):
+            deliver_email(f'Bench {i}', [f'member{i}@example.com'], '<p>Benchmark</p>')
+        per_message = time.perf_counter() - start
+        per_message_connections = server.connections
+
+        server.connections = 0
+        start = time.perf_counter()
+        batch = [build_message(f'Bench {i}', [f'member{i}@example.com'], '<p>Benchmark</p>')
+                 for i in range(messages)]
+        outcomes = deliver_emails(batch)
+        pooled = time.perf_counter() - start
+        pooled_connections = server.connections
+
+    failed = sum(1 for success, _ in outcomes if not success)
+    print(f'{messages} messages, {handshake_ms} ms connection setup')
+    print(f'  connection per message: {messages / per_message:8.1f} msg/s '
+          f'({per_message_connections} connections)')
+    print(f'  pooled connection:      {messages / pooled:8.1f} msg/s '
+          f'({pooled_connections} connections, {failed} failed)')
+    print(f'  speedup: {per_message / pooled:.1f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=500)
+    parser.add_argument('--handshake-ms', type=float, default=20)
+    args = parser.parse_args()
+    run(args.messages, args.handshake_ms)
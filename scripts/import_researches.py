@@ -10,6 +10,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 try:
     from app import app, db
     from models import Researcher, Research
+    from services import ResearchService
 except ImportError as e:
     print(f"Error importing app modules: {e}")
     print("Make sure you are running this script from within the virtual environment.")
@@ -87,6 +88,7 @@ def import_researches(csv_path):
 
                 # Commit all changes as a single transaction
                 db.session.commit()
+                ResearchService.rebuild_research_statistics()
                 
                 print("\n--- Import Summary ---")
                 print(f"New researchers added: {researchers_added}")
@@ -8,10 +8,14 @@ from .message_service import MessageService
 from .event_service import EventService
 from .user_service import UserService
 from .research_service import ResearchService
+from .outbox_service import OutboxService
+from .forum_service import ForumService
 
 __all__ = [
     'MessageService', 
     'EventService', 
     'UserService', 
-    'ResearchService'
+    'ResearchService',
+    'OutboxService',
+    'ForumService'
 ]
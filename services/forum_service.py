@@ -0,0 +1,451 @@
+"""
+Forum Service Module
+
+Business logic for forum posts, comments and likes.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, exists, false, func, or_, select, update
+from sqlalchemy.orm import joinedload
+
+from models import db, User, Profile, Post, Comment, Like
+from utils.constants import COMMENT_PAGE_SIZE, FORUM_PAGE_SIZE
+from utils.query_helpers import decode_cursor, encode_cursor, insert_ignoring_conflict, keyset_after, keyset_before
+from utils.search_index import COMMENT_INDEX, FORUM_INDEX, has_match, highlight, search_stems, search_together
+
+
+class ForumService:
+    """Service class for forum-related operations."""
+
+    @staticmethod
+    def get_feed_page(
+        limit: int = FORUM_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        viewer_id: Optional[int] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Get one page of the forum feed, newest first, in a single query.
+
+        Like and comment counts are read from the post's counter columns
+        and the author's profile is joined in, so rendering the page never
+        touches the likes or comments collections.
+
+        Args:
+            limit: Maximum posts to return
+            cursor: Cursor returned by the previous page, if any
+            viewer_id: ID of the signed-in user, to flag posts they liked
+
+        Returns:
+            Tuple of (feed entries, cursor for the next page or None). Each
+            entry holds the post, its like and comment counts and whether
+            the viewer liked it.
+        """
+        query = ForumService._entry_query(viewer_id)
+
+        position = decode_cursor(cursor)
+        if position:
+            query = query.filter(keyset_before(Post.created_at, Post.id, *position))
+
+        # Fetch one extra row to learn whether another page exists
+        rows = query.order_by(Post.created_at.desc(), Post.id.desc()).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_post = rows[-1][0]
+            next_cursor = encode_cursor(last_post.created_at, last_post.id)
+
+        return ForumService._entries(rows), next_cursor
+
+    @staticmethod
+    def search_posts(
+        search: str,
+        page: int = 1,
+        per_page: int = FORUM_PAGE_SIZE,
+        viewer_id: Optional[int] = None
+    ) -> Tuple[List[Dict], Optional[int]]:
+        """
+        Get one page of posts matching a search, best match first.
+
+        Titles, post bodies and comments are searched through the forum
+        full-text index; without one, titles and bodies are matched as
+        substrings and the newest posts come first.
+
+        Args:
+            search: Raw search text
+            page: Page number (1-indexed)
+            per_page: Maximum posts per page
+            viewer_id: ID of the signed-in user, to flag posts they liked
+
+        Returns:
+            Tuple of (feed entries, next page number or None). Entries are
+            shaped as in get_feed_page, plus a highlighted ``snippet`` cut
+            from the body, or else from the first matching comment or the
+            title, so each hit shows why it matched.
+        """
+        page = max(page, 1)
+        query, ordering = ForumService.apply_search(ForumService._entry_query(viewer_id), search)
+
+        # Fetch one extra row to learn whether another page exists
+        rows = query.order_by(*ordering).offset((page - 1) * per_page).limit(per_page + 1).all()
+
+        next_page = None
+        if len(rows) > per_page:
+            rows = rows[:per_page]
+            next_page = page + 1
+
+        entries = ForumService._entries(rows)
+        comments = ForumService._matching_comments(
+            [entry['post'].id for entry in entries if not has_match(entry['post'].content, search)],
+            search
+        )
+        for entry in entries:
+            post = entry['post']
+            text = post.content
+            if not has_match(text, search):
+                text = comments.get(post.id) or (post.title if has_match(post.title, search) else text)
+            entry['snippet'] = highlight(text, search)
+        return entries, next_page
+
+    @staticmethod
+    def count_posts(search: Optional[str] = None) -> int:
+        """
+        Count forum posts, or the posts matching a search.
+
+        Args:
+            search: Raw search text (optional)
+
+        Returns:
+            Number of posts
+        """
+        query = db.session.query(func.count(Post.id))
+        if search:
+            query, _ = ForumService.apply_search(query, search)
+        return query.scalar()
+
+    @staticmethod
+    def apply_search(query, search: str):
+        """
+        Restrict a Post query to posts matching a search.
+
+        Args:
+            query: Query selecting Post
+            search: Raw search text
+
+        Returns:
+            Tuple of (filtered query, ORDER BY clauses ranking the matches)
+        """
+        ordering = [Post.created_at.desc(), Post.id.desc()]
+        hits = search_together(search, [FORUM_INDEX, COMMENT_INDEX])
+        if hits is not None:
+            query = query.join(hits, hits.c.id == Post.id)
+            ordering.insert(0, hits.c.score.desc())
+        else:
+            query = query.filter(Post.title.contains(search) | Post.content.contains(search))
+        return query, ordering
+
+    @staticmethod
+    def get_comment_page(
+        post_id: int,
+        cursor: Optional[str] = None,
+        limit: int = COMMENT_PAGE_SIZE
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Get one page of a post's comments, oldest first, in a single query.
+
+        Only the columns the thread shows are selected, with the author's
+        name and picture joined from their profile, so no Comment or User
+        objects are built.
+
+        Args:
+            post_id: The post's ID
+            cursor: Cursor returned by the previous page, if any
+            limit: Maximum comments to return
+
+        Returns:
+            Tuple of (comment dictionaries, cursor for the next page or None)
+        """
+        query = db.session.query(
+            Comment.id,
+            Comment.user_id,
+            Comment.content,
+            Comment.created_at,
+            Profile.full_name.label('author_name'),
+            Profile.profile_picture_url.label('author_picture_url')
+        ).outerjoin(
+            Profile, Profile.user_id == Comment.user_id
+        ).filter(Comment.post_id == post_id)
+
+        position = decode_cursor(cursor)
+        if position:
+            query = query.filter(keyset_after(Comment.created_at, Comment.id, *position))
+
+        # Fetch one extra row to learn whether another page exists
+        rows = query.order_by(Comment.created_at.asc(), Comment.id.asc()).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+        comments = [dict(row._mapping) for row in rows]
+        for comment in comments:
+            comment['author_name'] = comment['author_name'] or 'Unknown User'
+        return comments, next_cursor
+
+    @staticmethod
+    def get_comment_data(comment: Dict) -> Dict:
+        """
+        Get a comment from get_comment_page formatted for JSON response.
+
+        Args:
+            comment: Comment dictionary
+
+        Returns:
+            Dictionary with comment data
+        """
+        return {
+            'id': comment['id'],
+            'user_id': comment['user_id'],
+            'content': comment['content'],
+            'created_at': comment['created_at'].isoformat(),
+            'created_at_display': comment['created_at'].strftime('%b %d, %Y %I:%M %p'),
+            'author_name': comment['author_name'],
+            'author_picture_url': comment['author_picture_url']
+        }
+
+    @staticmethod
+    def get_feed_entry_data(entry: Dict) -> Dict:
+        """
+        Get a feed entry formatted for JSON response.
+
+        Args:
+            entry: Entry returned by get_feed_page
+
+        Returns:
+            Dictionary with post data
+        """
+        post = entry['post']
+        return {
+            'id': post.id,
+            'title': post.title,
+            'content': post.content[:200] + '...' if len(post.content) > 200 else post.content,
+            'author': post.author.name,
+            'created_at': post.created_at.strftime('%B %d, %Y at %I:%M %p'),
+            'likes': entry['likes'],
+            'comments': entry['comments'],
+            'liked': entry['liked'],
+            'snippet': str(entry['snippet']) if 'snippet' in entry else None
+        }
+
+    @staticmethod
+    def has_liked(user_id: int, post_id: int) -> bool:
+        """
+        Check whether a user likes a post.
+
+        Args:
+            user_id: The user's ID
+            post_id: The post's ID
+
+        Returns:
+            True if the user likes the post
+        """
+        return db.session.query(
+            exists().where(Like.user_id == user_id, Like.post_id == post_id)
+        ).scalar()
+
+    @staticmethod
+    def toggle_like(user_id: int, post_id: int) -> Optional[Tuple[bool, int]]:
+        """
+        Like a post, or remove the like if the user already likes it.
+
+        Every step is a single statement that cannot conflict with a
+        concurrent toggle: the like is deleted with ``DELETE ... RETURNING``,
+        or else inserted with ``ON CONFLICT DO NOTHING``, and the counter
+        change returns the new count. A double click that loses the race to
+        insert leaves the post liked rather than failing.
+
+        The post is checked first, under a key-share lock on PostgreSQL, so
+        a missing or concurrently deleted post never reaches the like
+        foreign key.
+
+        Args:
+            user_id: The user's ID
+            post_id: The post's ID
+
+        Returns:
+            Tuple of (whether the user now likes the post, new like count),
+            or None if the post does not exist
+        """
+        post_exists = db.session.query(Post.id).filter(Post.id == post_id).with_for_update(
+            key_share=True
+        ).scalar()
+        if post_exists is None:
+            db.session.rollback()
+            return None
+
+        removed = db.session.execute(
+            delete(Like).where(Like.user_id == user_id, Like.post_id == post_id).returning(Like.id),
+            execution_options={'synchronize_session': False}
+        ).first()
+        if removed:
+            delta = -1
+        else:
+            inserted = insert_ignoring_conflict(
+                db.session, Like, {'user_id': user_id, 'post_id': post_id}, ['user_id', 'post_id']
+            )
+            delta = 1 if inserted is not None else 0
+
+        like_count = db.session.execute(
+            update(Post).where(Post.id == post_id).values(like_count=Post.like_count + delta)
+            .returning(Post.like_count),
+            execution_options={'synchronize_session': False}
+        ).scalar()
+        db.session.commit()
+        return removed is None, like_count
+
+    @staticmethod
+    def add_comment(post_id: int, user_id: int, content: str) -> Comment:
+        """
+        Add a comment to a post.
+
+        Args:
+            post_id: The post's ID
+            user_id: The commenter's ID
+            content: Comment text
+
+        Returns:
+            The created Comment object
+        """
+        comment = Comment(post_id=post_id, user_id=user_id, content=content)
+        db.session.add(comment)
+        ForumService._adjust_counts(post_id, comments=1)
+        db.session.commit()
+        return comment
+
+    @staticmethod
+    def delete_comment(comment: Comment) -> None:
+        """
+        Delete a comment.
+
+        Args:
+            comment: Comment to delete
+        """
+        ForumService._adjust_counts(comment.post_id, comments=-1)
+        db.session.delete(comment)
+        db.session.commit()
+
+    @staticmethod
+    def release_user_activity(user_id: int) -> None:
+        """
+        Take a user's likes and comments off other posts' counters.
+
+        Call in the transaction that deletes the user; the rows themselves
+        go with the user's cascade.
+
+        Args:
+            user_id: ID of the user being deleted
+        """
+        likes = select(func.count(Like.id)).where(
+            Like.post_id == Post.id, Like.user_id == user_id
+        ).scalar_subquery()
+        comments = select(func.count(Comment.id)).where(
+            Comment.post_id == Post.id, Comment.user_id == user_id
+        ).scalar_subquery()
+        Post.query.filter(
+            Post.user_id != user_id,
+            or_(
+                Post.id.in_(select(Like.post_id).where(Like.user_id == user_id)),
+                Post.id.in_(select(Comment.post_id).where(Comment.user_id == user_id))
+            )
+        ).update({
+            Post.like_count: Post.like_count - likes,
+            Post.comment_count: Post.comment_count - comments
+        }, synchronize_session=False)
+
+    @staticmethod
+    def reconcile_post_counts() -> int:
+        """
+        Recount every post's likes and comments and fix counters that drifted.
+
+        Returns:
+            Number of posts whose counters were corrected
+        """
+        likes = select(func.count(Like.id)).where(Like.post_id == Post.id).scalar_subquery()
+        comments = select(func.count(Comment.id)).where(Comment.post_id == Post.id).scalar_subquery()
+        fixed = Post.query.filter(
+            or_(Post.like_count != likes, Post.comment_count != comments)
+        ).update({
+            Post.like_count: likes,
+            Post.comment_count: comments
+        }, synchronize_session=False)
+        db.session.commit()
+        return fixed
+
+    @staticmethod
+    def _adjust_counts(post_id: int, likes: int = 0, comments: int = 0) -> None:
+        """
+        Change a post's counters in the current transaction.
+
+        Counters are changed with ``count = count + delta`` in SQL, so
+        concurrent requests cannot overwrite each other's changes.
+
+        Args:
+            post_id: The post's ID
+            likes: Change to the like count
+            comments: Change to the comment count
+        """
+        Post.query.filter_by(id=post_id).update({
+            Post.like_count: Post.like_count + likes,
+            Post.comment_count: Post.comment_count + comments
+        }, synchronize_session=False)
+
+    @staticmethod
+    def _matching_comments(post_ids: List[int], search: str) -> Dict[int, str]:
+        """
+        Find the oldest comment matching a search on each of some posts.
+
+        Args:
+            post_ids: IDs of the posts to look in
+            search: Raw search text
+
+        Returns:
+            Dictionary mapping post ID to the matching comment's text
+        """
+        stems = search_stems(search)
+        if not post_ids or not stems:
+            return {}
+        # LIKE narrows the rows; has_match applies the word boundaries
+        rows = db.session.query(Comment.post_id, Comment.content).filter(
+            Comment.post_id.in_(post_ids),
+            or_(*[Comment.content.ilike(f'%{stem}%') for stem in stems])
+        ).order_by(Comment.created_at.asc(), Comment.id.asc())
+
+        comments = {}
+        for post_id, content in rows:
+            if post_id not in comments and has_match(content, search):
+                comments[post_id] = content
+        return comments
+
+    @staticmethod
+    def _entry_query(viewer_id: Optional[int]):
+        if viewer_id is not None:
+            liked = exists().where(Like.post_id == Post.id, Like.user_id == viewer_id)
+        else:
+            liked = false()
+        return db.session.query(
+            Post,
+            liked.label('liked')
+        ).options(
+            joinedload(Post.author).joinedload(User.profile)
+        )
+
+    @staticmethod
+    def _entries(rows) -> List[Dict]:
+        return [{
+            'post': post,
+            'likes': post.like_count,
+            'comments': post.comment_count,
+            'liked': bool(viewer_liked)
+        } for post, viewer_liked in rows]
@@ -8,12 +8,17 @@ from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 from collections import defaultdict
 
-from models import db, User, Message
-from utils.query_helpers import (
-    get_conversation_participants,
-    get_latest_message,
-    get_unread_message_count
-)
+from sqlalchemy import and_, case, func
+from sqlalchemy.orm import contains_eager
+
+from models import db, User, Profile, Message, ConversationParticipant
+from utils.constants import HISTORY_PAGE_SIZE, INBOX_PAGE_SIZE, NAME_CACHE_MAX_ENTRIES, NAME_CACHE_TTL
+from utils.query_helpers import decode_cursor, encode_cursor, keyset_before
+from utils.ttl_cache import TTLCache
+
+
+# Display names change rarely; a short TTL bounds staleness after profile edits
+_display_names = TTLCache(maxsize=NAME_CACHE_MAX_ENTRIES, ttl=NAME_CACHE_TTL)
 
 
 class MessageService:
@@ -30,34 +35,76 @@ class MessageService:
         Returns:
             List of conversation dictionaries sorted by latest message
         """
-        # Get all user IDs who have exchanged messages with this user
-        participant_ids = get_conversation_participants(Message, user_id)
+        conversations, _ = MessageService.get_inbox_page(user_id, limit=None)
+        return conversations
+    
+    @staticmethod
+    def get_inbox_page(
+        user_id: int,
+        limit: Optional[int] = INBOX_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Get one page of a user's inbox in a single query.
         
-        conversations = []
-        for other_user_id in participant_ids:
-            other_user = User.query.get(other_user_id)
-            if not other_user:
-                continue
-            
-            # Get latest message
-            latest_message = get_latest_message(Message, user_id, other_user_id)
-            
-            # Count unread messages from this user
-            unread_count = get_unread_message_count(Message, user_id, other_user_id)
-            
-            conversations.append({
-                'user': other_user,
-                'latest_message': latest_message,
-                'unread_count': unread_count
-            })
-        
-        # Sort by latest message timestamp
-        conversations.sort(
-            key=lambda x: x['latest_message'].created_at if x['latest_message'] else datetime.min,
-            reverse=True
-        )
+        Partner, latest message and unread count are read from the
+        denormalized conversation participant rows, so the number of queries
+        does not grow with the number of conversation partners.
         
-        return conversations
+        Args:
+            user_id: The user's ID
+            limit: Maximum conversations to return (None for all)
+            cursor: Cursor returned by the previous page, if any
+        
+        Returns:
+            Tuple of (conversation dictionaries, cursor for the next page or None)
+        """
+        me = db.aliased(ConversationParticipant)
+        partner = db.aliased(ConversationParticipant)
+        latest = db.aliased(Message)
+        
+        query = db.session.query(
+            User,
+            latest,
+            me.unread_count
+        ).select_from(me).join(
+            partner,
+            and_(partner.conversation_id == me.conversation_id, partner.user_id != user_id)
+        ).join(
+            User, User.id == partner.user_id
+        ).outerjoin(
+            Profile, User.profile
+        ).join(
+            latest, latest.id == me.last_message_id
+        ).options(
+            contains_eager(User.profile)
+        ).filter(me.user_id == user_id)
+        
+        position = decode_cursor(cursor)
+        if position:
+            query = query.filter(keyset_before(latest.created_at, latest.id, *position))
+        
+        query = query.order_by(latest.created_at.desc(), latest.id.desc())
+        
+        if limit is None:
+            rows = query.all()
+        else:
+            # Fetch one extra row to learn whether another page exists
+            rows = query.limit(limit + 1).all()
+        
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            last_message = rows[-1][1]
+            next_cursor = encode_cursor(last_message.created_at, last_message.id)
+        
+        conversations = [{
+            'user': other_user,
+            'latest_message': latest_message,
+            'unread_count': unread_count
+        } for other_user, latest_message, unread_count in rows]
+        
+        return conversations, next_cursor
     
     @staticmethod
     def get_conversation_messages(user_id: int, other_user_id: int) -> List[Message]:
@@ -77,20 +124,62 @@ class MessageService:
         ).order_by(Message.created_at.asc()).all()
     
     @staticmethod
-    def get_grouped_messages(user_id: int, other_user_id: int) -> List[Tuple]:
+    def get_history_page(
+        user_id: int,
+        other_user_id: int,
+        before_id: Optional[int] = None,
+        limit: int = HISTORY_PAGE_SIZE
+    ) -> Tuple[List[Message], Optional[int]]:
         """
-        Get messages grouped by date for display.
+        Get one page of conversation history, newest page first.
+        
+        Pages are keyed on (created_at, id) so each request walks the
+        (conversation_id, created_at, id) index instead of the full history.
         
         Args:
             user_id: First user's ID
             other_user_id: Second user's ID
+            before_id: Only return messages older than this message (optional)
+            limit: Maximum messages to return
         
         Returns:
-            List of (date, messages) tuples
+            Tuple of (messages ordered oldest first, before_id for the next older page or None)
         """
-        messages = MessageService.get_conversation_messages(user_id, other_user_id)
+        conv_id = MessageService.get_conversation_id(user_id, other_user_id)
+        if not conv_id:
+            return [], None
+        
+        query = Message.query.filter(Message.conversation_id == conv_id)
+        if before_id is not None:
+            before_created_at = db.session.query(Message.created_at).filter(
+                Message.id == before_id,
+                Message.conversation_id == conv_id
+            ).scalar_subquery()
+            query = query.filter(keyset_before(Message.created_at, Message.id, before_created_at, before_id))
+        
+        messages = query.order_by(
+            Message.created_at.desc(), Message.id.desc()
+        ).limit(limit + 1).all()
+        
+        next_before_id = None
+        if len(messages) > limit:
+            messages = messages[:limit]
+            next_before_id = messages[-1].id
+        
+        messages.reverse()
+        return messages, next_before_id
+    
+    @staticmethod
+    def group_messages_by_date(messages: List[Message]) -> List[Tuple]:
+        """
+        Group messages by date for display.
         
-        # Group messages by date
+        Args:
+            messages: Messages ordered by creation time
+        
+        Returns:
+            List of (date, messages) tuples
+        """
         messages_by_date = defaultdict(list)
         for message in messages:
             date_key = message.created_at.date()
@@ -104,23 +193,52 @@ class MessageService:
         return grouped_messages
     
     @staticmethod
-    def get_or_create_conversation(user_id1: int, user_id2: int) -> int:
-        """Get existing or create a new conversation for two users."""
-        from models import Conversation, ConversationParticipant
+    def get_grouped_messages(user_id: int, other_user_id: int) -> List[Tuple]:
+        """
+        Get messages grouped by date for display.
+        
+        Args:
+            user_id: First user's ID
+            other_user_id: Second user's ID
+        
+        Returns:
+            List of (date, messages) tuples
+        """
+        messages = MessageService.get_conversation_messages(user_id, other_user_id)
+        return MessageService.group_messages_by_date(messages)
+    
+    @staticmethod
+    def get_conversation_id(user_id1: int, user_id2: int) -> Optional[int]:
+        """
+        Get the ID of the conversation between two users.
+        
+        Args:
+            user_id1: First user's ID
+            user_id2: Second user's ID
+        
+        Returns:
+            The conversation ID, or None if the users have no conversation
+        """
         cp1_alias = db.aliased(ConversationParticipant)
         cp2_alias = db.aliased(ConversationParticipant)
         
-        existing = db.session.query(Conversation.id).join(
-            cp1_alias, Conversation.id == cp1_alias.conversation_id
-        ).join(
-            cp2_alias, Conversation.id == cp2_alias.conversation_id
+        existing = db.session.query(cp1_alias.conversation_id).join(
+            cp2_alias, cp1_alias.conversation_id == cp2_alias.conversation_id
         ).filter(
             cp1_alias.user_id == user_id1,
             cp2_alias.user_id == user_id2
         ).first()
         
-        if existing:
-            return existing[0]
+        return existing[0] if existing else None
+    
+    @staticmethod
+    def get_or_create_conversation(user_id1: int, user_id2: int) -> int:
+        """Get existing or create a new conversation for two users."""
+        from models import Conversation
+        
+        existing_id = MessageService.get_conversation_id(user_id1, user_id2)
+        if existing_id:
+            return existing_id
             
         conv = Conversation()
         db.session.add(conv)
@@ -155,37 +273,92 @@ class MessageService:
             content=content
         )
         db.session.add(message)
+        db.session.flush()
+        
+        # Keep the denormalized counters in the same transaction as the message
+        ConversationParticipant.query.filter_by(
+            conversation_id=conv_id
+        ).update({'last_message_id': message.id}, synchronize_session=False)
+        ConversationParticipant.query.filter_by(
+            conversation_id=conv_id,
+            user_id=receiver_id
+        ).update({
+            'unread_count': ConversationParticipant.unread_count + 1
+        }, synchronize_session=False)
+        
         db.session.commit()
         return message
     
     @staticmethod
-    def mark_messages_as_read(user_id: int, other_user_id: int) -> int:
+    def mark_messages_as_read(user_id: int, other_user_id: int, up_to_id: Optional[int] = None) -> int:
         """
-        Mark all unread messages from other_user as read.
+        Mark unread messages from other_user as read.
         
         Args:
             user_id: The current user's ID (receiver)
             other_user_id: The conversation partner's ID (sender)
+            up_to_id: Only mark messages with an ID up to this one (optional)
         
         Returns:
             Number of messages marked as read
         """
-        unread_messages = Message.query.filter_by(
-            sender_id=other_user_id,
-            receiver_id=user_id,
-            is_read=False
-        ).all()
+        return MessageService.mark_read_up_to(user_id, other_user_id, up_to_id)['count']
+    
+    @staticmethod
+    def mark_read_up_to(user_id: int, other_user_id: int, up_to_id: Optional[int] = None) -> Dict:
+        """
+        Mark everything other_user sent up to a watermark as read in one UPDATE.
+        
+        The watermark is the given message ID, capped at the latest message in
+        the conversation; without one the whole conversation is acknowledged.
+        
+        Args:
+            user_id: The current user's ID (receiver)
+            other_user_id: The conversation partner's ID (sender)
+            up_to_id: Highest message ID the reader has seen (optional)
+        
+        Returns:
+            Dictionary with the number of messages marked, the watermark and read time
+        """
+        result = {'count': 0, 'up_to_id': None, 'read_at': None}
+        
+        me = db.aliased(ConversationParticipant)
+        partner = db.aliased(ConversationParticipant)
+        participant = db.session.query(me.conversation_id, me.last_message_id).join(
+            partner, me.conversation_id == partner.conversation_id
+        ).filter(
+            me.user_id == user_id,
+            partner.user_id == other_user_id
+        ).first()
+        if not participant or participant.last_message_id is None:
+            return result
         
-        count = 0
-        for message in unread_messages:
-            message.is_read = True
-            message.read_at = datetime.utcnow()
-            count += 1
+        watermark = participant.last_message_id
+        if up_to_id is not None:
+            watermark = min(watermark, up_to_id)
+        read_at = datetime.utcnow()
+        
+        count = Message.query.filter(
+            Message.sender_id == other_user_id,
+            Message.receiver_id == user_id,
+            Message.is_read == False,
+            Message.id <= watermark
+        ).update({'is_read': True, 'read_at': read_at}, synchronize_session=False)
         
         if count > 0:
+            ConversationParticipant.query.filter_by(
+                conversation_id=participant.conversation_id,
+                user_id=user_id
+            ).update({
+                'unread_count': case(
+                    (ConversationParticipant.unread_count > count, ConversationParticipant.unread_count - count),
+                    else_=0
+                )
+            }, synchronize_session=False)
             db.session.commit()
         
-        return count
+        result.update(count=count, up_to_id=watermark, read_at=read_at)
+        return result
     
     @staticmethod
     def delete_message(message_id: int, user_id: int) -> Tuple[bool, str]:
@@ -206,6 +379,31 @@ class MessageService:
         if message.sender_id != user_id:
             return False, 'You can only delete your own messages'
         
+        conv_id = message.conversation_id
+        if conv_id:
+            if not message.is_read:
+                ConversationParticipant.query.filter_by(
+                    conversation_id=conv_id,
+                    user_id=message.receiver_id
+                ).update({
+                    'unread_count': case(
+                        (ConversationParticipant.unread_count > 0, ConversationParticipant.unread_count - 1),
+                        else_=0
+                    )
+                }, synchronize_session=False)
+            
+            # Repoint the latest-message pointer before the row disappears
+            previous = Message.query.with_entities(Message.id).filter(
+                Message.conversation_id == conv_id,
+                Message.id != message.id
+            ).order_by(Message.created_at.desc(), Message.id.desc()).first()
+            ConversationParticipant.query.filter_by(
+                conversation_id=conv_id,
+                last_message_id=message.id
+            ).update({
+                'last_message_id': previous[0] if previous else None
+            }, synchronize_session=False)
+        
         db.session.delete(message)
         db.session.commit()
         return True, ''
@@ -222,6 +420,12 @@ class MessageService:
         Returns:
             Number of deleted messages
         """
+        conv_id = MessageService.get_conversation_id(user_id, other_user_id)
+        if conv_id:
+            ConversationParticipant.query.filter_by(
+                conversation_id=conv_id
+            ).update({'unread_count': 0, 'last_message_id': None}, synchronize_session=False)
+        
         count = Message.query.filter(
             ((Message.sender_id == user_id) & (Message.receiver_id == other_user_id)) |
             ((Message.sender_id == other_user_id) & (Message.receiver_id == user_id))
@@ -229,6 +433,86 @@ class MessageService:
         db.session.commit()
         return count
     
+    @staticmethod
+    def get_unread_total(user_id: int) -> int:
+        """
+        Get the total unread message count for a user's badge.
+        
+        Reads the per-conversation counters instead of counting messages.
+        
+        Args:
+            user_id: The user's ID
+        
+        Returns:
+            Total number of unread messages across all conversations
+        """
+        return db.session.query(
+            func.coalesce(func.sum(ConversationParticipant.unread_count), 0)
+        ).filter(ConversationParticipant.user_id == user_id).scalar()
+    
+    @staticmethod
+    def rebuild_counters() -> int:
+        """
+        Recompute every participant's unread count and latest-message pointer
+        from the message table.
+        
+        Returns:
+            Number of conversation participant rows rebuilt
+        """
+        unread = db.session.query(func.count(Message.id)).filter(
+            Message.conversation_id == ConversationParticipant.conversation_id,
+            Message.receiver_id == ConversationParticipant.user_id,
+            Message.is_read == False
+        ).scalar_subquery()
+        
+        latest = db.session.query(Message.id).filter(
+            Message.conversation_id == ConversationParticipant.conversation_id
+        ).order_by(Message.created_at.desc(), Message.id.desc()).limit(1).scalar_subquery()
+        
+        count = ConversationParticipant.query.update({
+            'unread_count': unread,
+            'last_message_id': latest
+        }, synchronize_session=False)
+        db.session.commit()
+        return count
+    
+    @staticmethod
+    def get_display_name(user_id: int) -> str:
+        """
+        Get a user's display name, served from an in-process cache.
+        
+        The "Unknown User" fallback is not cached, so a profile created
+        later shows up at once.
+        
+        Args:
+            user_id: The user's ID
+        
+        Returns:
+            The user's full name, or "Unknown User" if they have no profile
+        """
+        name = _display_names.get(user_id)
+        if name is None:
+            name = db.session.query(Profile.full_name).filter(
+                Profile.user_id == user_id
+            ).scalar()
+            if not name:
+                return 'Unknown User'
+            _display_names.set(user_id, name)
+        return name
+    
+    @staticmethod
+    def forget_display_name(user_id: Optional[int] = None) -> None:
+        """
+        Drop a cached display name after the user's name changes.
+        
+        Args:
+            user_id: The user's ID (None clears every cached name)
+        """
+        if user_id is None:
+            _display_names.clear()
+        else:
+            _display_names.pop(user_id)
+    
     @staticmethod
     def get_message_data(message: Message) -> Dict:
         """
@@ -248,5 +532,5 @@ class MessageService:
             'is_read': message.is_read,
             'read_at': message.read_at.isoformat() if message.read_at else None,
             'created_at': message.created_at.isoformat(),
-            'sender_name': message.sender.name
+            'sender_name': MessageService.get_display_name(message.sender_id)
         }
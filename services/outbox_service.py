@@ -0,0 +1,344 @@
+"""
+Outbox Service Module
+
+Business logic for the persistent outbound email queue. Request handlers
+enqueue messages; the `flask email-worker` process claims and delivers
+them, retrying failures with exponential backoff and dead-lettering
+messages that keep failing. Message content is stored once per distinct
+body, so a mailing to many recipients adds one small row per recipient.
+"""
+
+import hashlib
+import json
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, exists, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+
+from models import db, EmailBody, EmailOutbox
+from utils.constants import (
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_LOCK_TIMEOUT,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_PRUNE_CHUNK_SIZE,
+    OUTBOX_RETRY_BASE_DELAY,
+    OUTBOX_RETRY_MAX_DELAY,
+    OUTBOX_STATUS_DEAD,
+    OUTBOX_STATUS_PENDING,
+    OUTBOX_STATUS_SENDING,
+    OUTBOX_STATUS_SENT,
+)
+from utils.email_utils import PooledMailSender, build_message, is_mail_configured
+from utils.query_helpers import insert_ignoring_conflict
+
+
+class OutboxService:
+    """Service class for the outbound email queue."""
+
+    @staticmethod
+    def enqueue(
+        subject: str,
+        recipients: List[str],
+        html_body: str,
+        text_body: Optional[str] = None,
+        sender: Optional[str] = None,
+        commit: bool = True
+    ) -> EmailOutbox:
+        """
+        Add an email to the outbox for background delivery.
+
+        Args:
+            subject: Email subject
+            recipients: Recipient email addresses
+            html_body: HTML content of the email
+            text_body: Plain text version of the email (optional)
+            sender: Sender address (defaults to MAIL_DEFAULT_SENDER at delivery)
+            commit: Commit immediately; pass False to batch several enqueues
+
+        Returns:
+            The queued EmailOutbox entry
+        """
+        entry = EmailOutbox(
+            subject=subject,
+            sender=sender,
+            recipients=json.dumps(list(recipients)),
+            body_id=OutboxService.store_body(html_body, text_body),
+            status=OUTBOX_STATUS_PENDING,
+            next_attempt_at=datetime.utcnow()
+        )
+        db.session.add(entry)
+        if commit:
+            db.session.commit()
+        return entry
+
+    @staticmethod
+    def enqueue_many(
+        subject: str,
+        emails: List[str],
+        html_body: str,
+        text_body: Optional[str] = None
+    ) -> int:
+        """
+        Queue one message per recipient in a single transaction.
+
+        Every message points at the same stored body.
+
+        Args:
+            subject: Email subject
+            emails: Recipient email addresses
+            html_body: HTML content of the email
+            text_body: Plain text version of the email (optional)
+
+        Returns:
+            Number of messages queued
+        """
+        now = datetime.utcnow()
+        body_id = OutboxService.store_body(html_body, text_body)
+        db.session.add_all([
+            EmailOutbox(
+                subject=subject,
+                recipients=json.dumps([email]),
+                body_id=body_id,
+                status=OUTBOX_STATUS_PENDING,
+                next_attempt_at=now
+            )
+            for email in emails
+        ])
+        db.session.commit()
+        return len(emails)
+
+    @staticmethod
+    def store_body(html_body: str, text_body: Optional[str] = None) -> int:
+        """
+        Store email content once, reusing an identical body already stored.
+
+        Runs in the caller's transaction. A reused body is locked against
+        deletion by a concurrent prune until the transaction ends.
+
+        Args:
+            html_body: HTML content of the email
+            text_body: Plain text version of the email (optional)
+
+        Returns:
+            ID of the EmailBody holding the content
+        """
+        digest = hashlib.sha256(json.dumps([html_body, text_body]).encode()).hexdigest()
+        body_id = insert_ignoring_conflict(db.session, EmailBody, {
+            'digest': digest,
+            'html_body': html_body,
+            'text_body': text_body,
+            'created_at': datetime.utcnow()
+        }, ['digest'])
+        if body_id is None:
+            body_id = db.session.query(EmailBody.id).filter(EmailBody.digest == digest).with_for_update(
+                key_share=True
+            ).scalar()
+        return body_id
+
+    @staticmethod
+    def claim_batch(limit: int = OUTBOX_BATCH_SIZE) -> List[EmailOutbox]:
+        """
+        Claim due messages so concurrent workers never deliver the same one.
+
+        Messages left in 'sending' by a worker that died are reclaimed once
+        their lock is older than OUTBOX_LOCK_TIMEOUT.
+
+        Args:
+            limit: Maximum messages to claim
+
+        Returns:
+            List of claimed EmailOutbox entries
+        """
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=OUTBOX_LOCK_TIMEOUT)
+        token = uuid.uuid4().hex
+
+        due = or_(
+            and_(EmailOutbox.status == OUTBOX_STATUS_PENDING, EmailOutbox.next_attempt_at <= now),
+            and_(EmailOutbox.status == OUTBOX_STATUS_SENDING, EmailOutbox.locked_at < stale)
+        )
+        due_ids = db.session.query(EmailOutbox.id).filter(due).order_by(
+            EmailOutbox.next_attempt_at, EmailOutbox.id
+        ).limit(limit).scalar_subquery()
+
+        # Re-checking the due condition makes the claim safe against a concurrent worker
+        EmailOutbox.query.filter(EmailOutbox.id.in_(due_ids), due).update({
+            'status': OUTBOX_STATUS_SENDING,
+            'locked_by': token,
+            'locked_at': now
+        }, synchronize_session=False)
+        db.session.commit()
+
+        return EmailOutbox.query.options(joinedload(EmailOutbox.body)).filter_by(
+            locked_by=token, status=OUTBOX_STATUS_SENDING
+        ).order_by(EmailOutbox.id).all()
+
+    @staticmethod
+    def mark_sent(entry: EmailOutbox) -> None:
+        """
+        Record a successful delivery.
+
+        Args:
+            entry: The delivered EmailOutbox entry
+        """
+        entry.status = OUTBOX_STATUS_SENT
+        entry.attempts += 1
+        entry.sent_at = datetime.utcnow()
+        entry.locked_by = None
+        entry.last_error = None
+
+    @staticmethod
+    def mark_failed(entry: EmailOutbox, error: Optional[str]) -> None:
+        """
+        Record a failed attempt and schedule a retry or dead-letter the message.
+
+        Args:
+            entry: The EmailOutbox entry that failed
+            error: Error message from the delivery attempt
+        """
+        entry.attempts += 1
+        entry.last_error = error
+        entry.locked_by = None
+        if entry.attempts >= OUTBOX_MAX_ATTEMPTS:
+            entry.status = OUTBOX_STATUS_DEAD
+        else:
+            delay = min(OUTBOX_RETRY_BASE_DELAY * 2 ** (entry.attempts - 1), OUTBOX_RETRY_MAX_DELAY)
+            entry.status = OUTBOX_STATUS_PENDING
+            entry.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+
+    @staticmethod
+    def process_batch(limit: int = OUTBOX_BATCH_SIZE) -> Dict[str, int]:
+        """
+        Claim and deliver one batch of due messages.
+
+        Args:
+            limit: Maximum messages to deliver
+
+        Returns:
+            Dictionary with 'sent', 'retried' and 'dead' counts
+        """
+        stats = {'sent': 0, 'retried': 0, 'dead': 0}
+
+        entries = OutboxService.claim_batch(limit)
+        if not entries:
+            return stats
+
+        is_configured, config_error = is_mail_configured()
+
+        # The whole batch shares one authenticated SMTP connection
+        with PooledMailSender() as sender:
+            for entry in entries:
+                if is_configured:
+                    success, error = sender.send(build_message(
+                        entry.subject,
+                        json.loads(entry.recipients),
+                        entry.body.html_body,
+                        entry.body.text_body,
+                        sender=entry.sender
+                    ))
+                else:
+                    success, error = False, config_error
+
+                if success:
+                    OutboxService.mark_sent(entry)
+                    stats['sent'] += 1
+                else:
+                    OutboxService.mark_failed(entry, error)
+                    stats['dead' if entry.status == OUTBOX_STATUS_DEAD else 'retried'] += 1
+                db.session.commit()
+
+        return stats
+
+    @staticmethod
+    def requeue_dead() -> int:
+        """
+        Move dead-lettered messages back to the queue for another round of attempts.
+
+        Returns:
+            Number of messages requeued
+        """
+        count = EmailOutbox.query.filter_by(status=OUTBOX_STATUS_DEAD).update({
+            'status': OUTBOX_STATUS_PENDING,
+            'attempts': 0,
+            'next_attempt_at': datetime.utcnow()
+        }, synchronize_session=False)
+        db.session.commit()
+        return count
+
+    @staticmethod
+    def prune(
+        sent_days: int,
+        dead_days: int,
+        chunk_size: int = OUTBOX_PRUNE_CHUNK_SIZE,
+        now: Optional[datetime] = None
+    ) -> Dict[str, int]:
+        """
+        Delete delivered and dead-lettered messages past their retention.
+
+        Rows are deleted oldest first, ``chunk_size`` per transaction, so a
+        large backlog never holds the database lock for long and an
+        interrupted run can simply be started again. Bodies no message
+        points at any more are deleted last.
+
+        Args:
+            sent_days: Keep delivered messages sent within this many days
+            dead_days: Keep dead-lettered messages created within this many days
+            chunk_size: Rows deleted per transaction
+            now: Reference time for the cutoffs (defaults to utcnow)
+
+        Returns:
+            Dictionary with the number of 'sent' and 'dead' messages and
+            'bodies' deleted
+        """
+        now = now or datetime.utcnow()
+        result = {
+            'sent': OutboxService._delete_in_chunks(EmailOutbox, and_(
+                EmailOutbox.status == OUTBOX_STATUS_SENT,
+                EmailOutbox.sent_at < now - timedelta(days=sent_days)
+            ), chunk_size),
+            'dead': OutboxService._delete_in_chunks(EmailOutbox, and_(
+                EmailOutbox.status == OUTBOX_STATUS_DEAD,
+                EmailOutbox.created_at < now - timedelta(days=dead_days)
+            ), chunk_size)
+        }
+        try:
+            result['bodies'] = OutboxService._delete_in_chunks(
+                EmailBody, ~exists().where(EmailOutbox.body_id == EmailBody.id), chunk_size
+            )
+        except IntegrityError:
+            # A new message reused a body as it was deleted; the next run gets the rest
+            db.session.rollback()
+            result['bodies'] = 0
+        return result
+
+    @staticmethod
+    def _delete_in_chunks(model, condition, chunk_size: int) -> int:
+        deleted = 0
+        while True:
+            ids = [row_id for row_id, in db.session.query(model.id).filter(
+                condition
+            ).order_by(model.id).limit(chunk_size)]
+            if not ids:
+                return deleted
+            deleted += model.query.filter(model.id.in_(ids)).delete(synchronize_session=False)
+            db.session.commit()
+
+    @staticmethod
+    def get_counts() -> Dict[str, int]:
+        """
+        Get the number of outbox messages in each status.
+
+        Returns:
+            Dictionary mapping status to message count
+        """
+        rows = db.session.query(
+            EmailOutbox.status, db.func.count(EmailOutbox.id)
+        ).group_by(EmailOutbox.status).all()
+        counts = {status: 0 for status in (
+            OUTBOX_STATUS_PENDING, OUTBOX_STATUS_SENDING, OUTBOX_STATUS_SENT, OUTBOX_STATUS_DEAD
+        )}
+        counts.update({status: count for status, count in rows})
+        return counts
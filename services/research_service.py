@@ -4,11 +4,28 @@ Research Service Module
 Business logic for research and researcher management functionality.
 """
 
+from collections import Counter
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterable, List, Optional, Tuple, Any
 from sqlalchemy import or_, and_, func
+from sqlalchemy.orm import joinedload, load_only, selectinload
 
-from models import db, Research, Researcher, User
+from models import db, Profile, Research, Researcher, ResearchStat, User
+from utils.search_index import RESEARCH_INDEX
+from utils.constants import (
+    AUTOCOMPLETE_MIN_SIMILARITY,
+    RESEARCHER_INDEX_TTL,
+    RESEARCH_STAT_DEPARTMENT,
+    RESEARCH_STAT_RESEARCHER,
+    RESEARCH_STAT_TOTAL,
+    RESEARCH_STAT_YEAR,
+)
+from utils.name_index import NameIndex
+from utils.query_helpers import insert_ignoring_conflict
+
+
+# Researcher names for autocomplete; other workers' edits are picked up on reload
+_researcher_names = NameIndex(min_similarity=AUTOCOMPLETE_MIN_SIMILARITY)
 
 
 class ResearchService:
@@ -23,6 +40,20 @@ class ResearchService:
         ('Pharmaceutical Chemistry', 'Pharmaceutical Chemistry'),
     ]
     
+    # Loader strategies for listing pages, so each renders in a fixed number
+    # of queries however many rows it shows
+    @staticmethod
+    def author_card_loader():
+        """Load each research's author name and picture in the same query."""
+        return joinedload(Research.author).load_only(
+            Researcher.id, Researcher.name, Researcher.profile_picture_url
+        )
+    
+    @staticmethod
+    def submitter_name_loader():
+        """Load the submitting user's display name in the same query."""
+        return joinedload(Research.submitted_by_user).joinedload(User.profile).load_only(Profile.full_name)
+    
     @staticmethod
     def get_year_choices() -> List[Tuple[str, str]]:
         """
@@ -41,12 +72,49 @@ class ResearchService:
     @staticmethod
     def get_all_researchers() -> List[Researcher]:
         """
-        Get all researchers ordered by name.
+        Get all researchers ordered by name, with their researches.
+        
+        The researches are loaded in one extra query for pages that list
+        them per researcher.
         
         Returns:
             List of Researcher objects
         """
-        return Researcher.query.order_by(Researcher.name).all()
+        return Researcher.query.options(
+            selectinload(Researcher.researches).load_only(Research.department, Research.researcher_type)
+        ).order_by(Researcher.name).all()
+    
+    @staticmethod
+    def get_researcher_choices() -> List[Researcher]:
+        """
+        Get researchers for a filter dropdown, loading only id and name.
+        
+        Returns:
+            List of Researcher objects ordered by name
+        """
+        return Researcher.query.options(
+            load_only(Researcher.id, Researcher.name)
+        ).order_by(Researcher.name).all()
+    
+    @staticmethod
+    def get_researchers_with_counts() -> List[Tuple[Researcher, int]]:
+        """
+        Get all researchers with their approved publication counts.
+        
+        Counts come from the research_stats snapshot in the same query.
+        
+        Returns:
+            List of (Researcher, count) tuples ordered by name
+        """
+        return db.session.query(
+            Researcher,
+            func.coalesce(ResearchStat.count, 0)
+        ).outerjoin(
+            ResearchStat, and_(
+                ResearchStat.dimension == RESEARCH_STAT_RESEARCHER,
+                ResearchStat.value == db.cast(Researcher.id, db.String)
+            )
+        ).order_by(Researcher.name).all()
     
     @staticmethod
     def get_researcher_by_id(researcher_id: int) -> Optional[Researcher]:
@@ -136,10 +204,13 @@ class ResearchService:
             page: Page number for pagination
             per_page: Items per page
             
+        Searches use the full-text index and are ordered by relevance;
+        on databases without one they fall back to substring matching.
+            
         Returns:
             SQLAlchemy Pagination object
         """
-        query = Research.query.filter(Research.is_approved == True)
+        query = Research.query.options(ResearchService.author_card_loader()).filter(Research.is_approved == True)
         
         # Apply department filter
         if department and department != 'all':
@@ -162,18 +233,24 @@ class ResearchService:
             query = query.filter(Research.researcher_type == researcher_type)
         
         # Apply search filter
+        ordering = []
         if search_query:
-            search_term = f'%{search_query}%'
-            # Join with researcher to search by name
-            query = query.join(Researcher).filter(
-                or_(
-                    Research.title.ilike(search_term),
-                    Researcher.name.ilike(search_term)
+            hits = RESEARCH_INDEX.search(search_query)
+            if hits is not None:
+                query = query.join(hits, hits.c.id == Research.id)
+                ordering.append(hits.c.score.desc())
+            else:
+                search_term = f'%{search_query}%'
+                # Join with researcher to search by name
+                query = query.join(Researcher).filter(
+                    or_(
+                        Research.title.ilike(search_term),
+                        Researcher.name.ilike(search_term)
+                    )
                 )
-            )
         
-        # Order by year descending, then by title
-        query = query.order_by(Research.year.desc(), Research.title)
+        # Order by relevance when searching, then year descending, then title
+        query = query.order_by(*ordering, Research.year.desc(), Research.title)
         
         # Apply pagination
         return query.paginate(page=page, per_page=per_page, error_out=False)
@@ -183,47 +260,117 @@ class ResearchService:
         """
         Get statistics about researches.
         
+        Reads the research_stats snapshot maintained by the approve, reject,
+        update and delete methods below, so the Research table is not
+        scanned. Run `flask rebuild-research-stats` after changing researches
+        outside this service.
+        
         Returns:
             Dictionary containing various statistics
         """
-        # Total approved researches
-        total_researches = Research.query.filter_by(is_approved=True).count()
-        
-        # Total researchers
-        total_researchers = Researcher.query.count()
+        rows = db.session.query(
+            ResearchStat.dimension, ResearchStat.value, ResearchStat.count
+        ).filter(
+            ResearchStat.dimension != RESEARCH_STAT_RESEARCHER,
+            ResearchStat.count > 0
+        ).all()
         
-        # Researches by department
-        dept_stats = db.session.query(
-            Research.department,
-            func.count(Research.id)
-        ).filter(Research.is_approved == True).group_by(Research.department).all()
-        
-        departments = {dept: count for dept, count in dept_stats}
-        
-        # Researches by year
-        year_stats = db.session.query(
-            Research.year,
-            func.count(Research.id)
-        ).filter(Research.is_approved == True).group_by(Research.year).order_by(Research.year.desc()).all()
-        
-        years = {year: count for year, count in year_stats}
+        counts = {RESEARCH_STAT_TOTAL: {}, RESEARCH_STAT_DEPARTMENT: {}, RESEARCH_STAT_YEAR: {}}
+        for dimension, value, count in rows:
+            counts.setdefault(dimension, {})[value] = count
         
         # Top researchers (by number of researches)
         top_researchers = db.session.query(
-            Researcher,
-            func.count(Research.id).label('research_count')
-        ).join(Research).filter(
-            Research.is_approved == True
-        ).group_by(Researcher.id).order_by(func.count(Research.id).desc()).limit(5).all()
+            Researcher.name,
+            ResearchStat.count
+        ).join(
+            # Cast the id, not the value: other dimensions' values are not integers
+            ResearchStat, and_(
+                ResearchStat.dimension == RESEARCH_STAT_RESEARCHER,
+                ResearchStat.value == db.cast(Researcher.id, db.String)
+            )
+        ).filter(
+            ResearchStat.count > 0
+        ).order_by(ResearchStat.count.desc(), Researcher.name).limit(5).all()
         
         return {
-            'total_researches': total_researches,
-            'total_researchers': total_researchers,
-            'departments': departments,
-            'years': years,
-            'top_researchers': [(r.name, count) for r, count in top_researchers]
+            'total_researches': counts[RESEARCH_STAT_TOTAL].get('', 0),
+            'total_researchers': Researcher.query.count(),
+            'departments': counts[RESEARCH_STAT_DEPARTMENT],
+            'years': {int(year): count for year, count in
+                      sorted(counts[RESEARCH_STAT_YEAR].items(), key=lambda item: int(item[0]), reverse=True)},
+            'top_researchers': [(name, count) for name, count in top_researchers]
         }
     
+    @staticmethod
+    def rebuild_research_statistics() -> int:
+        """
+        Recompute the research_stats snapshot from the Research table.
+        
+        Returns:
+            Number of statistics rows written
+        """
+        ResearchStat.query.delete()
+        
+        stats = []
+        total = Research.query.filter(Research.is_approved == True).count()
+        if total:
+            stats.append(ResearchStat(dimension=RESEARCH_STAT_TOTAL, value='', count=total))
+        for dimension, column in [
+            (RESEARCH_STAT_DEPARTMENT, Research.department),
+            (RESEARCH_STAT_YEAR, Research.year),
+            (RESEARCH_STAT_RESEARCHER, Research.researcher_id),
+        ]:
+            rows = db.session.query(
+                column, func.count(Research.id)
+            ).filter(Research.is_approved == True).group_by(column).all()
+            stats.extend(ResearchStat(dimension=dimension, value=str(value), count=count) for value, count in rows)
+        
+        db.session.add_all(stats)
+        db.session.commit()
+        return len(stats)
+    
+    @staticmethod
+    def _statistics_keys(research: Research) -> List[Tuple[str, str]]:
+        """Snapshot rows an approved research counts towards."""
+        return [
+            (RESEARCH_STAT_TOTAL, ''),
+            (RESEARCH_STAT_DEPARTMENT, research.department),
+            (RESEARCH_STAT_YEAR, str(research.year)),
+            (RESEARCH_STAT_RESEARCHER, str(research.researcher_id)),
+        ]
+    
+    @staticmethod
+    def _adjust_statistics(removed: Iterable[Tuple[str, str]] = (),
+                           added: Iterable[Tuple[str, str]] = ()) -> None:
+        """
+        Apply count changes to the research_stats snapshot in the current transaction.
+        
+        Counts are changed with ``count = count + delta`` in SQL, so
+        concurrent admins cannot overwrite each other's adjustments. A
+        missing row is inserted without conflicting with an admin creating
+        it at the same time; the loser adds its delta to the winner's row.
+        
+        Args:
+            removed: Keys of approved researches going away
+            added: Keys of approved researches appearing
+        """
+        deltas = Counter(added)
+        deltas.subtract(removed)
+        for (dimension, value), delta in deltas.items():
+            if not delta:
+                continue
+            row = ResearchStat.query.filter_by(dimension=dimension, value=value)
+            updated = row.update({ResearchStat.count: ResearchStat.count + delta}, synchronize_session=False)
+            if updated or delta < 0:
+                continue
+            inserted = insert_ignoring_conflict(
+                db.session, ResearchStat, {'dimension': dimension, 'value': value, 'count': delta},
+                ['dimension', 'value']
+            )
+            if inserted is None:
+                row.update({ResearchStat.count: ResearchStat.count + delta}, synchronize_session=False)
+    
     @staticmethod
     def create_researcher(
         name: str,
@@ -252,6 +399,7 @@ class ResearchService:
         )
         db.session.add(researcher)
         db.session.commit()
+        _researcher_names.add(researcher.id, researcher.name)
         return researcher
     
     @staticmethod
@@ -285,6 +433,7 @@ class ResearchService:
             researcher.profile_picture_url = profile_picture_url
         
         db.session.commit()
+        _researcher_names.add(researcher.id, researcher.name)
         return researcher
     
     @staticmethod
@@ -302,8 +451,13 @@ class ResearchService:
         if not researcher:
             return False
         
+        ResearchService._adjust_statistics(removed=[
+            key for research in researcher.researches if research.is_approved
+            for key in ResearchService._statistics_keys(research)
+        ])
         db.session.delete(researcher)
         db.session.commit()
+        _researcher_names.remove(researcher_id)
         return True
     
     @staticmethod
@@ -333,7 +487,8 @@ class ResearchService:
         """
         # Get or create researcher
         researcher = ResearchService.get_researcher_by_name(researcher_name)
-        if not researcher:
+        new_researcher = researcher is None
+        if new_researcher:
             researcher = Researcher(name=researcher_name)
             db.session.add(researcher)
             db.session.flush()  # Get ID without committing
@@ -351,6 +506,8 @@ class ResearchService:
         )
         db.session.add(research)
         db.session.commit()
+        if new_researcher:
+            _researcher_names.add(researcher.id, researcher.name)
         
         return research
     
@@ -369,6 +526,8 @@ class ResearchService:
         if not research:
             return None
         
+        if not research.is_approved:
+            ResearchService._adjust_statistics(added=ResearchService._statistics_keys(research))
         research.is_approved = True
         db.session.commit()
         return research
@@ -388,6 +547,8 @@ class ResearchService:
         if not research:
             return False
         
+        if research.is_approved:
+            ResearchService._adjust_statistics(removed=ResearchService._statistics_keys(research))
         db.session.delete(research)
         db.session.commit()
         return True
@@ -404,7 +565,10 @@ class ResearchService:
         Returns:
             SQLAlchemy Pagination object
         """
-        return Research.query.filter_by(
+        return Research.query.options(
+            ResearchService.author_card_loader(),
+            ResearchService.submitter_name_loader()
+        ).filter_by(
             is_approved=False
         ).order_by(Research.created_at.desc()).paginate(
             page=page, per_page=per_page, error_out=False
@@ -450,6 +614,7 @@ class ResearchService:
         if not research:
             return None
         
+        old_keys = ResearchService._statistics_keys(research)
         if title:
             research.title = title
         if department:
@@ -461,6 +626,8 @@ class ResearchService:
         if researcher_type:
             research.researcher_type = researcher_type
         
+        if research.is_approved:
+            ResearchService._adjust_statistics(removed=old_keys, added=ResearchService._statistics_keys(research))
         db.session.commit()
         return research
     
@@ -479,23 +646,35 @@ class ResearchService:
         if not research:
             return False
         
+        if research.is_approved:
+            ResearchService._adjust_statistics(removed=ResearchService._statistics_keys(research))
         db.session.delete(research)
         db.session.commit()
         return True
     
     @staticmethod
-    def search_researchers(query: str, limit: int = 10) -> List[Researcher]:
+    def search_researchers(query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
-        Search researchers by name.
+        Search researchers by name for autocomplete.
+        
+        Answered from an in-memory trigram index that tolerates typos and
+        ranks name prefixes first. The index is loaded on first use and
+        reloaded every RESEARCHER_INDEX_TTL seconds to pick up changes
+        made by other workers.
         
         Args:
             query: Search query
             limit: Maximum results to return
             
         Returns:
-            List of Researcher objects
+            List of dictionaries with 'id' and 'name'
         """
-        search_term = f'%{query}%'
-        return Researcher.query.filter(
-            Researcher.name.ilike(search_term)
-        ).limit(limit).all()
\ No newline at end of file
+        if _researcher_names.is_stale(RESEARCHER_INDEX_TTL):
+            _researcher_names.load(db.session.query(Researcher.id, Researcher.name).all())
+        return [{'id': researcher_id, 'name': name}
+                for researcher_id, name in _researcher_names.search(query, limit)]
+    
+    @staticmethod
+    def forget_researcher_names() -> None:
+        """Drop the researcher autocomplete index so the next search reloads it."""
+        _researcher_names.clear()
\ No newline at end of file
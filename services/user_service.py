@@ -4,13 +4,19 @@ User Service Module
 Business logic for user management functionality.
 """
 
-from typing import Dict, List, Optional
+from collections import namedtuple
+from typing import Dict, Iterator, List, Optional
 
 from models import db, User, UserRole, Profile, StudentProfile, AlumniProfile, ResearcherProfile
+from utils.constants import RECIPIENT_CHUNK_SIZE
 from utils.json_utils import safe_json_parse, combine_timeline, get_user_timeline
 from utils.image_utils import process_profile_picture
 
 
+# Lightweight stand-in for User when mailing many members; templates only need these fields
+Recipient = namedtuple('Recipient', ['id', 'email', 'name'])
+
+
 class UserService:
     """Service class for user-related operations."""
     
@@ -242,3 +248,49 @@ class UserService:
         if user.role == UserRole.RESEARCHER and user.researcher_profile:
             return bool(getattr(user.researcher_profile, 'open_to_mentor', False))
         return False
+
+    @staticmethod
+    def iter_recipients(*criteria, chunk_size: int = RECIPIENT_CHUNK_SIZE) -> Iterator[Recipient]:
+        """
+        Stream (id, email, name) tuples for users matching the given filters.
+
+        Rows are read in primary-key pages with a column-only select, so
+        memory stays flat however many members match. Paging by ID rather
+        than holding one cursor open keeps the stream valid while the
+        caller commits between recipients.
+
+        Args:
+            *criteria: SQLAlchemy filter expressions on User
+            chunk_size: Rows fetched per query
+
+        Returns:
+            Iterator of Recipient tuples ordered by user ID
+        """
+        last_id = 0
+        while True:
+            rows = db.session.query(
+                User.id,
+                User.email,
+                db.func.coalesce(Profile.full_name, 'Unknown User')
+            ).outerjoin(Profile, Profile.user_id == User.id).filter(
+                *criteria, User.id > last_id
+            ).order_by(User.id).limit(chunk_size).all()
+
+            for row in rows:
+                yield Recipient(*row)
+            if len(rows) < chunk_size:
+                return
+            last_id = rows[-1][0]
+
+    @staticmethod
+    def count_recipients(*criteria) -> int:
+        """
+        Count users matching the given filters.
+
+        Args:
+            *criteria: SQLAlchemy filter expressions on User
+
+        Returns:
+            Number of matching users
+        """
+        return db.session.query(db.func.count(User.id)).filter(*criteria).scalar()
@@ -10,16 +10,20 @@ class ChatManager {
     }
 
     init() {
+        // Get user IDs from the page
+        const idSource = document.querySelector('[data-other-user-id]') || document.body;
+        this.currentUserId = idSource.getAttribute('data-current-user-id');
+        this.otherUserId = idSource.getAttribute('data-other-user-id');
+
+        // Older history is fetched over HTTP, so it works without the socket
+        this.setupHistoryLoader();
+
         // Guard: Socket.IO must be loaded
         if (typeof io === 'undefined') {
             console.error('Socket.IO library not loaded');
             return;
         }
 
-        // Get user IDs from the page
-        this.currentUserId = document.body.getAttribute('data-current-user-id');
-        this.otherUserId = document.body.getAttribute('data-other-user-id');
-
         if (this.currentUserId && this.otherUserId) {
             this.connectSocket();
             this.setupEventListeners();
@@ -116,6 +120,8 @@ class ChatManager {
             this.addMessageToUI(data, false);
             // Auto-scroll to bottom
             this.scrollToBottom();
+            // Acknowledge it straight away since the conversation is open
+            this.markMessagesAsRead();
         }
     }
 
@@ -165,6 +171,107 @@ class ChatManager {
         container.insertBefore(messageDiv, typingIndicator);
     }
 
+    setupHistoryLoader() {
+        const container = document.getElementById('messages-container');
+        this.historyUrl = container.getAttribute('data-history-url');
+        this.beforeId = container.getAttribute('data-before-id') || null;
+        this.loadingHistory = false;
+
+        container.addEventListener('scroll', () => {
+            if (container.scrollTop < 100) {
+                this.loadOlderMessages();
+            }
+        });
+    }
+
+    loadOlderMessages() {
+        if (!this.historyUrl || !this.beforeId || this.loadingHistory) return;
+        this.loadingHistory = true;
+
+        const container = document.getElementById('messages-container');
+        fetch(`${this.historyUrl}?before_id=${this.beforeId}`)
+            .then(response => response.json())
+            .then(data => {
+                const fragment = document.createDocumentFragment();
+                let lastDate = null;
+                data.messages.forEach(message => {
+                    const dateKey = message.created_at.slice(0, 10);
+                    if (dateKey !== lastDate) {
+                        fragment.appendChild(this.buildDateSeparator(dateKey));
+                        lastDate = dateKey;
+                    }
+                    fragment.appendChild(this.buildHistoryRow(message));
+                });
+
+                // The page may end on the same day the current view starts with
+                const firstSeparator = container.querySelector('.message-date-separator');
+                if (firstSeparator && firstSeparator.getAttribute('data-date') === lastDate) {
+                    firstSeparator.remove();
+                }
+
+                // Keep the viewport anchored on the message the user was reading
+                const previousHeight = container.scrollHeight;
+                container.insertBefore(fragment, container.firstChild);
+                container.scrollTop += container.scrollHeight - previousHeight;
+
+                this.beforeId = data.next_before_id;
+            })
+            .catch(error => {
+                console.error('Error loading older messages:', error);
+            })
+            .finally(() => {
+                this.loadingHistory = false;
+            });
+    }
+
+    buildDateSeparator(dateKey) {
+        const separator = document.createElement('div');
+        separator.className = 'message-date-separator';
+        separator.setAttribute('data-date', dateKey);
+
+        const today = new Date();
+        const todayKey = `${today.getFullYear()}-${String(today.getMonth() + 1).padStart(2, '0')}-${String(today.getDate()).padStart(2, '0')}`;
+        const label = dateKey === todayKey
+            ? 'Today'
+            : new Date(`${dateKey}T00:00:00`).toLocaleDateString('en-US', { month: 'long', day: '2-digit', year: 'numeric' });
+
+        separator.innerHTML = `<span class="message-date-label">${label}</span>`;
+        return separator;
+    }
+
+    buildHistoryRow(messageData) {
+        // Mirrors the server-rendered markup in conversation.html
+        const isSent = messageData.sender_id == this.currentUserId;
+        const side = isSent ? 'sent' : 'received';
+
+        const row = document.createElement('div');
+        row.className = `message-row ${side}`;
+        row.setAttribute('data-message-id', messageData.id);
+
+        const readReceiptHtml = (isSent && messageData.is_read)
+            ? '<i class="fas fa-check-double message-read-icon"></i>'
+            : '';
+
+        const deleteHtml = isSent
+            ? `<button onclick="deleteMessage(${messageData.id})" class="message-delete-btn">
+                   <i class="fas fa-trash-alt"></i>
+               </button>`
+            : '';
+
+        row.innerHTML = `
+            <div class="message-bubble ${side}">
+                <p class="message-text">${this.escapeHtml(messageData.content)}</p>
+            </div>
+
+            <div class="message-meta">
+                <span>${this.formatTime(messageData.created_at)}</span>
+                ${readReceiptHtml}
+                ${deleteHtml}
+            </div>
+        `;
+        return row;
+    }
+
     handleTyping() {
         if (!this.isTyping) {
             this.isTyping = true;
@@ -209,19 +316,35 @@ class ChatManager {
     }
 
     markMessagesAsRead() {
-        // Mark messages as read when viewing conversation
-        this.socket.emit('mark_read', {
+        // Acknowledge everything up to the newest message on screen
+        const payload = {
             user_id: parseInt(this.currentUserId),
             other_user_id: parseInt(this.otherUserId)
+        };
+        const latestId = this.getLatestMessageId();
+        if (latestId) {
+            payload.up_to_id = latestId;
+        }
+        this.socket.emit('mark_read', payload);
+    }
+
+    getLatestMessageId() {
+        let latestId = 0;
+        document.querySelectorAll('[data-message-id]').forEach(element => {
+            latestId = Math.max(latestId, parseInt(element.getAttribute('data-message-id')) || 0);
         });
+        return latestId;
     }
 
     handleMessagesRead(data) {
-        // Update read receipts for sent messages
-        data.message_ids.forEach(messageId => {
-            const messageElement = document.querySelector(`[data-message-id="${messageId}"]`);
-            if (messageElement && messageElement.classList.contains('items-end')) {
-                const timeContainer = messageElement.querySelector('.gap-1');
+        // Update read receipts for every sent message up to the watermark
+        document.querySelectorAll('[data-message-id]').forEach(messageElement => {
+            const messageId = parseInt(messageElement.getAttribute('data-message-id'));
+            if (messageId > data.up_to_id) {
+                return;
+            }
+            if (messageElement.classList.contains('sent') || messageElement.classList.contains('items-end')) {
+                const timeContainer = messageElement.querySelector('.message-meta, .gap-1');
                 if (timeContainer) {
                     const existingReceipt = timeContainer.querySelector('.fa-check-double');
                     if (!existingReceipt) {
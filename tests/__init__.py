@@ -0,0 +1,6 @@
+import os
+
+# Point the app at a throwaway in-memory database before anything imports config.
+os.environ['DATABASE_URL'] = 'sqlite://'
+# Keep Socket.IO in-process so the test client sees emits synchronously.
+os.environ['SOCKETIO_MESSAGE_QUEUE'] = ''
@@ -0,0 +1,76 @@
+"""
+Shared helpers for database-backed test cases.
+"""
+
+import unittest
+from contextlib import contextmanager
+
+from flask import g
+from sqlalchemy import event
+
+from app import app
+from models import db, User, Profile
+from services import MessageService, ResearchService
+from utils.stats_cache import invalidate_home_stats
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """Test case with a fresh schema and an application context per test."""
+
+    def setUp(self):
+        self.app_context = app.app_context()
+        self.app_context.push()
+        db.create_all()
+        # User IDs are reused across tests, so cached names must not leak between them
+        MessageService.forget_display_name()
+        invalidate_home_stats()
+        ResearchService.forget_researcher_names()
+        self.client = app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def create_user(self, name, email=None):
+        user = User(email=email or f"{name.lower().replace(' ', '.')}@example.com")
+        user.profile = Profile(full_name=name)
+        db.session.add(user)
+        db.session.commit()
+        return user
+
+    def login(self, user):
+        with self.client.session_transaction() as session:
+            session['_user_id'] = str(user.id)
+            session['_fresh'] = True
+        # Requests share the test's app context, so drop the user Flask-Login cached
+        g.pop('_login_user', None)
+
+    def logout(self):
+        with self.client.session_transaction() as session:
+            session.clear()
+        g.pop('_login_user', None)
+
+    @contextmanager
+    def count_queries(self):
+        """Collect every SQL statement executed inside the block."""
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+    @contextmanager
+    def assert_max_queries(self, limit):
+        """Fail if the block executes more than ``limit`` SQL statements."""
+        with self.count_queries() as statements:
+            yield statements
+        self.assertLessEqual(
+            len(statements), limit,
+            f'{len(statements)} statements (budget {limit}):\n' + '\n'.join(statements)
+        )
@@ -0,0 +1,155 @@
+"""
+A local stand-in SMTP server for tests that exercise real mail delivery.
+"""
+
+import base64
+import socketserver
+import threading
+import time
+from contextlib import contextmanager
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def readline(self):
+        return self.rfile.readline().decode('utf-8', 'replace').rstrip('\r\n')
+
+    def handle(self):
+        server = self.server.stub
+        with server.lock:
+            server.connections += 1
+        envelope = {}
+        accepted = 0
+        if server.handshake_delay:
+            # Stand-in for the TCP/TLS/AUTH setup cost of a real server
+            time.sleep(server.handshake_delay)
+        self.reply('220 stub ESMTP ready')
+
+        while True:
+            line = self.readline()
+            if not line and self.rfile.closed:
+                return
+            command = line.split(' ', 1)[0].upper()
+            argument = line[len(command):].strip()
+
+            if command == 'EHLO':
+                self.reply('250-stub')
+                self.reply('250-AUTH PLAIN LOGIN')
+                self.reply('250 8BITMIME')
+            elif command == 'HELO':
+                self.reply('250 stub')
+            elif command == 'AUTH':
+                mechanism, _, initial = argument.partition(' ')
+                if mechanism.upper() == 'LOGIN':
+                    self.reply('334 VXNlcm5hbWU6')
+                    self.readline()
+                    self.reply('334 UGFzc3dvcmQ6')
+                    self.readline()
+                elif not initial:
+                    self.reply('334 ')
+                    base64.b64decode(self.readline())
+                self.reply('235 Authentication successful')
+            elif command == 'MAIL':
+                with server.lock:
+                    refuse = server.failures_left > 0
+                    if refuse:
+                        server.failures_left -= 1
+                if refuse:
+                    self.reply('451 Temporary failure, try again later')
+                else:
+                    envelope = {'mail_from': argument, 'rcpt_tos': []}
+                    self.reply('250 OK')
+            elif command == 'RCPT':
+                envelope.setdefault('rcpt_tos', []).append(argument.split(':', 1)[1].strip(' <>'))
+                self.reply('250 OK')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                while True:
+                    data_line = self.readline()
+                    if data_line == '.':
+                        break
+                    lines.append(data_line[1:] if data_line.startswith('..') else data_line)
+                envelope['data'] = '\n'.join(lines)
+                with server.lock:
+                    server.messages.append(envelope)
+                envelope = {}
+                self.reply('250 Message accepted')
+                accepted += 1
+                if server.disconnect_after and accepted >= server.disconnect_after:
+                    # Drop the connection without a goodbye, like an idle timeout
+                    return
+            elif command in ('RSET', 'NOOP'):
+                envelope = {}
+                self.reply('250 OK')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                return
+            elif not line:
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+class StubSMTPServer:
+    """Threaded SMTP server that records messages and can refuse on demand."""
+
+    def __init__(self, handshake_delay=0.0, disconnect_after=None):
+        self.messages = []
+        self.connections = 0
+        self.failures_left = 0
+        self.handshake_delay = handshake_delay
+        self.disconnect_after = disconnect_after
+        self.lock = threading.Lock()
+        self._server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), _SMTPHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def fail_next(self, count):
+        """Answer the next `count` MAIL FROM commands with a temporary failure."""
+        with self.lock:
+            self.failures_left = count
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@contextmanager
+def stub_mail_server(**options):
+    """Point the app's Flask-Mail extension at a fresh stub server."""
+    from app import app, mail
+
+    server = StubSMTPServer(**options)
+    server.start()
+    overrides = {
+        'MAIL_SERVER': '127.0.0.1',
+        'MAIL_PORT': server.port,
+        'MAIL_USE_TLS': False,
+        'MAIL_USE_SSL': False,
+        'MAIL_USERNAME': 'psra',
+        'MAIL_PASSWORD': 'secret',
+        'MAIL_DEFAULT_SENDER': 'noreply@psra.test',
+        'MAIL_SUPPRESS_SEND': False,
+    }
+    missing = object()
+    saved = {key: app.config.get(key, missing) for key in overrides}
+    app.config.update(overrides)
+    mail.init_app(app)
+    try:
+        yield server
+    finally:
+        for key, value in saved.items():
+            if value is missing:
+                app.config.pop(key, None)
+            else:
+                app.config[key] = value
+        mail.init_app(app)
+        server.stop()
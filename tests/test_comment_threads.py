@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+from models import db, Comment, Post
+from services import ForumService
+from tests.base import DatabaseTestCase
+
+
+class CommentThreadTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.author = self.create_user('Author')
+        self.post = Post(user_id=self.author.id, title='Long thread', content='Body')
+        db.session.add(self.post)
+        db.session.commit()
+        self.post_id = self.post.id
+        self.start = datetime(2026, 3, 1, 9, 0)
+
+    def add_comments(self, count):
+        members = [self.create_user(f'Commenter {Comment.query.count()}-{i}') for i in range(3)]
+        offset = Comment.query.count()
+        for i in range(count):
+            db.session.add(Comment(post_id=self.post_id, user_id=members[i % 3].id, content=f'Reply {offset + i}',
+                                   created_at=self.start + timedelta(minutes=offset + i)))
+        db.session.commit()
+        ForumService.reconcile_post_counts()
+
+    def test_cursor_walks_the_thread_oldest_first(self):
+        self.add_comments(5)
+        # Same timestamp for two comments: the id breaks the tie
+        first, second = Comment.query.order_by(Comment.id).limit(2).all()
+        second.created_at = first.created_at
+        db.session.commit()
+
+        seen, cursor = [], None
+        for _ in range(3):
+            comments, cursor = ForumService.get_comment_page(self.post_id, cursor=cursor, limit=2)
+            seen.extend(comment['content'] for comment in comments)
+
+        self.assertIsNone(cursor)
+        self.assertEqual(seen, [f'Reply {i}' for i in range(5)])
+
+    def test_page_is_one_column_only_query(self):
+        self.add_comments(3)
+
+        with self.count_queries() as statements:
+            comments, _ = ForumService.get_comment_page(self.post_id)
+
+        self.assertEqual(len(statements), 1)
+        self.assertNotIn('password_hash', statements[0])
+        self.assertNotIn('profiles.bio', statements[0])
+        self.assertEqual(comments[0]['author_name'], 'Commenter 0-0')
+
+    def test_post_detail_query_count_does_not_grow_with_comments(self):
+        self.add_comments(3)
+        db.session.expunge_all()
+        with self.count_queries() as small:
+            self.client.get(f'/forum/post/{self.post_id}')
+        self.add_comments(80)
+        db.session.expunge_all()
+
+        with self.count_queries() as large:
+            response = self.client.get(f'/forum/post/{self.post_id}')
+
+        self.assertEqual(len(large), len(small))
+        self.assertIn(b'Reply 49', response.data)
+        self.assertNotIn(b'Reply 50<', response.data)
+        self.assertIn(b'Load more comments', response.data)
+        self.assertIn(b'Comments (83)', response.data)
+
+    def test_load_more_endpoint(self):
+        self.add_comments(4)
+        _, cursor = ForumService.get_comment_page(self.post_id, limit=2)
+
+        data = self.client.get(f'/forum/post/{self.post_id}/comments?cursor={cursor}').get_json()
+
+        self.assertEqual([comment['content'] for comment in data['comments']], ['Reply 2', 'Reply 3'])
+        self.assertIsNone(data['next_cursor'])
+        self.assertEqual(data['comments'][0]['created_at'], (self.start + timedelta(minutes=2)).isoformat())
+        self.assertEqual(self.client.get(f'/forum/post/{self.post_id + 1}/comments').status_code, 404)
@@ -0,0 +1,81 @@
+import json
+from datetime import date, time
+from unittest import mock
+
+from app import app
+from models import db, EmailOutbox, Event, NotificationLog
+from services.user_service import Recipient
+from tests.base import DatabaseTestCase
+from tests.smtp_stub import stub_mail_server
+from utils.email_dispatch import EmailCampaign, event_reminder_campaign
+from utils.notification_utils import send_event_reminder
+
+
+class EmailCampaignTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        mail_server = stub_mail_server(handshake_delay=0.05)
+        self.mail_server = mail_server.__enter__()
+        self.addCleanup(mail_server.__exit__, None, None, None)
+
+    def recipients(self, count):
+        return [Recipient(i, f'member{i}@example.com', f'Member {i}') for i in range(count)]
+
+    def create_event(self):
+        organizer = self.create_user('Organizer')
+        organizer.event_reminders_enabled = False
+        event = Event(title='Journal Club', event_date=date(2026, 5, 1), event_time=time(18, 30),
+                      presenter='Dr. Example', created_by=organizer.id)
+        db.session.add(event)
+        db.session.commit()
+        return event
+
+    def test_inline_campaign_respects_per_host_limit(self):
+        app.config['MAIL_USE_OUTBOX'] = False
+        self.addCleanup(app.config.__setitem__, 'MAIL_USE_OUTBOX', True)
+        campaign = EmailCampaign('Hello', 'greeting', '<p>Dear {{ user.name }}, {{ greeting }}</p>',
+                                 context={'greeting': 'welcome'}, max_workers=6, per_host_limit=2)
+
+        results = list(campaign.send(self.recipients(12)))
+
+        self.assertEqual(len(results), 12)
+        self.assertTrue(all(success for _, success, _ in results))
+        self.assertLessEqual(self.mail_server.connections, 2)
+        bodies = {m['rcpt_tos'][0]: m['data'] for m in self.mail_server.messages}
+        self.assertIn('Dear Member 7, welcome', bodies['member7@example.com'])
+
+    def test_campaign_renders_from_compiled_template(self):
+        event = self.create_event()
+        event_reminder_campaign(event)
+
+        with mock.patch.object(app.jinja_env, 'from_string', wraps=app.jinja_env.from_string) as compile_template:
+            campaign = event_reminder_campaign(event, max_workers=4)
+            results = list(campaign.send(self.recipients(10)))
+
+        self.assertEqual(compile_template.call_count, 0)
+        self.assertEqual(len(results), 10)
+        self.assertEqual(EmailOutbox.query.count(), 10)
+        self.assertEqual(self.mail_server.connections, 0)
+
+    def test_render_failures_are_reported_per_recipient(self):
+        campaign = EmailCampaign('Hello', 'fragile', '<p>{{ 1 // user.id }}</p>', max_workers=3)
+
+        results = {recipient.id: (success, error) for recipient, success, error in campaign.send(self.recipients(4))}
+
+        self.assertFalse(results[0][0])
+        self.assertIn('division', results[0][1])
+        self.assertTrue(all(results[i][0] for i in range(1, 4)))
+        self.assertEqual(EmailOutbox.query.count(), 3)
+
+    def test_event_reminder_runs_as_campaign_and_logs_results(self):
+        event = self.create_event()
+        members = [self.create_user(f'Member {i}') for i in range(5)]
+
+        count = send_event_reminder(event, max_workers=3)
+
+        self.assertEqual(count, 5)
+        queued = {json.loads(entry.recipients)[0]: entry for entry in EmailOutbox.query}
+        self.assertEqual(set(queued), {user.email for user in members})
+        self.assertIn('Dear Member 2', queued[members[2].email].body.html_body)
+        self.assertIn('06:30 PM', queued[members[2].email].body.html_body)
+        self.assertEqual(NotificationLog.query.filter_by(reference_id=event.id, status='sent').count(), 5)
@@ -0,0 +1,144 @@
+import json
+from datetime import datetime, timedelta
+
+from app import app
+from models import db, EmailBody, EmailOutbox
+from services import OutboxService
+from tests.base import DatabaseTestCase
+from tests.smtp_stub import stub_mail_server
+from utils.constants import OUTBOX_MAX_ATTEMPTS, OUTBOX_RETRY_BASE_DELAY
+from utils.email_utils import send_email
+
+
+class EmailOutboxTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        mail_server = stub_mail_server()
+        self.mail_server = mail_server.__enter__()
+        self.addCleanup(mail_server.__exit__, None, None, None)
+
+    def make_due(self):
+        EmailOutbox.query.update({'next_attempt_at': datetime.utcnow() - timedelta(seconds=1)})
+        db.session.commit()
+
+    def test_send_email_only_enqueues(self):
+        success, error = send_email('Welcome', ['member@example.com'], '<p>Hi</p>', 'Hi')
+
+        self.assertTrue(success)
+        self.assertIsNone(error)
+        self.assertEqual(self.mail_server.connections, 0)
+        entry = EmailOutbox.query.one()
+        self.assertEqual(entry.status, 'pending')
+        self.assertEqual(json.loads(entry.recipients), ['member@example.com'])
+
+    def test_failed_enqueue_leaves_session_usable(self):
+        success, error = send_email(None, ['member@example.com'], '<p>Hi</p>')
+
+        self.assertFalse(success)
+        self.assertIsNotNone(error)
+        self.assertEqual(EmailOutbox.query.count(), 0)
+
+    def test_worker_delivers_queued_email(self):
+        send_email('Welcome', ['member@example.com'], '<p>Hi</p>')
+
+        stats = OutboxService.process_batch()
+
+        self.assertEqual(stats, {'sent': 1, 'retried': 0, 'dead': 0})
+        self.assertEqual(len(self.mail_server.messages), 1)
+        self.assertEqual(self.mail_server.messages[0]['rcpt_tos'], ['member@example.com'])
+        self.assertIn('Subject: Welcome', self.mail_server.messages[0]['data'])
+        entry = EmailOutbox.query.one()
+        self.assertEqual(entry.status, 'sent')
+        self.assertIsNotNone(entry.sent_at)
+
+    def test_failed_delivery_is_retried_with_backoff(self):
+        send_email('Welcome', ['member@example.com'], '<p>Hi</p>')
+        self.mail_server.fail_next(1)
+
+        stats = OutboxService.process_batch()
+
+        self.assertEqual(stats['retried'], 1)
+        entry = EmailOutbox.query.one()
+        self.assertEqual((entry.status, entry.attempts), ('pending', 1))
+        self.assertGreater(entry.next_attempt_at,
+                           datetime.utcnow() + timedelta(seconds=OUTBOX_RETRY_BASE_DELAY - 5))
+
+        # Not due yet, so the worker leaves it alone
+        self.assertEqual(OutboxService.process_batch()['sent'], 0)
+
+        self.make_due()
+        self.assertEqual(OutboxService.process_batch()['sent'], 1)
+        self.assertEqual(len(self.mail_server.messages), 1)
+
+    def test_repeated_failures_are_dead_lettered_and_can_be_requeued(self):
+        send_email('Welcome', ['member@example.com'], '<p>Hi</p>')
+        self.mail_server.fail_next(OUTBOX_MAX_ATTEMPTS)
+
+        for _ in range(OUTBOX_MAX_ATTEMPTS):
+            self.make_due()
+            stats = OutboxService.process_batch()
+
+        self.assertEqual(stats['dead'], 1)
+        self.assertEqual(OutboxService.get_counts()['dead'], 1)
+
+        self.assertEqual(OutboxService.requeue_dead(), 1)
+        self.assertEqual(OutboxService.process_batch()['sent'], 1)
+
+    def test_claimed_messages_are_not_claimed_twice(self):
+        for index in range(3):
+            send_email(f'Email {index}', ['member@example.com'], '<p>Hi</p>')
+
+        first = OutboxService.claim_batch(2)
+        second = OutboxService.claim_batch(2)
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        self.assertFalse({e.id for e in first} & {e.id for e in second})
+
+    def test_prune_deletes_old_sent_and_dead_emails_in_chunks(self):
+        now = datetime.utcnow()
+        for index in range(5):
+            send_email(f'Email {index}', ['member@example.com'], '<p>Hi</p>')
+        entries = EmailOutbox.query.order_by(EmailOutbox.id).all()
+        for entry in entries[:3]:
+            entry.status, entry.sent_at = 'sent', now - timedelta(days=10)
+        entries[3].status, entries[3].created_at = 'dead', now - timedelta(days=40)
+        # Pending emails are kept however old they are
+        entries[4].created_at = now - timedelta(days=40)
+        db.session.commit()
+
+        self.assertEqual(OutboxService.prune(7, 30, chunk_size=2), {'sent': 3, 'dead': 1, 'bodies': 0})
+        self.assertEqual(EmailOutbox.query.one().status, 'pending')
+        self.assertEqual(OutboxService.prune(7, 30), {'sent': 0, 'dead': 0, 'bodies': 0})
+
+    def test_mailing_stores_its_body_once(self):
+        OutboxService.enqueue_many('News', [f'member{i}@example.com' for i in range(4)], '<p>News</p>', 'News')
+        OutboxService.enqueue_many('News', ['late@example.com'], '<p>News</p>', 'News')
+        send_email('Welcome', ['member@example.com'], '<p>Hi</p>')
+
+        self.assertEqual(EmailOutbox.query.count(), 6)
+        self.assertEqual(EmailBody.query.count(), 2)
+
+        self.assertEqual(OutboxService.process_batch()['sent'], 6)
+        self.assertIn('<p>News</p>', self.mail_server.messages[0]['data'])
+        self.assertEqual(OutboxService.prune(0, 0, now=datetime.utcnow() + timedelta(seconds=1)),
+                         {'sent': 6, 'dead': 0, 'bodies': 2})
+
+    def test_prune_command_keeps_recent_emails(self):
+        send_email('Welcome', ['member@example.com'], '<p>Hi</p>')
+        OutboxService.process_batch()
+
+        result = app.test_cli_runner().invoke(args=['email-outbox-prune'])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Deleted 0 sent and 0 dead-lettered emails.', result.output)
+        self.assertEqual(EmailOutbox.query.count(), 1)
+
+    def test_worker_command_drains_outbox(self):
+        send_email('Welcome', ['member@example.com'], '<p>Hi</p>')
+
+        result = app.test_cli_runner().invoke(args=['email-worker', '--once'])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Sent 1', result.output)
+        self.assertEqual(len(self.mail_server.messages), 1)
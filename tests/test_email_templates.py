@@ -0,0 +1,55 @@
+from datetime import date
+from unittest import mock
+
+from flask import render_template_string
+
+from app import app
+from models import db, EmailOutbox, Event
+from services.user_service import Recipient
+from tests.base import DatabaseTestCase
+from tests.smtp_stub import stub_mail_server
+from utils.email_utils import (
+    EVENT_REMINDER_TEMPLATE,
+    get_email_template,
+    render_email_template,
+    send_event_reminder_email,
+)
+
+
+class EmailTemplateRegistryTestCase(DatabaseTestCase):
+    def create_event(self):
+        organizer = self.create_user('Organizer')
+        event = Event(title='Journal Club', event_date=date(2026, 5, 1), presenter='Dr. Example',
+                      created_by=organizer.id)
+        db.session.add(event)
+        db.session.commit()
+        return event
+
+    def test_template_is_compiled_once_per_name_and_source(self):
+        first = get_email_template('greeting', '<p>Hello {{ name }}</p>')
+
+        self.assertIs(get_email_template('greeting', '<p>Hello {{ name }}</p>'), first)
+        self.assertIsNot(get_email_template('greeting', '<p>Hi {{ name }}</p>'), first)
+
+    def test_rendering_matches_render_template_string(self):
+        event = self.create_event()
+        context = dict(user=Recipient(1, 'member@example.com', 'Member'), event=event,
+                       event_date_str='May 01, 2026', event_time_str='TBD')
+
+        with app.test_request_context():
+            expected = render_template_string(EVENT_REMINDER_TEMPLATE, **context)
+
+        self.assertEqual(render_email_template('event_reminder', EVENT_REMINDER_TEMPLATE, **context), expected)
+
+    def test_senders_reuse_compiled_template_outside_requests(self):
+        with stub_mail_server():
+            event = self.create_event()
+            members = [Recipient(i, f'member{i}@example.com', f'Member {i}') for i in range(3)]
+            send_event_reminder_email(members[0], event)
+
+            with mock.patch.object(app.jinja_env, 'from_string', wraps=app.jinja_env.from_string) as compile_template:
+                for member in members[1:]:
+                    send_event_reminder_email(member, event)
+
+        self.assertEqual(compile_template.call_count, 0)
+        self.assertEqual(EmailOutbox.query.count(), 3)
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+
+from models import db, Comment, Like, Post
+from services import ForumService
+from tests.base import DatabaseTestCase
+
+
+class ForumFeedTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.author = self.create_user('Author')
+        self.reader = self.create_user('Reader')
+        self.author_id = self.author.id
+        self.start = datetime(2026, 1, 1, 12, 0)
+
+    def add_posts(self, count, likes=0, comments=0):
+        members = [self.create_user(f'Member {len(Post.query.all())}-{i}') for i in range(max(likes, comments))]
+        posts = []
+        for i in range(count):
+            post = Post(user_id=self.author_id, title=f'Post {i}', content='Body ' * 60,
+                        created_at=self.start + timedelta(minutes=len(Post.query.all())))
+            db.session.add(post)
+            db.session.flush()
+            for member in members[:likes]:
+                db.session.add(Like(user_id=member.id, post_id=post.id))
+            for member in members[:comments]:
+                db.session.add(Comment(post_id=post.id, user_id=member.id, content='Nice'))
+            posts.append(post)
+        db.session.commit()
+        ForumService.reconcile_post_counts()
+        return posts
+
+    def test_cursor_walks_every_post_once(self):
+        posts = self.add_posts(5)
+        # Same timestamp for two posts: the id breaks the tie
+        posts[3].created_at = posts[4].created_at
+        db.session.commit()
+
+        seen, cursor = [], None
+        for _ in range(3):
+            entries, cursor = ForumService.get_feed_page(limit=2, cursor=cursor)
+            seen.extend(entry['post'].id for entry in entries)
+
+        self.assertIsNone(cursor)
+        self.assertEqual(seen, [posts[i].id for i in (4, 3, 2, 1, 0)])
+
+    def test_counts_and_viewer_like_come_with_the_page(self):
+        post, = self.add_posts(1, likes=3, comments=2)
+        ForumService.toggle_like(self.reader.id, post.id)
+
+        entry, = ForumService.get_feed_page(viewer_id=self.reader.id)[0]
+        anonymous, = ForumService.get_feed_page()[0]
+
+        self.assertEqual((entry['likes'], entry['comments'], entry['liked']), (4, 2, True))
+        self.assertFalse(anonymous['liked'])
+
+    def feed_queries(self, **headers):
+        self.login(self.reader)
+        # Start cold, as a real request would, rather than from this session's identity map
+        db.session.expunge_all()
+        with self.count_queries() as statements:
+            response = self.client.get('/forum/?limit=1', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        return statements
+
+    def test_feed_query_count_does_not_grow_with_posts(self):
+        self.add_posts(2, likes=2, comments=2)
+        small_html = len(self.feed_queries())
+        small_json = len(self.feed_queries(Accept='application/json'))
+        self.add_posts(30, likes=4, comments=3)
+
+        self.assertEqual(len(self.feed_queries()), small_html)
+        self.assertEqual(len(self.feed_queries(Accept='application/json')), small_json)
+        first_page = self.client.get('/forum/').data
+        self.assertIn(b'Older discussions', first_page)
+        self.assertIn(b'32 discussions', first_page)
+
+    def test_header_count_follows_search(self):
+        self.add_posts(3)
+
+        self.assertIn(b'3 discussions', self.client.get('/forum/?limit=2').data)
+        self.assertIn(b'1 discussion<', self.client.get('/forum/?search=Post+1').data)
+        self.assertNotIn(b'discussions</p>', self.client.get('/forum/?search=Post&page=2&limit=2').data)
+
+    def test_json_feed_is_paginated(self):
+        self.add_posts(3, likes=1, comments=1)
+
+        first = self.client.get('/forum/?limit=2', headers={'Accept': 'application/json'}).get_json()
+        second = self.client.get(f"/forum/?limit=2&cursor={first['next_cursor']}",
+                                 headers={'Accept': 'application/json'}).get_json()
+
+        self.assertEqual([post['title'] for post in first['posts']], ['Post 2', 'Post 1'])
+        self.assertEqual([post['title'] for post in second['posts']], ['Post 0'])
+        self.assertIsNone(second['next_cursor'])
+        self.assertEqual((first['posts'][0]['likes'], first['posts'][0]['comments']), (1, 1))
+        self.assertEqual(first['posts'][0]['author'], 'Author')
@@ -0,0 +1,128 @@
+from app import app
+from models import db, Comment, Post
+from services import ForumService
+from tests.base import DatabaseTestCase
+from utils.search_index import COMMENT_INDEX, FORUM_INDEX, highlight
+
+
+class ForumSearchTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.author = self.create_user('Author')
+        self.posts = {}
+        for key, title, content in [
+            ('title', 'Warfarin dosing', 'General discussion of anticoagulants.'),
+            ('body', 'Clinic notes', 'Patients on warfarin need regular INR checks.'),
+            ('comment', 'Exam tips', 'How do you revise for the final exam?'),
+            ('other', 'Internship offers', 'Hospital pharmacy placements for summer.'),
+        ]:
+            post = Post(user_id=self.author.id, title=title, content=content)
+            db.session.add(post)
+            self.posts[key] = post
+        db.session.commit()
+        ForumService.add_comment(self.posts['comment'].id, self.author.id, 'Practise warfarin interaction cases.')
+
+    def titles(self, search, **kwargs):
+        entries, _ = ForumService.search_posts(search, **kwargs)
+        return [entry['post'].title for entry in entries]
+
+    def test_title_matches_outrank_body_and_comment_matches(self):
+        self.assertEqual(self.titles('warfarin'), ['Warfarin dosing', 'Clinic notes', 'Exam tips'])
+
+    def test_words_match_by_prefix_and_stem(self):
+        self.assertEqual(self.titles('intern'), ['Internship offers'])
+        self.assertEqual(self.titles('placement hospital'), ['Internship offers'])
+
+    def test_words_may_match_in_different_comments_and_fields(self):
+        ForumService.add_comment(self.posts['comment'].id, self.author.id, 'Bring a calculator.')
+
+        self.assertEqual(self.titles('calculator warfarin'), ['Exam tips'])
+        self.assertEqual(self.titles('calculator revise'), ['Exam tips'])
+        self.assertEqual(self.titles('calculator dosing'), [])
+
+    def test_adding_a_comment_indexes_only_that_comment(self):
+        with self.count_queries() as statements:
+            ForumService.add_comment(self.posts['comment'].id, self.author.id, 'Another tip.')
+
+        indexing = [s for s in statements if COMMENT_INDEX.table in s or FORUM_INDEX.table in s]
+        self.assertEqual(len(indexing), 2)
+        self.assertTrue(all(f'{COMMENT_INDEX.table} ' in s and 'id IN (?)' in s for s in indexing))
+
+    def test_index_follows_edits_and_deletes(self):
+        self.posts['other'].content = 'Now about warfarin too.'
+        comment = Comment.query.one()
+        ForumService.delete_comment(comment)
+        db.session.delete(self.posts['title'])
+        db.session.commit()
+
+        self.assertEqual(sorted(self.titles('warfarin')), ['Clinic notes', 'Internship offers'])
+
+    def test_results_are_paginated(self):
+        first, next_page = ForumService.search_posts('warfarin', per_page=2)
+        second, last_page = ForumService.search_posts('warfarin', page=next_page, per_page=2)
+
+        self.assertEqual((len(first), next_page, len(second), last_page), (2, 2, 1, None))
+
+    def test_snippet_marks_matches_and_escapes_html(self):
+        snippet = highlight('Use <b>warfarin</b> with care; ' + 'filler ' * 60 + 'warfarins end', 'warfarin', size=60)
+
+        self.assertTrue(snippet.startswith('Use &lt;b&gt;<mark>warfarin</mark>&lt;/b&gt;'))
+        self.assertTrue(snippet.endswith('…'))
+
+    def test_snippet_shows_why_each_post_matched(self):
+        ForumService.add_comment(self.posts['comment'].id, self.author.id, 'Revise early.')
+        entries, _ = ForumService.search_posts('warfarin')
+        snippets = {entry['post'].title: str(entry['snippet']) for entry in entries}
+
+        self.assertEqual(snippets['Warfarin dosing'], '<mark>Warfarin</mark> dosing')
+        self.assertIn('on <mark>warfarin</mark> need', snippets['Clinic notes'])
+        self.assertEqual(snippets['Exam tips'], 'Practise <mark>warfarin</mark> interaction cases.')
+
+    def test_snippet_marks_stemmed_variants(self):
+        self.posts['other'].content = 'Tips for studying pharmacology.'
+        ForumService.add_comment(self.posts['title'].id, self.author.id, 'Running these studies now.')
+
+        entries, _ = ForumService.search_posts('studies')
+        snippets = {entry['post'].title: str(entry['snippet']) for entry in entries}
+
+        self.assertEqual(snippets['Internship offers'], 'Tips for <mark>studying</mark> pharmacology.')
+        self.assertEqual(snippets['Warfarin dosing'], 'Running these <mark>studies</mark> now.')
+        self.assertIn('<mark>Running</mark>', str(highlight('Running late', 'runs')))
+
+    def test_forum_page_and_json_use_the_index(self):
+        with self.count_queries() as statements:
+            response = self.client.get('/forum/?search=warfarin')
+        data = self.client.get('/forum/?search=warfarin&limit=1', headers={'Accept': 'application/json'}).get_json()
+
+        self.assertIn(b'<mark>warfarin</mark>', response.data)
+        self.assertTrue(any(FORUM_INDEX.table in statement for statement in statements))
+        self.assertEqual(data['posts'][0]['title'], 'Warfarin dosing')
+        self.assertEqual(data['next_page'], 2)
+
+    def test_admin_post_search_uses_the_index(self):
+        admin = self.create_user('Admin')
+        admin.is_admin = True
+        db.session.commit()
+        self.login(admin)
+
+        with self.count_queries() as statements:
+            response = self.client.get('/admin/posts?search=regular')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Clinic notes', response.data)
+        self.assertNotIn(b'Internship offers', response.data)
+        self.assertTrue(any(FORUM_INDEX.table in statement for statement in statements))
+
+    def test_reindex_command(self):
+        for index in (FORUM_INDEX, COMMENT_INDEX):
+            db.session.execute(db.text(f'DELETE FROM {index.table}'))
+        db.session.commit()
+        self.assertEqual(self.titles('warfarin'), [])
+
+        result = app.test_cli_runner().invoke(
+            args=['rebuild-search-index', '--index', 'forum_search', '--index', 'comment_search']
+        )
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Rebuilt 2 search indexes.', result.output)
+        self.assertEqual(len(self.titles('warfarin')), 3)
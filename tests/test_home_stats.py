@@ -0,0 +1,89 @@
+import os
+import tempfile
+from datetime import date
+
+from app import app
+from models import db, Event, Research, Researcher, University
+from tests.base import DatabaseTestCase
+from utils.stats_cache import LocalStatsCache, SQLiteStatsCache, get_home_stats
+
+
+class HomeStatsCacheTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.member = self.create_user('Member')
+        db.session.add(University(name='University of Khartoum'))
+        author = Researcher(name='Dr. Example')
+        for title, is_approved in [('Approved', True), ('Pending', False)]:
+            db.session.add(Research(title=title, department='Pharmaceutics & Drug Delivery', year=2024,
+                                    is_approved=is_approved, author=author))
+        db.session.commit()
+
+    def test_cached_stats_skip_the_database(self):
+        self.assertEqual(get_home_stats(), {'active_members_count': 1, 'research_pubs_count': 1,
+                                            'events_hosted_count': 0, 'partner_unis_count': 1})
+
+        with self.count_queries() as statements:
+            response = self.client.get('/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(statements), 1)
+        self.assertIn('post', statements[0])
+
+    def test_inserts_and_deletes_invalidate_after_commit(self):
+        get_home_stats()
+        event = Event(title='Journal Club', event_date=date(2026, 5, 1), created_by=self.member.id)
+        db.session.add(event)
+        db.session.flush()
+        self.assertEqual(get_home_stats()['events_hosted_count'], 0)
+
+        db.session.commit()
+        self.assertEqual(get_home_stats()['events_hosted_count'], 1)
+
+        db.session.delete(event)
+        db.session.commit()
+        self.assertEqual(get_home_stats()['events_hosted_count'], 0)
+
+    def test_counted_column_updates_invalidate(self):
+        get_home_stats()
+        Research.query.filter_by(title='Pending').one().is_approved = True
+        db.session.commit()
+
+        self.assertEqual(get_home_stats()['research_pubs_count'], 2)
+
+        get_home_stats()
+        self.member.profile.full_name = 'Renamed'
+        db.session.commit()
+        with self.count_queries() as statements:
+            get_home_stats()
+        self.assertEqual(statements, [])
+
+
+class StatsCacheBackendTestCase(DatabaseTestCase):
+    def test_local_entries_expire_after_ttl(self):
+        cache = LocalStatsCache(ttl=60)
+        now = [0.0]
+        cache._cache.timer = lambda: now[0]
+        cache.set('home_stats', {'events_hosted_count': 1})
+
+        now[0] = 59
+        self.assertEqual(cache.get('home_stats'), {'events_hosted_count': 1})
+        now[0] = 60
+        self.assertIsNone(cache.get('home_stats'))
+
+    def test_sqlite_backend_shares_invalidation_between_workers(self):
+        path = os.path.join(tempfile.mkdtemp(), 'stats_cache.db')
+        first, second = SQLiteStatsCache(path, ttl=60), SQLiteStatsCache(path, ttl=60)
+
+        first.set('home_stats', {'events_hosted_count': 3})
+        self.assertEqual(second.get('home_stats'), {'events_hosted_count': 3})
+
+        second.delete('home_stats')
+        self.assertIsNone(first.get('home_stats'))
+
+    def test_shared_backend_is_selected_by_url(self):
+        app.config['STATS_CACHE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'stats.db')
+        self.addCleanup(app.config.__setitem__, 'STATS_CACHE_URL', '')
+        from utils.stats_cache import create_stats_cache
+
+        self.assertIsInstance(create_stats_cache(app), SQLiteStatsCache)
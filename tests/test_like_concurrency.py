@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import threading
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+
+from app import app
+from models import db, Like, Post
+from services import ForumService
+from tests.base import DatabaseTestCase
+
+
+class ConcurrentLikeTestCase(DatabaseTestCase):
+    """Toggles from many threads, each with its own connection to a file database."""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'likes.db')}", connect_args={'timeout': 30})
+        self.addCleanup(engine.dispose)
+        engines = patch.dict(db._app_engines[app], {None: engine})
+        engines.start()
+        self.addCleanup(engines.stop)
+        super().setUp()
+
+        self.author = self.create_user('Author')
+        self.members = [self.create_user(f'Member {i}') for i in range(6)]
+        self.post = Post(user_id=self.author.id, title='Hot take', content='Body')
+        db.session.add(self.post)
+        db.session.commit()
+
+    def run_threads(self, jobs):
+        errors = []
+        barrier = threading.Barrier(len(jobs))
+
+        def worker(user_id, times):
+            with app.app_context():
+                try:
+                    barrier.wait()
+                    for _ in range(times):
+                        ForumService.toggle_like(user_id, self.post.id)
+                except Exception as error:
+                    errors.append(error)
+                finally:
+                    db.session.remove()
+
+        threads = [threading.Thread(target=worker, args=job) for job in jobs]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return errors
+
+    def stored_and_actual(self):
+        db.session.expire_all()
+        return db.session.get(Post, self.post.id).like_count, Like.query.filter_by(post_id=self.post.id).count()
+
+    def test_double_clicks_never_fail_and_counter_matches_rows(self):
+        # Two threads per member toggling the same like at once
+        jobs = [(member.id, 15) for member in self.members for _ in range(2)]
+
+        errors = self.run_threads(jobs)
+
+        self.assertEqual(errors, [])
+        stored, actual = self.stored_and_actual()
+        self.assertEqual(stored, actual)
+
+    def test_distinct_users_each_end_liked(self):
+        errors = self.run_threads([(member.id, 7) for member in self.members])
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self.stored_and_actual(), (len(self.members), len(self.members)))
+
+    def test_missing_post_is_not_liked(self):
+        # Enforce like.post_id as PostgreSQL does
+        db.session.execute(db.text('PRAGMA foreign_keys = ON'))
+        member_id, missing_id = self.members[0].id, self.post.id + 1
+
+        self.assertIsNone(ForumService.toggle_like(member_id, missing_id))
+        self.login(self.members[0])
+        self.assertEqual(self.client.post(f'/forum/post/{missing_id}/like').status_code, 404)
+        self.assertEqual(Like.query.count(), 0)
+        self.assertEqual(ForumService.toggle_like(member_id, self.post.id), (True, 1))
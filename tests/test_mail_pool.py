@@ -0,0 +1,84 @@
+from app import app
+from models import EmailOutbox, Announcement
+from services import OutboxService
+from tests.base import DatabaseTestCase
+from tests.smtp_stub import stub_mail_server
+from utils.email_utils import build_message, deliver_emails, send_announcement_email
+
+
+class PooledDeliveryTestCase(DatabaseTestCase):
+    def start_mail_server(self, **options):
+        mail_server = stub_mail_server(**options)
+        server = mail_server.__enter__()
+        self.addCleanup(mail_server.__exit__, None, None, None)
+        return server
+
+    def messages(self, count):
+        return [build_message(f'Email {i}', [f'member{i}@example.com'], '<p>Hi</p>') for i in range(count)]
+
+    def test_messages_share_one_connection(self):
+        server = self.start_mail_server()
+
+        outcomes = deliver_emails(self.messages(5))
+
+        self.assertEqual(outcomes, [(True, None)] * 5)
+        self.assertEqual(server.connections, 1)
+        self.assertEqual([m['rcpt_tos'] for m in server.messages],
+                         [[f'member{i}@example.com'] for i in range(5)])
+
+    def test_connection_is_reopened_after_cap(self):
+        server = self.start_mail_server()
+
+        outcomes = deliver_emails(self.messages(5), max_per_connection=2)
+
+        self.assertTrue(all(success for success, _ in outcomes))
+        self.assertEqual(server.connections, 3)
+
+    def test_dropped_connection_is_reopened_and_message_retried(self):
+        server = self.start_mail_server(disconnect_after=2)
+
+        outcomes = deliver_emails(self.messages(5))
+
+        self.assertTrue(all(success for success, _ in outcomes))
+        self.assertEqual(len(server.messages), 5)
+        self.assertEqual(server.connections, 3)
+
+    def test_outcomes_are_reported_per_message(self):
+        server = self.start_mail_server()
+        server.fail_next(1)
+
+        outcomes = deliver_emails(self.messages(3))
+
+        self.assertFalse(outcomes[0][0])
+        self.assertIn('451', outcomes[0][1])
+        self.assertEqual(outcomes[1:], [(True, None)] * 2)
+        self.assertEqual(server.connections, 1)
+
+    def test_announcement_is_sent_per_recipient_over_pooled_worker(self):
+        server = self.start_mail_server()
+        recipients = [self.create_user(f'Member {i}') for i in range(4)]
+        announcement = Announcement(subject='News', body='Hello all')
+
+        with app.test_request_context():
+            success_count, failure_count, error = send_announcement_email(announcement, recipients)
+
+        self.assertEqual((success_count, failure_count, error), (4, 0, None))
+        self.assertEqual(EmailOutbox.query.count(), 4)
+        self.assertEqual(OutboxService.process_batch()['sent'], 4)
+        self.assertEqual(server.connections, 1)
+        self.assertEqual(sorted(m['rcpt_tos'][0] for m in server.messages),
+                         sorted(user.email for user in recipients))
+
+    def test_inline_bulk_send_without_outbox(self):
+        server = self.start_mail_server()
+        app.config['MAIL_USE_OUTBOX'] = False
+        self.addCleanup(app.config.__setitem__, 'MAIL_USE_OUTBOX', True)
+        recipients = [self.create_user(f'Member {i}') for i in range(3)]
+        announcement = Announcement(subject='News', body='Hello all')
+
+        with app.test_request_context():
+            result = send_announcement_email(announcement, recipients)
+
+        self.assertEqual(result, (3, 0, None))
+        self.assertEqual(EmailOutbox.query.count(), 0)
+        self.assertEqual(server.connections, 1)
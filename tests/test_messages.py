@@ -0,0 +1,266 @@
+from datetime import datetime, timedelta
+
+from app import socketio, typing_users
+from models import db, Message, ConversationParticipant, Profile, User
+from services import MessageService
+from tests.base import DatabaseTestCase
+from utils.constants import HISTORY_PAGE_SIZE
+
+
+class InboxTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.owner = self.create_user('Inbox Owner')
+
+    def add_partners(self, count):
+        partners = []
+        for index in range(count):
+            partner = self.create_user(f'Partner {index} of {count}')
+            MessageService.send_message(self.owner.id, partner.id, 'Hello')
+            MessageService.send_message(partner.id, self.owner.id, 'Hi back')
+            partners.append(partner)
+        return partners
+
+    def test_inbox_returns_latest_message_and_unread_count(self):
+        alice, bob = self.create_user('Alice'), self.create_user('Bob')
+        MessageService.send_message(alice.id, self.owner.id, 'First')
+        MessageService.send_message(alice.id, self.owner.id, 'Second')
+        MessageService.send_message(self.owner.id, bob.id, 'To Bob')
+
+        conversations = MessageService.get_conversations(self.owner.id)
+
+        self.assertEqual([c['user'].id for c in conversations], [bob.id, alice.id])
+        self.assertEqual(conversations[0]['latest_message'].content, 'To Bob')
+        self.assertEqual(conversations[0]['unread_count'], 0)
+        self.assertEqual(conversations[1]['latest_message'].content, 'Second')
+        self.assertEqual(conversations[1]['unread_count'], 2)
+
+    def test_inbox_query_count_is_constant(self):
+        owner_id = self.owner.id
+        self.add_partners(3)
+        db.session.expire_all()
+        with self.count_queries() as small_inbox:
+            conversations = MessageService.get_conversations(owner_id)
+            [c['user'].name for c in conversations]
+
+        self.add_partners(12)
+        db.session.expire_all()
+        with self.count_queries() as large_inbox:
+            conversations = MessageService.get_conversations(owner_id)
+            [c['user'].name for c in conversations]
+
+        self.assertEqual(len(conversations), 15)
+        self.assertEqual(len(small_inbox), 1)
+        self.assertEqual(len(large_inbox), len(small_inbox))
+
+    def test_inbox_keyset_pagination(self):
+        partners = self.add_partners(5)
+        # Give every conversation a distinct, known latest timestamp
+        base = datetime(2026, 1, 1)
+        for offset, partner in enumerate(partners):
+            Message.query.filter_by(sender_id=partner.id).update({'created_at': base + timedelta(minutes=offset)})
+        db.session.commit()
+
+        first_page, cursor = MessageService.get_inbox_page(self.owner.id, limit=2)
+        second_page, cursor = MessageService.get_inbox_page(self.owner.id, limit=2, cursor=cursor)
+        third_page, cursor = MessageService.get_inbox_page(self.owner.id, limit=2, cursor=cursor)
+
+        seen = [c['user'].id for c in first_page + second_page + third_page]
+        self.assertEqual(seen, [p.id for p in reversed(partners)])
+        self.assertIsNone(cursor)
+
+
+class UnreadCounterTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.alice = self.create_user('Alice')
+        self.bob = self.create_user('Bob')
+
+    def participant(self, user):
+        conversation_id = MessageService.get_conversation_id(self.alice.id, self.bob.id)
+        return ConversationParticipant.query.get((conversation_id, user.id))
+
+    def test_counters_follow_send_read_and_delete(self):
+        MessageService.send_message(self.alice.id, self.bob.id, 'One')
+        second = MessageService.send_message(self.alice.id, self.bob.id, 'Two')
+
+        self.assertEqual(self.participant(self.bob).unread_count, 2)
+        self.assertEqual(self.participant(self.alice).unread_count, 0)
+        self.assertEqual(self.participant(self.alice).last_message_id, second.id)
+        self.assertEqual(MessageService.get_unread_total(self.bob.id), 2)
+
+        MessageService.delete_message(second.id, self.alice.id)
+        db.session.expire_all()
+        self.assertEqual(self.participant(self.bob).unread_count, 1)
+        self.assertEqual(self.participant(self.bob).last_message.content, 'One')
+
+        MessageService.mark_messages_as_read(self.bob.id, self.alice.id)
+        db.session.expire_all()
+        self.assertEqual(MessageService.get_unread_total(self.bob.id), 0)
+
+    def test_rebuild_counters_repairs_drift(self):
+        MessageService.send_message(self.alice.id, self.bob.id, 'One')
+        latest = MessageService.send_message(self.bob.id, self.alice.id, 'Two')
+        ConversationParticipant.query.update({'unread_count': 7, 'last_message_id': None})
+        db.session.commit()
+
+        self.assertEqual(MessageService.rebuild_counters(), 2)
+        db.session.expire_all()
+
+        self.assertEqual(self.participant(self.alice).unread_count, 1)
+        self.assertEqual(self.participant(self.bob).unread_count, 1)
+        self.assertEqual(self.participant(self.bob).last_message_id, latest.id)
+
+
+class MarkReadTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.alice = self.create_user('Alice')
+        self.bob = self.create_user('Bob')
+        self.sent = [MessageService.send_message(self.alice.id, self.bob.id, f'Message {i}') for i in range(4)]
+
+    def test_mark_read_up_to_watermark(self):
+        watermark = self.sent[1].id
+
+        result = MessageService.mark_read_up_to(self.bob.id, self.alice.id, watermark)
+
+        self.assertEqual(result['count'], 2)
+        self.assertEqual(result['up_to_id'], watermark)
+        db.session.expire_all()
+        self.assertEqual([m.is_read for m in Message.query.order_by(Message.id)], [True, True, False, False])
+        self.assertEqual(MessageService.get_unread_total(self.bob.id), 2)
+
+    def test_mark_read_without_watermark_uses_single_update(self):
+        bob_id, alice_id = self.bob.id, self.alice.id
+        with self.count_queries() as statements:
+            result = MessageService.mark_read_up_to(bob_id, alice_id)
+
+        self.assertEqual(result['count'], 4)
+        self.assertEqual(result['up_to_id'], self.sent[-1].id)
+        updates = [s for s in statements if s.lstrip().upper().startswith('UPDATE MESSAGE')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(MessageService.get_unread_total(bob_id), 0)
+        self.assertEqual(MessageService.mark_messages_as_read(bob_id, alice_id), 0)
+
+    def test_mark_read_event_carries_watermark(self):
+        sender = socketio.test_client(self.app_context.app)
+        reader = socketio.test_client(self.app_context.app)
+        sender.emit('join', {'user_id': self.alice.id})
+        sender.get_received()
+
+        reader.emit('mark_read', {'user_id': self.bob.id, 'other_user_id': self.alice.id,
+                                  'up_to_id': self.sent[2].id})
+
+        events = [e for e in sender.get_received() if e['name'] == 'messages_read']
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]['args'][0]['up_to_id'], self.sent[2].id)
+        self.assertEqual(events[0]['args'][0]['reader_id'], self.bob.id)
+
+    def test_mark_read_event_validates_watermark(self):
+        sender = socketio.test_client(self.app_context.app)
+        reader = socketio.test_client(self.app_context.app)
+        sender.emit('join', {'user_id': self.alice.id})
+        sender.get_received()
+
+        def mark_read(up_to_id):
+            reader.emit('mark_read', {'user_id': self.bob.id, 'other_user_id': self.alice.id, 'up_to_id': up_to_id})
+            return [e['args'][0]['up_to_id'] for e in sender.get_received() if e['name'] == 'messages_read']
+
+        self.assertEqual(mark_read(str(self.sent[0].id)), [self.sent[0].id])
+        # Malformed or non-positive watermarks acknowledge the whole conversation
+        self.assertEqual(mark_read('latest'), [self.sent[-1].id])
+        latest = MessageService.send_message(self.alice.id, self.bob.id, 'Another').id
+        self.assertEqual(mark_read(-1), [latest])
+        self.assertEqual(MessageService.get_unread_total(self.bob.id), 0)
+
+
+class HistoryTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.alice = self.create_user('Alice')
+        self.bob = self.create_user('Bob')
+        base = datetime(2026, 1, 1)
+        self.sent = []
+        for index in range(7):
+            message = MessageService.send_message(self.alice.id, self.bob.id, f'Message {index}')
+            message.created_at = base + timedelta(hours=index)
+            self.sent.append(message.id)
+        db.session.commit()
+
+    def test_history_pages_walk_backwards(self):
+        pages = []
+        page, before_id = MessageService.get_history_page(self.bob.id, self.alice.id, limit=3)
+        pages.append([m.id for m in page])
+        while before_id:
+            page, before_id = MessageService.get_history_page(
+                self.bob.id, self.alice.id, before_id=before_id, limit=3
+            )
+            pages.append([m.id for m in page])
+
+        self.assertEqual(pages, [self.sent[4:], self.sent[1:4], self.sent[:1]])
+
+    def test_history_endpoint_returns_json_page(self):
+        self.login(self.bob)
+
+        response = self.client.get(f'/forum/messages/conversation/{self.alice.id}/history',
+                                   query_string={'before_id': self.sent[5], 'limit': 2})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual([m['id'] for m in data['messages']], self.sent[3:5])
+        self.assertEqual(data['next_before_id'], self.sent[3])
+
+    def test_conversation_page_renders_only_latest_page(self):
+        newer = [MessageService.send_message(self.alice.id, self.bob.id, 'Newer').id
+                 for _ in range(HISTORY_PAGE_SIZE)]
+        self.login(self.bob)
+
+        response = self.client.get(f'/forum/messages/conversation/{self.alice.id}')
+
+        body = response.get_data(as_text=True)
+        self.assertIn(f'data-message-id="{newer[0]}"', body)
+        self.assertNotIn(f'data-message-id="{self.sent[-1]}"', body)
+        self.assertIn(f'data-before-id="{newer[0]}"', body)
+
+
+class TypingStateTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.alice = self.create_user('Alice')
+        self.bob = self.create_user('Bob')
+        typing_users.clear()
+
+    def test_typing_events_do_not_query_the_database_per_keystroke(self):
+        receiver = socketio.test_client(self.app_context.app)
+        sender = socketio.test_client(self.app_context.app)
+        receiver.emit('join', {'user_id': self.bob.id})
+        receiver.get_received()
+        payload = {'sender_id': self.alice.id, 'receiver_id': self.bob.id}
+
+        sender.emit('typing_start', payload)
+        with self.count_queries() as statements:
+            for _ in range(5):
+                sender.emit('typing_start', payload)
+
+        self.assertEqual(statements, [])
+        self.assertEqual(len(typing_users), 1)
+        events = [e for e in receiver.get_received() if e['name'] == 'typing_started']
+        # Repeat starts are dropped while the sender is already shown typing
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]['args'][0]['user_name'], 'Alice')
+
+        sender.emit('typing_stop', payload)
+        self.assertEqual(len(typing_users), 0)
+        sender.emit('typing_start', payload)
+        self.assertEqual([e['name'] for e in receiver.get_received()], ['typing_stopped', 'typing_started'])
+
+    def test_missing_profile_name_is_not_cached(self):
+        newcomer = User(email='newcomer@example.com')
+        db.session.add(newcomer)
+        db.session.commit()
+        self.assertEqual(MessageService.get_display_name(newcomer.id), 'Unknown User')
+
+        newcomer.profile = Profile(full_name='New Member')
+        db.session.commit()
+
+        self.assertEqual(MessageService.get_display_name(newcomer.id), 'New Member')
@@ -0,0 +1,85 @@
+from datetime import date, timedelta
+
+from app import app
+from models import db, Event, NotificationCampaign, NotificationLog
+from tests.base import DatabaseTestCase
+from tests.smtp_stub import stub_mail_server
+from utils.notification_utils import NotificationLogWriter, send_event_reminder
+
+
+class Crash(BaseException):
+    """Stands in for the process dying mid-run; not caught as a send failure."""
+
+
+class NotificationCampaignTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.organizer = self.create_user('Organizer')
+        self.organizer.event_reminders_enabled = False
+        self.members = [self.create_user(f'Member {i}') for i in range(6)]
+        self.event = Event(title='Journal Club', event_date=date.today() + timedelta(days=1),
+                           created_by=self.organizer.id)
+        db.session.add(self.event)
+        db.session.commit()
+        self.sent = []
+
+    def send(self, user, event):
+        self.sent.append(user.email)
+
+    def crash_after(self, count):
+        def send(user, event):
+            if len(self.sent) == count:
+                raise Crash()
+            self.send(user, event)
+        return send
+
+    def campaign(self):
+        return NotificationCampaign.query.filter_by(notification_type='event_reminder',
+                                                    reference_id=self.event.id).one()
+
+    def test_completed_campaign_is_not_sent_again(self):
+        self.assertEqual(send_event_reminder(self.event, send_email_func=self.send), 6)
+        self.assertEqual(send_event_reminder(self.event, send_email_func=self.send), 0)
+
+        self.assertEqual(len(self.sent), 6)
+        campaign = self.campaign()
+        self.assertEqual((campaign.status, campaign.sent_count), ('completed', 6))
+
+    def test_interrupted_campaign_resumes_after_last_delivered_user(self):
+        with self.assertRaises(Crash):
+            with NotificationLogWriter(chunk_size=2) as log_writer:
+                send_event_reminder(self.event, send_email_func=self.crash_after(3), log_writer=log_writer)
+
+        campaign = self.campaign()
+        self.assertEqual(campaign.status, 'running')
+        self.assertEqual(campaign.last_user_id, self.members[2].id)
+        self.assertEqual(NotificationLog.query.filter_by(status='sent').count(), 3)
+
+        self.assertEqual(send_event_reminder(self.event, send_email_func=self.send), 3)
+
+        self.assertEqual(self.sent, [user.email for user in self.members])
+        self.assertEqual(self.campaign().status, 'completed')
+
+    def test_recipients_logged_past_the_cursor_are_skipped(self):
+        # A concurrent run can log later recipients before earlier ones finish
+        campaign = NotificationCampaign(notification_type='event_reminder', reference_id=self.event.id,
+                                        last_user_id=self.members[1].id)
+        db.session.add(campaign)
+        db.session.add(NotificationLog(user_id=self.members[4].id, notification_type='event_reminder',
+                                       reference_id=self.event.id, recipient_email=self.members[4].email,
+                                       subject='Reminder', status='sent'))
+        db.session.commit()
+
+        self.assertEqual(send_event_reminder(self.event, send_email_func=self.send), 3)
+
+        self.assertEqual(self.sent, [self.members[i].email for i in (2, 3, 5)])
+
+    def test_reminder_command_is_idempotent(self):
+        runner = app.test_cli_runner()
+        with stub_mail_server():
+            first = runner.invoke(args=['send-event-reminders'])
+            second = runner.invoke(args=['send-event-reminders'])
+
+        self.assertIn('Successfully sent 6 event reminders', first.output)
+        self.assertIn('Successfully sent 0 event reminders', second.output)
+        self.assertEqual(NotificationLog.query.count(), 6)
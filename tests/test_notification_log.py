@@ -0,0 +1,85 @@
+from app import app
+from models import db, NotificationLog, Research, Researcher
+from tests.base import DatabaseTestCase
+from tests.smtp_stub import stub_mail_server
+from utils.notification_utils import NotificationLogWriter, send_new_research_alert
+
+
+class NotificationLogWriterTestCase(DatabaseTestCase):
+    def create_research(self):
+        researcher = Researcher(name='Dr. Example')
+        research = Research(title='Drug delivery study', department='Pharmaceutics & Drug Delivery',
+                            year=2024, author=researcher)
+        db.session.add(research)
+        db.session.commit()
+        return research
+
+    def inserts(self, statements):
+        return [s for s in statements if s.lstrip().upper().startswith('INSERT INTO NOTIFICATION_LOG')]
+
+    def test_rows_are_written_in_chunks(self):
+        with self.count_queries() as statements:
+            with NotificationLogWriter(chunk_size=2) as log_writer:
+                for i in range(5):
+                    log_writer.add(None, 'announcement', f'member{i}@example.com', 'News')
+
+        self.assertEqual(log_writer.written, 5)
+        self.assertEqual(len(self.inserts(statements)), 3)
+        self.assertEqual(NotificationLog.query.count(), 5)
+        self.assertTrue(all(log.sent_at for log in NotificationLog.query))
+
+    def test_buffer_is_flushed_when_block_raises(self):
+        with self.assertRaises(RuntimeError):
+            with NotificationLogWriter(chunk_size=100) as log_writer:
+                log_writer.add(None, 'announcement', 'member@example.com', 'News')
+                raise RuntimeError('send loop crashed')
+
+        self.assertEqual(NotificationLog.query.count(), 1)
+
+    def test_failed_write_keeps_buffer_and_is_not_retried_on_exit(self):
+        with self.count_queries() as statements:
+            with self.assertRaises(Exception):
+                with NotificationLogWriter(chunk_size=2) as log_writer:
+                    log_writer.add(None, 'announcement', 'member@example.com', 'News')
+                    # subject is NOT NULL, so this chunk's insert fails
+                    log_writer.add(None, 'announcement', 'other@example.com', None)
+
+        self.assertEqual(len(self.inserts(statements)), 1)
+        self.assertEqual(len(log_writer._rows), 2)
+        self.assertEqual(log_writer.written, 0)
+        # The session was rolled back and is usable
+        self.assertEqual(NotificationLog.query.count(), 0)
+
+    def test_alert_logs_every_recipient_in_one_insert(self):
+        research = self.create_research()
+        users = [self.create_user(f'Member {i}') for i in range(6)]
+        failing = users[0].email
+
+        def send_email_func(user, research):
+            if user.email == failing:
+                raise RuntimeError('mailbox unavailable')
+
+        with self.count_queries() as statements:
+            count = send_new_research_alert(research, send_email_func=send_email_func)
+
+        self.assertEqual(count, 5)
+        self.assertEqual(len(self.inserts(statements)), 1)
+        logs = NotificationLog.query.filter_by(reference_id=research.id).all()
+        self.assertEqual(len(logs), 6)
+        failed = [log for log in logs if log.status == 'failed']
+        self.assertEqual([log.recipient_email for log in failed], [failing])
+        self.assertEqual(failed[0].error_message, 'mailbox unavailable')
+
+    def test_alert_command_reports_log_throughput(self):
+        research = self.create_research()
+        self.create_user('Member')
+
+        with stub_mail_server():
+            result = app.test_cli_runner().invoke(
+                args=['send-new-research-alerts', '--research-id', str(research.id)]
+            )
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Sent 1 alerts', result.output)
+        self.assertIn('Logged 1 notifications', result.output)
+        self.assertIn('rows/s', result.output)
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+
+from app import app
+from models import db, NotificationDailyStat, NotificationLog
+from tests.base import DatabaseTestCase
+from utils.notification_utils import get_notification_stats, prune_notification_logs
+
+
+class NotificationRetentionTestCase(DatabaseTestCase):
+    now = datetime(2026, 6, 30, 12, 0)
+
+    def add_logs(self, notification_type, status, sent_at, count=1):
+        for _ in range(count):
+            db.session.add(NotificationLog(notification_type=notification_type, status=status,
+                                           recipient_email='member@example.com', subject='Hello',
+                                           sent_at=sent_at))
+        db.session.commit()
+
+    def rollup(self):
+        return {(stat.day.isoformat(), stat.notification_type, stat.status): stat.count
+                for stat in NotificationDailyStat.query}
+
+    def test_old_rows_are_rolled_up_in_chunks_and_deleted(self):
+        self.add_logs('event_reminder', 'sent', datetime(2026, 3, 1, 9, 0), count=3)
+        self.add_logs('event_reminder', 'failed', datetime(2026, 3, 1, 23, 59))
+        self.add_logs('new_research', 'sent', datetime(2026, 3, 2, 8, 0), count=2)
+        self.add_logs('new_research', 'sent', datetime(2026, 6, 29, 8, 0))
+
+        result = prune_notification_logs(30, chunk_size=2, now=self.now)
+
+        self.assertEqual(result, {'deleted': 6, 'chunks': 3, 'days': 2})
+        self.assertEqual(NotificationLog.query.count(), 1)
+        self.assertEqual(self.rollup(), {
+            ('2026-03-01', 'event_reminder', 'sent'): 3,
+            ('2026-03-01', 'event_reminder', 'failed'): 1,
+            ('2026-03-02', 'new_research', 'sent'): 2,
+        })
+
+    def test_rerun_adds_to_existing_days_without_double_counting(self):
+        self.add_logs('event_reminder', 'sent', datetime(2026, 3, 1, 9, 0), count=2)
+        prune_notification_logs(30, now=self.now)
+        self.assertEqual(prune_notification_logs(30, now=self.now)['deleted'], 0)
+
+        self.add_logs('event_reminder', 'sent', datetime(2026, 3, 1, 18, 0))
+        prune_notification_logs(30, now=self.now)
+
+        self.assertEqual(self.rollup(), {('2026-03-01', 'event_reminder', 'sent'): 3})
+
+    def test_cutoff_keeps_the_whole_boundary_day(self):
+        self.add_logs('event_reminder', 'sent', datetime(2026, 5, 31, 0, 0))
+        self.add_logs('event_reminder', 'sent', datetime(2026, 5, 30, 23, 59))
+
+        prune_notification_logs(30, now=self.now)
+
+        self.assertEqual([log.sent_at for log in NotificationLog.query], [datetime(2026, 5, 31, 0, 0)])
+
+    def test_stats_combine_rollup_and_raw_rows_in_one_query(self):
+        now = datetime.utcnow()
+        self.add_logs('event_reminder', 'sent', now - timedelta(days=120), count=2)
+        self.add_logs('event_reminder', 'failed', now - timedelta(days=5))
+        self.add_logs('event_reminder', 'sent', now - timedelta(days=10))
+        self.add_logs('new_research', 'sent', now - timedelta(hours=1))
+        before = get_notification_stats(now)
+
+        # Retention shorter than the windows: rolled-up days still count
+        prune_notification_logs(7, now=now)
+        with self.count_queries() as statements:
+            after = get_notification_stats(now)
+
+        self.assertEqual(NotificationLog.query.count(), 2)
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(after, before)
+        self.assertEqual(after['by_type_status']['event_reminder'], {'sent': 3, 'failed': 1})
+
+    def test_prune_command_uses_configured_retention(self):
+        self.add_logs('event_reminder', 'sent', datetime.utcnow() - timedelta(days=200))
+        self.add_logs('event_reminder', 'sent', datetime.utcnow() - timedelta(days=10))
+
+        result = app.test_cli_runner().invoke(args=['prune-notification-logs'])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Rolled up and deleted 1 rows across 1 days', result.output)
+        self.assertEqual(NotificationLog.query.count(), 1)
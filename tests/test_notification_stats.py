@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+
+from app import app
+from models import db, NotificationLog
+from tests.base import DatabaseTestCase
+from utils.notification_utils import get_notification_stats
+
+
+class NotificationStatsTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        now = datetime.utcnow()
+        for notification_type, status, age in [
+            ('event_reminder', 'sent', timedelta(hours=1)),
+            ('event_reminder', 'sent', timedelta(days=3)),
+            ('event_reminder', 'failed', timedelta(days=3)),
+            ('new_research', 'sent', timedelta(days=20)),
+            ('new_research', 'sent', timedelta(days=90)),
+            ('research_status', 'failed', timedelta(hours=2)),
+        ]:
+            db.session.add(NotificationLog(notification_type=notification_type, status=status,
+                                           recipient_email='member@example.com', subject='Hello',
+                                           sent_at=now - age))
+        db.session.commit()
+
+    def test_all_breakdowns_come_from_one_query(self):
+        with self.count_queries() as statements:
+            stats = get_notification_stats()
+
+        self.assertEqual(len(statements), 1)
+        self.assertIn('GROUP BY', statements[0])
+        self.assertEqual((stats['last_24_hours'], stats['last_7_days'], stats['last_30_days']), (2, 4, 5))
+        self.assertEqual((stats['total'], stats['total_sent'], stats['total_failed']), (6, 4, 2))
+        self.assertEqual(stats['by_type'], {'event_reminder': 3, 'new_research': 2, 'research_status': 1})
+        self.assertEqual(stats['by_type_status']['event_reminder'], {'sent': 2, 'failed': 1})
+
+    def test_stats_command(self):
+        result = app.test_cli_runner().invoke(args=['notification-stats'])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Last 7 days: 4', result.output)
+        self.assertIn('Event Reminders: 3', result.output)
+        self.assertIn('Total: 6', result.output)
+        self.assertIn('Failed: 2', result.output)
+
+    def test_admin_json_endpoint(self):
+        member = self.create_user('Member')
+        self.login(member)
+        self.assertEqual(self.client.get('/admin/notifications/stats').status_code, 302)
+
+        member.is_admin = True
+        db.session.commit()
+        response = self.client.get('/admin/notifications/stats')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['by_status'], {'sent': 4, 'failed': 2})
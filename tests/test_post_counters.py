@@ -0,0 +1,84 @@
+from unittest.mock import patch
+
+from app import app
+from models import db, Comment, Like, Post
+from services import ForumService
+from tests.base import DatabaseTestCase
+from utils.query_helpers import insert_ignoring_conflict
+
+
+class PostCounterTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.author = self.create_user('Author')
+        self.member = self.create_user('Member')
+        self.post = Post(user_id=self.author.id, title='Dosage question', content='Body')
+        db.session.add(self.post)
+        db.session.commit()
+
+    def counts(self):
+        return db.session.query(Post.like_count, Post.comment_count).filter(Post.id == self.post.id).one()
+
+    def test_like_toggle_reads_counter_without_loading_likes(self):
+        self.login(self.member)
+
+        with self.count_queries() as statements:
+            liked = self.client.post(f'/forum/post/{self.post.id}/like').get_json()
+        unliked = self.client.post(f'/forum/post/{self.post.id}/like').get_json()
+
+        self.assertEqual(liked, {'likes': 1, 'liked': True})
+        self.assertEqual(unliked, {'likes': 0, 'liked': False})
+        self.assertFalse(any('FROM "like"' in s and 'post_id = ?' in s and 'user_id' not in s
+                             for s in statements))
+
+    def test_like_toggle_without_on_conflict_support(self):
+        # Databases without ON CONFLICT insert inside a savepoint instead
+        with patch.object(db.engine.dialect, 'name', 'mysql'):
+            liked = ForumService.toggle_like(self.member.id, self.post.id)
+            db.session.add(Like(user_id=self.author.id, post_id=self.post.id))
+            db.session.flush()
+            duplicate = insert_ignoring_conflict(
+                db.session, Like, {'user_id': self.author.id, 'post_id': self.post.id}, ['user_id', 'post_id']
+            )
+            db.session.commit()
+
+        self.assertEqual(liked, (True, 1))
+        self.assertIsNone(duplicate)
+        self.assertEqual(Like.query.count(), 2)
+
+    def test_comments_are_counted(self):
+        self.login(self.member)
+        with patch.dict(app.config, WTF_CSRF_ENABLED=False):
+            self.client.post(f'/forum/post/{self.post.id}/comment', data={'content': 'Ask a pharmacist'})
+        ForumService.add_comment(self.post.id, self.author.id, 'Thanks')
+
+        self.assertEqual(tuple(self.counts()), (0, 2))
+
+        comment = Comment.query.filter_by(user_id=self.member.id).one()
+        ForumService.delete_comment(comment)
+        self.assertEqual(tuple(self.counts()), (0, 1))
+
+    def test_deleted_users_leave_other_posts_counters(self):
+        ForumService.toggle_like(self.member.id, self.post.id)
+        ForumService.add_comment(self.post.id, self.member.id, 'First')
+        ForumService.add_comment(self.post.id, self.member.id, 'Second')
+        ForumService.toggle_like(self.author.id, self.post.id)
+
+        ForumService.release_user_activity(self.member.id)
+        db.session.delete(self.member)
+        db.session.commit()
+
+        self.assertEqual(tuple(self.counts()), (1, 0))
+
+    def test_reconcile_command_fixes_drift(self):
+        ForumService.toggle_like(self.member.id, self.post.id)
+        db.session.add(Like(user_id=self.author.id, post_id=self.post.id))
+        db.session.add(Comment(post_id=self.post.id, user_id=self.author.id, content='Untracked'))
+        db.session.commit()
+
+        result = app.test_cli_runner().invoke(args=['reconcile-post-counts'])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Corrected 1 posts.', result.output)
+        self.assertEqual(tuple(self.counts()), (2, 1))
+        self.assertEqual(ForumService.reconcile_post_counts(), 0)
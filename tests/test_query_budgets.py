@@ -0,0 +1,76 @@
+from models import db, Research, Researcher
+from services import ResearchService
+from tests.base import DatabaseTestCase
+
+
+DEPARTMENTS = [value for value, _ in ResearchService.DEPARTMENT_CHOICES if value != 'all']
+
+
+class ResearchPageQueryBudgetTestCase(DatabaseTestCase):
+    """Listing pages must render in a fixed number of statements, whatever their size."""
+
+    # Statements allowed per page render
+    BUDGETS = {
+        '/research': 7,
+        '/research?search=study': 7,
+        '/researchers': 4,
+        '/admin/researchers': 4,
+        '/admin/researches': 3,
+        '/admin/submissions': 3,
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.admin = self.create_user('Admin')
+        self.admin.is_admin = True
+        db.session.commit()
+
+    def add_researches(self, count):
+        submitter = self.create_user(f'Submitter {count}')
+        for i in range(count):
+            author = Researcher(name=f'Researcher {count}-{i}', bio='Pharmacist')
+            for approved in (True, False):
+                db.session.add(Research(title=f'Study {i} {approved}', department=DEPARTMENTS[i % 4],
+                                        year=2000 + i, author=author, is_approved=approved,
+                                        submitted_by=submitter.id))
+        db.session.commit()
+        ResearchService.rebuild_research_statistics()
+
+    def render_counts(self):
+        counts = {}
+        for url, budget in self.BUDGETS.items():
+            if url.startswith('/admin'):
+                self.login(self.admin)
+            else:
+                self.logout()
+            with self.assert_max_queries(budget) as statements:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            counts[url] = len(statements)
+        return counts
+
+    def test_pages_stay_within_budget_as_rows_grow(self):
+        self.add_researches(2)
+        small = self.render_counts()
+        self.add_researches(12)
+
+        self.assertEqual(self.render_counts(), small)
+
+    def test_listing_renders_authors_from_joined_query(self):
+        self.add_researches(3)
+
+        response = self.client.get('/research')
+
+        self.assertIn(b'Researcher 3-2', response.data)
+        self.assertIn(b'Study 2 True', response.data)
+        self.assertNotIn(b'Study 2 False', response.data)
+        self.assertIn(b'1 publication<', self.client.get('/researchers').data)
+
+    def test_dropdown_loads_only_id_and_name(self):
+        self.add_researches(1)
+
+        with self.count_queries() as statements:
+            ResearchService.get_researcher_choices()
+
+        self.assertNotIn('bio', statements[0])
+        self.assertNotIn('profile_picture_url', statements[0])
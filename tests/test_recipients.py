@@ -0,0 +1,85 @@
+import json
+
+from models import db, Announcement, EmailOutbox, Research, Researcher, User, UserRole
+from services import UserService
+from services.user_service import Recipient
+from tests.base import DatabaseTestCase
+from tests.smtp_stub import stub_mail_server
+from utils.notification_utils import send_new_research_alert
+
+
+class RecipientStreamTestCase(DatabaseTestCase):
+    def test_recipients_are_streamed_as_tuples_in_pages(self):
+        users = [self.create_user(f'Member {i}') for i in range(4)]
+        nameless = User(email='nameless@example.com')
+        db.session.add(nameless)
+        db.session.commit()
+
+        with self.count_queries() as statements:
+            recipients = list(UserService.iter_recipients(chunk_size=2))
+
+        self.assertEqual(len(statements), 3)
+        self.assertEqual(recipients[0], Recipient(users[0].id, users[0].email, 'Member 0'))
+        self.assertEqual(recipients[-1], Recipient(nameless.id, nameless.email, 'Unknown User'))
+        self.assertEqual([r.id for r in recipients], sorted(r.id for r in recipients))
+
+    def test_recipients_respect_filters(self):
+        opted_in = self.create_user('Opted In')
+        opted_out = self.create_user('Opted Out')
+        opted_out.new_research_alerts_enabled = False
+        db.session.commit()
+
+        criteria = [User.new_research_alerts_enabled == True]
+        recipients = list(UserService.iter_recipients(*criteria))
+
+        self.assertEqual([r.email for r in recipients], [opted_in.email])
+        self.assertEqual(UserService.count_recipients(*criteria), 1)
+
+    def test_research_alert_query_count_does_not_grow_with_members(self):
+        def alert(title):
+            research = Research(title=title, department='Pharmaceutics & Drug Delivery',
+                                year=2024, author=Researcher(name=f'Author of {title}'))
+            db.session.add(research)
+            db.session.commit()
+            greeted = []
+            with self.count_queries() as statements:
+                count = send_new_research_alert(research, send_email_func=lambda user, _: greeted.append(user.name))
+            return count, greeted, len(statements)
+
+        for i in range(3):
+            self.create_user(f'Member {i}')
+        small_count, _, small_queries = alert('First study')
+        for i in range(3, 12):
+            self.create_user(f'Member {i}')
+        count, greeted, queries = alert('Second study')
+
+        self.assertEqual(small_count, 3)
+        self.assertEqual(count, 12)
+        self.assertEqual(sorted(greeted), sorted(f'Member {i}' for i in range(12)))
+        self.assertEqual(queries, small_queries)
+
+
+class AnnouncementRecipientsTestCase(DatabaseTestCase):
+    def test_announcement_is_queued_for_matching_members(self):
+        mail_server = stub_mail_server()
+        mail_server.__enter__()
+        self.addCleanup(mail_server.__exit__, None, None, None)
+        admin = self.create_user('Admin')
+        admin.is_admin = True
+        alumni = [self.create_user(f'Alumnus {i}') for i in range(3)]
+        for user in alumni:
+            user.role = UserRole.ALUMNI
+        db.session.commit()
+        self.login(admin)
+
+        response = self.client.post('/admin/announcements/send', data={
+            'subject': 'Reunion',
+            'body': 'See you there',
+            'target_status': ['alumni']
+        })
+
+        self.assertEqual(response.status_code, 302)
+        announcement = Announcement.query.one()
+        self.assertEqual((announcement.recipient_count, announcement.success_count), (3, 3))
+        queued = sorted(json.loads(entry.recipients)[0] for entry in EmailOutbox.query)
+        self.assertEqual(queued, sorted(user.email for user in alumni))
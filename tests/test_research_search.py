@@ -0,0 +1,82 @@
+from sqlalchemy import text
+
+from app import app
+from models import db
+from services import ResearchService
+from tests.base import DatabaseTestCase
+
+
+class ResearchSearchTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ids = {}
+        for title, author, department, year in [
+            ('Nanoparticle delivery of insulin', 'Dr. Ahmed', 'Pharmaceutics & Drug Delivery', 2024),
+            ('Hepatic toxicity of paracetamol', 'Dr. Nano Osman', 'Pharmacology & Toxicology', 2023),
+            ('Oral tablets and nanoparticles', 'Dr. Sara', 'Pharmaceutics & Drug Delivery', 2022),
+            ('Antibiotic prescribing audit', 'Dr. Sara', 'Clinical Pharmacy & Pharmacy Practice', 2024),
+        ]:
+            research = ResearchService.submit_research(title, author, department, year)
+            research.is_approved = True
+            self.ids[title] = research.id
+        db.session.commit()
+
+    def titles(self, **filters):
+        return [research.title for research in ResearchService.filter_researches(**filters).items]
+
+    def test_matches_word_prefixes_in_title_and_author(self):
+        self.assertEqual(self.titles(search_query='toxic'), ['Hepatic toxicity of paracetamol'])
+        self.assertEqual(self.titles(search_query='sara audit'), ['Antibiotic prescribing audit'])
+
+    def test_title_matches_rank_above_author_matches(self):
+        titles = self.titles(search_query='nano')
+
+        self.assertEqual(set(titles[:2]), {'Nanoparticle delivery of insulin', 'Oral tablets and nanoparticles'})
+        self.assertEqual(titles[2], 'Hepatic toxicity of paracetamol')
+
+    def test_filters_and_pagination_apply_to_search(self):
+        self.assertEqual(self.titles(search_query='nano', year='2022'), ['Oral tablets and nanoparticles'])
+        self.assertEqual(self.titles(search_query='nano', department='Pharmacology & Toxicology'),
+                         ['Hepatic toxicity of paracetamol'])
+
+        page = ResearchService.filter_researches(search_query='nano', per_page=2, page=2)
+        self.assertEqual(page.total, 3)
+        self.assertEqual([research.title for research in page.items], ['Hepatic toxicity of paracetamol'])
+
+    def test_index_follows_updates_renames_and_deletes(self):
+        ResearchService.update_research(self.ids['Antibiotic prescribing audit'], title='Antimicrobial stewardship')
+        ResearchService.update_researcher(ResearchService.get_researcher_by_name('Dr. Ahmed').id, name='Dr. Khalid')
+        ResearchService.delete_research(self.ids['Oral tablets and nanoparticles'])
+
+        self.assertEqual(self.titles(search_query='audit'), [])
+        self.assertEqual(self.titles(search_query='stewardship'), ['Antimicrobial stewardship'])
+        self.assertEqual(self.titles(search_query='khalid'), ['Nanoparticle delivery of insulin'])
+        self.assertEqual(self.titles(search_query='ahmed'), [])
+        self.assertNotIn('Oral tablets and nanoparticles', self.titles(search_query='nano'))
+
+    def test_search_uses_index_not_substring_scan(self):
+        with self.count_queries() as statements:
+            self.titles(search_query='insulin')
+
+        self.assertTrue(any('MATCH' in statement for statement in statements))
+        self.assertFalse(any('LIKE' in statement.upper() for statement in statements))
+
+    def test_queries_without_words_fall_back_to_substring_match(self):
+        self.assertEqual(self.titles(search_query='"*'), [])
+
+    def test_rebuild_command_restores_index(self):
+        db.session.execute(text('DELETE FROM research_search'))
+        db.session.commit()
+        self.assertEqual(self.titles(search_query='insulin'), [])
+
+        result = app.test_cli_runner().invoke(args=['rebuild-search-index'])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(self.titles(search_query='insulin'), ['Nanoparticle delivery of insulin'])
+
+    def test_research_page_searches_index(self):
+        response = self.client.get('/research?search=paracetamol')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Hepatic toxicity', response.data)
+        self.assertNotIn(b'Antibiotic prescribing', response.data)
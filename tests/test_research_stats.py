@@ -0,0 +1,102 @@
+import re
+from unittest.mock import patch
+
+from app import app
+from models import db, Research, ResearchStat
+from services import ResearchService
+from services import research_service
+from tests.base import DatabaseTestCase
+
+
+class ResearchStatsTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ids = {}
+        for title, author, department, year in [
+            ('Nanoparticles', 'Dr. Ahmed', 'Pharmaceutics & Drug Delivery', 2023),
+            ('Tablets', 'Dr. Ahmed', 'Pharmaceutics & Drug Delivery', 2024),
+            ('Toxicity', 'Dr. Sara', 'Pharmacology & Toxicology', 2024),
+            ('Pending', 'Dr. Sara', 'Pharmaceutical Chemistry', 2022),
+        ]:
+            self.ids[title] = ResearchService.submit_research(title, author, department, year).id
+        for title in ('Nanoparticles', 'Tablets', 'Toxicity'):
+            ResearchService.approve_research(self.ids[title])
+
+    def assert_matches_rebuild(self):
+        incremental = ResearchService.get_research_statistics()
+        ResearchService.rebuild_research_statistics()
+        self.assertEqual(incremental, ResearchService.get_research_statistics())
+        return incremental
+
+    def test_approval_updates_snapshot(self):
+        stats = self.assert_matches_rebuild()
+
+        self.assertEqual(stats['total_researches'], 3)
+        self.assertEqual(stats['total_researchers'], 2)
+        self.assertEqual(stats['departments'], {'Pharmaceutics & Drug Delivery': 2, 'Pharmacology & Toxicology': 1})
+        self.assertEqual(list(stats['years'].items()), [(2024, 2), (2023, 1)])
+        self.assertEqual(stats['top_researchers'], [('Dr. Ahmed', 2), ('Dr. Sara', 1)])
+
+    def test_concurrent_first_approval_in_new_department(self):
+        research_id = ResearchService.submit_research('Assays', 'Dr. Sara', 'Clinical Pharmacy', 2024).id
+        real_insert = research_service.insert_ignoring_conflict
+
+        def insert_after_other_admin(session, model, values, conflict_columns):
+            # Another admin's approval creates the row between our UPDATE and INSERT
+            if values['value'] == 'Clinical Pharmacy':
+                session.add(ResearchStat(dimension=values['dimension'], value=values['value'], count=1))
+                session.flush()
+            return real_insert(session, model, values, conflict_columns)
+
+        with patch.object(research_service, 'insert_ignoring_conflict', side_effect=insert_after_other_admin):
+            ResearchService.approve_research(research_id)
+
+        self.assertEqual(ResearchService.get_research_statistics()['departments']['Clinical Pharmacy'], 2)
+
+    def test_update_moves_counts_between_values(self):
+        ResearchService.update_research(self.ids['Tablets'], department='Pharmaceutical Chemistry', year=2025)
+        ResearchService.update_research(self.ids['Pending'], year=2026)
+
+        stats = self.assert_matches_rebuild()
+        self.assertEqual(stats['years'], {2025: 1, 2024: 1, 2023: 1})
+        self.assertEqual(stats['departments']['Pharmaceutical Chemistry'], 1)
+
+    def test_reject_and_delete_only_count_approved_researches(self):
+        ResearchService.reject_research(self.ids['Pending'])
+        self.assertEqual(ResearchService.get_research_statistics()['total_researches'], 3)
+
+        ResearchService.delete_research(self.ids['Toxicity'])
+        stats = self.assert_matches_rebuild()
+        self.assertEqual(stats['total_researches'], 2)
+        self.assertNotIn('Pharmacology & Toxicology', stats['departments'])
+        self.assertEqual(stats['top_researchers'], [('Dr. Ahmed', 2)])
+
+    def test_deleting_researcher_removes_their_researches(self):
+        ResearchService.delete_researcher(ResearchService.get_researcher_by_name('Dr. Ahmed').id)
+
+        stats = self.assert_matches_rebuild()
+        self.assertEqual(stats['total_researches'], 1)
+        self.assertEqual(stats['years'], {2024: 1})
+
+    def test_statistics_do_not_scan_research_table(self):
+        with self.count_queries() as statements:
+            ResearchService.get_research_statistics()
+
+        self.assertEqual(len(statements), 3)
+        self.assertFalse([s for s in statements if re.search(r'\bresearch\b(?!_)', s)])
+
+    def test_rebuild_command_repairs_drift(self):
+        Research.query.filter_by(title='Pending').update({'is_approved': True})
+        db.session.commit()
+
+        result = app.test_cli_runner().invoke(args=['rebuild-research-stats'])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(ResearchStat.query.filter_by(dimension='total').one().count, 4)
+        self.assertEqual(ResearchService.get_research_statistics()['years'][2022], 1)
+
+    def test_listing_page_renders_snapshot(self):
+        response = self.client.get('/research')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Nanoparticles', response.data)
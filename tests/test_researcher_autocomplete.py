@@ -0,0 +1,93 @@
+import unittest
+
+from models import db, Researcher
+from services import ResearchService
+from tests.base import DatabaseTestCase
+from utils.name_index import NameIndex
+
+
+class NameIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.index = NameIndex(min_similarity=0.5)
+        self.index.load([(1, 'Dr. Ahmed Osman'), (2, 'Dr. Sara Ahmed'), (3, 'Mohamed Ali'),
+                         (4, 'Dr. Amira Hassan'), (5, 'Ahmad Yousif')])
+
+    def names(self, query, limit=10):
+        return [name for _, name in self.index.search(query, limit)]
+
+    def test_prefixes_rank_before_word_prefixes_and_substrings(self):
+        self.assertEqual(self.names('ahm'), ['Ahmad Yousif', 'Dr. Sara Ahmed', 'Dr. Ahmed Osman'])
+        self.assertEqual(self.names('hamed'), ['Mohamed Ali'])
+        self.assertEqual(self.names('dr a', limit=2), ['Dr. Ahmed Osman', 'Dr. Amira Hassan'])
+
+    def test_tolerates_typos_and_accents(self):
+        self.assertIn('Dr. Ahmed Osman', self.names('ahmd osman'))
+        self.assertEqual(self.names('Amíra'), ['Dr. Amira Hassan'])
+        self.assertEqual(self.names('zzz'), [])
+
+    def test_add_replaces_and_remove_drops(self):
+        self.index.add(3, 'Mohammed Khalid')
+        self.index.remove(5)
+
+        self.assertEqual(self.names('khalid'), ['Mohammed Khalid'])
+        self.assertNotIn('Mohamed Ali', self.names('mohamed'))
+        self.assertNotIn('Ahmad Yousif', self.names('ahm'))
+        self.assertEqual(len(self.index), 4)
+
+    def test_staleness_follows_load_time(self):
+        now = [100.0]
+        index = NameIndex(timer=lambda: now[0])
+        self.assertTrue(index.is_stale(300))
+
+        index.load([])
+        now[0] = 399
+        self.assertFalse(index.is_stale(300))
+        now[0] = 400
+        self.assertTrue(index.is_stale(300))
+
+
+class ResearcherAutocompleteTestCase(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ahmed = ResearchService.create_researcher('Dr. Ahmed Osman')
+        ResearchService.create_researcher('Dr. Sara Ahmed')
+
+    def test_searches_after_first_load_skip_the_database(self):
+        ResearchService.search_researchers('ahmed')
+
+        with self.count_queries() as statements:
+            results = ResearchService.search_researchers('osman')
+
+        self.assertEqual(statements, [])
+        self.assertEqual(results, [{'id': self.ahmed.id, 'name': 'Dr. Ahmed Osman'}])
+
+    def test_service_changes_update_loaded_index(self):
+        ResearchService.search_researchers('ahmed')
+        khalid = ResearchService.create_researcher('Dr. Khalid Nour')
+        ResearchService.update_researcher(self.ahmed.id, name='Dr. Ahmed Babiker')
+        ResearchService.submit_research('Study', 'Dr. Hiba Salih', 'Pharmaceutical Chemistry', 2024)
+
+        self.assertEqual(ResearchService.search_researchers('khal'), [{'id': khalid.id, 'name': 'Dr. Khalid Nour'}])
+        self.assertEqual(ResearchService.search_researchers('osman'), [])
+        self.assertEqual([r['name'] for r in ResearchService.search_researchers('hiba')], ['Dr. Hiba Salih'])
+
+        ResearchService.delete_researcher(khalid.id)
+        self.assertEqual(ResearchService.search_researchers('khal'), [])
+
+    def test_api_is_cacheable_and_conditional(self):
+        response = self.client.get('/api/search-researchers?q=ahm')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['name'] for r in response.get_json()], ['Dr. Sara Ahmed', 'Dr. Ahmed Osman'])
+        self.assertIn('max-age=60', response.headers['Cache-Control'])
+        etag = response.headers['ETag']
+
+        repeat = self.client.get('/api/search-researchers?q=ahm', headers={'If-None-Match': etag})
+        self.assertEqual(repeat.status_code, 304)
+
+        db.session.add(Researcher(name='Dr. Ahmad Yousif'))
+        db.session.commit()
+        ResearchService.forget_researcher_names()
+        changed = self.client.get('/api/search-researchers?q=ahm', headers={'If-None-Match': etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(len(changed.get_json()), 3)
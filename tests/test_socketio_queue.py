@@ -0,0 +1,108 @@
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+import requests
+import socketio
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SETUP_SCRIPT = """
+from app import app
+from models import db, User, Profile
+with app.app_context():
+    db.create_all()
+    for name in ('Alice', 'Bob'):
+        user = User(email=f'{name.lower()}@example.com')
+        user.profile = Profile(full_name=name)
+        db.session.add(user)
+    db.session.commit()
+"""
+
+SERVER_SCRIPT = """
+import sys
+from app import app, socketio
+socketio.run(app, port=int(sys.argv[1]), allow_unsafe_werkzeug=True)
+"""
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class MultiWorkerFanOutTestCase(unittest.TestCase):
+    """Two server processes share only the SQLite queue and the database."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{os.path.join(self.tmpdir.name, 'app.db')}",
+            SOCKETIO_MESSAGE_QUEUE=f"sqlite:///{os.path.join(self.tmpdir.name, 'queue.db')}",
+        )
+        subprocess.run([sys.executable, '-c', SETUP_SCRIPT], env=self.env, cwd=PROJECT_ROOT, check=True)
+
+        self.servers = []
+        self.clients = []
+        self.ports = [free_port(), free_port()]
+        for port in self.ports:
+            self.servers.append(subprocess.Popen(
+                [sys.executable, '-c', SERVER_SCRIPT, str(port)],
+                env=self.env, cwd=PROJECT_ROOT,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            ))
+        for port in self.ports:
+            self.wait_for_server(port)
+
+    def tearDown(self):
+        for client in self.clients:
+            client.disconnect()
+        for server in self.servers:
+            server.terminate()
+            server.wait(timeout=10)
+        self.tmpdir.cleanup()
+
+    def wait_for_server(self, port, timeout=15):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                requests.get(f'http://127.0.0.1:{port}/socket.io/?EIO=4&transport=polling', timeout=1)
+                return
+            except requests.ConnectionError:
+                time.sleep(0.1)
+        self.fail(f'Server on port {port} did not start')
+
+    def connect(self, port, user_id):
+        client = socketio.Client()
+        joined = threading.Event()
+        client.on('joined', lambda data: joined.set())
+        client.connect(f'http://127.0.0.1:{port}', transports=['polling'])
+        self.clients.append(client)
+        client.emit('join', {'user_id': user_id})
+        self.assertTrue(joined.wait(5))
+        return client
+
+    def test_emit_reaches_socket_on_other_worker(self):
+        received = []
+        delivered = threading.Event()
+
+        receiver = self.connect(self.ports[0], 1)
+        sender = self.connect(self.ports[1], 2)
+
+        @receiver.on('new_message')
+        def on_new_message(data):
+            received.append(data)
+            delivered.set()
+
+        sender.emit('send_message', {'sender_id': 2, 'receiver_id': 1, 'content': 'Across workers'})
+
+        self.assertTrue(delivered.wait(10))
+        self.assertEqual(received[0]['content'], 'Across workers')
+        self.assertEqual(received[0]['sender_id'], 2)
@@ -0,0 +1,47 @@
+import unittest
+
+from utils.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TTLCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = TTLCache(maxsize=3, ttl=10, timer=self.clock)
+
+    def test_entries_expire_after_ttl(self):
+        self.cache.set('a', 1)
+        self.clock.now = 9.9
+        self.assertEqual(self.cache.get('a'), 1)
+
+        self.clock.now = 10
+        self.assertIsNone(self.cache.get('a'))
+        self.assertNotIn('a', self.cache)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_size_is_capped_evicting_expired_then_oldest(self):
+        self.cache.set('a', 1, ttl=1)
+        self.cache.set('b', 2)
+        self.cache.set('c', 3)
+        self.clock.now = 5
+
+        self.cache.set('d', 4)
+        self.assertEqual(len(self.cache), 3)
+        self.assertNotIn('a', self.cache)
+
+        self.cache.set('e', 5)
+        self.assertEqual(len(self.cache), 3)
+        self.assertNotIn('b', self.cache)
+        self.assertEqual([self.cache.get(k) for k in 'cde'], [3, 4, 5])
+
+    def test_pop_removes_entry(self):
+        self.cache.set('a', 1)
+        self.assertEqual(self.cache.pop('a'), 1)
+        self.assertIsNone(self.cache.pop('a'))
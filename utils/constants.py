@@ -19,6 +19,16 @@ ALLOWED_IMAGE_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif'}
 
 # Message settings
 MAX_MESSAGE_LENGTH = 1000
+INBOX_PAGE_SIZE = 30
+HISTORY_PAGE_SIZE = 50
+TYPING_STATE_TTL = 10  # seconds
+TYPING_STATE_MAX_ENTRIES = 10000
+NAME_CACHE_TTL = 300  # seconds
+NAME_CACHE_MAX_ENTRIES = 5000
+
+# Forum settings
+FORUM_PAGE_SIZE = 20
+COMMENT_PAGE_SIZE = 50
 
 # Flash message categories
 FLASH_SUCCESS = 'success'
@@ -28,6 +38,39 @@ FLASH_INFO = 'info'
 
 # Email settings
 EMAIL_BATCH_SIZE = 50
+RECIPIENT_CHUNK_SIZE = 1000  # recipients fetched per query when streaming mass mail
+EMAIL_DISPATCH_WORKERS = 8  # threads rendering and sending a campaign
+
+# Notification log settings
+NOTIFICATION_LOG_CHUNK_SIZE = 500  # rows per bulk insert
+NOTIFICATION_PRUNE_CHUNK_SIZE = 5000  # rows rolled up and deleted per transaction
+
+# Research statistics dimensions
+RESEARCH_STAT_TOTAL = 'total'
+RESEARCH_STAT_DEPARTMENT = 'department'
+RESEARCH_STAT_YEAR = 'year'
+RESEARCH_STAT_RESEARCHER = 'researcher'
+
+# Researcher autocomplete
+RESEARCHER_INDEX_TTL = 300  # seconds before a worker reloads names changed by other workers
+AUTOCOMPLETE_MIN_SIMILARITY = 0.5  # share of query trigrams a fuzzy match must contain
+AUTOCOMPLETE_MAX_AGE = 60  # seconds browsers may reuse an autocomplete response
+
+# Notification campaign statuses
+CAMPAIGN_STATUS_RUNNING = 'running'
+CAMPAIGN_STATUS_COMPLETED = 'completed'
+
+# Email outbox settings
+OUTBOX_STATUS_PENDING = 'pending'
+OUTBOX_STATUS_SENDING = 'sending'
+OUTBOX_STATUS_SENT = 'sent'
+OUTBOX_STATUS_DEAD = 'dead'
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_MAX_ATTEMPTS = 6
+OUTBOX_RETRY_BASE_DELAY = 60  # seconds, doubled after each failed attempt
+OUTBOX_RETRY_MAX_DELAY = 3600  # seconds
+OUTBOX_LOCK_TIMEOUT = 600  # seconds before a claimed message is considered abandoned
+OUTBOX_PRUNE_CHUNK_SIZE = 1000  # rows deleted per transaction
 
 # Event status
 EVENT_STATUS_LIVE = 'live'
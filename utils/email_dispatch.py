@@ -0,0 +1,246 @@
+"""
+Email Dispatch Module
+
+Renders and sends one templated email to many recipients concurrently.
+The template comes from the compiled-template registry; rendering (and, with the
+outbox disabled, SMTP delivery) is spread over a bounded thread pool.
+"""
+
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from queue import Queue
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from flask import current_app
+
+from utils.constants import EMAIL_BATCH_SIZE, EMAIL_DISPATCH_WORKERS
+from utils.email_utils import (
+    EVENT_REMINDER_TEMPLATE,
+    NEW_RESEARCH_TEMPLATE,
+    PooledMailSender,
+    build_message,
+    get_email_template,
+    is_mail_configured,
+)
+
+
+class _SenderPool:
+    """
+    A fixed set of pooled SMTP senders shared by the dispatch threads.
+
+    The pool size is the per-host connection limit: a thread has to check
+    out a sender before talking to MAIL_SERVER, so no more than `size`
+    connections are ever open to it, and each is reused across messages.
+    """
+
+    def __init__(self, size: int):
+        self._senders = [PooledMailSender() for _ in range(size)]
+        self._idle = Queue()
+        for sender in self._senders:
+            self._idle.put(sender)
+
+    @contextmanager
+    def checkout(self):
+        sender = self._idle.get()
+        try:
+            yield sender
+        finally:
+            self._idle.put(sender)
+
+    def close(self):
+        for sender in self._senders:
+            sender.close()
+
+
+class EmailCampaign:
+    """
+    One templated email sent to many recipients.
+
+    Context values are read from worker threads, so pass plain values or
+    dicts rather than ORM objects, which would lazy-load through the
+    caller's session. Recipients need `email` and whatever the template
+    reads from `user` (see UserService.iter_recipients).
+    """
+
+    def __init__(
+        self,
+        subject: str,
+        template_name: str,
+        html_template: str,
+        context: Optional[Dict[str, Any]] = None,
+        max_workers: int = EMAIL_DISPATCH_WORKERS,
+        per_host_limit: Optional[int] = None
+    ):
+        self.subject = subject
+        # Compiled once for every recipient (and reused by later campaigns)
+        self.template = get_email_template(template_name, html_template)
+        self.context = context or {}
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit or current_app.config.get('MAIL_MAX_CONNECTIONS_PER_HOST', 4)
+
+    def render(self, recipient) -> str:
+        """
+        Render the HTML body for one recipient.
+
+        Args:
+            recipient: Recipient tuple or User, exposed to the template as `user`
+
+        Returns:
+            str: Rendered HTML
+        """
+        return self.template.render(user=recipient, **self.context)
+
+    def send(self, recipients: Iterable) -> Iterator[Tuple[Any, bool, Optional[str]]]:
+        """
+        Render and send (or queue) the campaign for every recipient.
+
+        Results are yielded as they complete, not in recipient order. With
+        the outbox enabled, a result is only yielded once its message has
+        been committed to the outbox.
+
+        Args:
+            recipients: Iterable of recipients; consumed lazily
+
+        Returns:
+            Iterator of (recipient, success, error_message) tuples
+        """
+        is_configured, config_error = is_mail_configured()
+        if not is_configured:
+            current_app.logger.error(f"Campaign not sent - {config_error}")
+            for recipient in recipients:
+                yield recipient, False, config_error
+            return
+
+        if current_app.config.get('MAIL_USE_OUTBOX', True):
+            yield from self._queue(recipients)
+        else:
+            yield from self._deliver(recipients)
+
+    def _map(self, func, recipients: Iterable) -> Iterator[Tuple[Any, Any, Optional[str]]]:
+        """Run func for each recipient on the pool, keeping a bounded number in flight."""
+        app = current_app._get_current_object()
+
+        def run(recipient):
+            with app.app_context():
+                return func(recipient)
+
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='email-dispatch') as executor:
+            def drain(return_when):
+                done, _ = wait(in_flight, return_when=return_when)
+                for future in done:
+                    recipient = in_flight.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        yield recipient, None, str(error)
+                    else:
+                        yield recipient, future.result(), None
+
+            for recipient in recipients:
+                in_flight[executor.submit(run, recipient)] = recipient
+                if len(in_flight) >= self.max_workers * 2:
+                    yield from drain(FIRST_COMPLETED)
+            if in_flight:
+                yield from drain(ALL_COMPLETED)
+
+    def _deliver(self, recipients: Iterable) -> Iterator[Tuple[Any, bool, Optional[str]]]:
+        pool = _SenderPool(self.per_host_limit)
+
+        def render_and_send(recipient):
+            message = build_message(self.subject, [recipient.email], self.render(recipient))
+            with pool.checkout() as sender:
+                return sender.send(message)
+
+        try:
+            for recipient, outcome, error in self._map(render_and_send, recipients):
+                if outcome is None:
+                    yield recipient, False, error
+                else:
+                    yield (recipient,) + tuple(outcome)
+        finally:
+            pool.close()
+
+    def _queue(self, recipients: Iterable) -> Iterator[Tuple[Any, bool, Optional[str]]]:
+        from models import db
+        from services.outbox_service import OutboxService
+
+        queued = []
+
+        def commit():
+            try:
+                db.session.commit()
+                results = [(recipient, True, None) for recipient in queued]
+            except Exception as e:
+                db.session.rollback()
+                current_app.logger.error(f"Failed to queue campaign emails: {str(e)}")
+                results = [(recipient, False, str(e)) for recipient in queued]
+            queued.clear()
+            return results
+
+        # Rendering happens on the pool; outbox rows are written from this thread
+        for recipient, html_body, error in self._map(self.render, recipients):
+            if error is not None:
+                yield recipient, False, error
+                continue
+            OutboxService.enqueue(self.subject, [recipient.email], html_body, commit=False)
+            queued.append(recipient)
+            if len(queued) >= EMAIL_BATCH_SIZE:
+                yield from commit()
+        if queued:
+            yield from commit()
+
+
+def event_reminder_campaign(event, **options) -> EmailCampaign:
+    """
+    Build the reminder campaign for an event.
+
+    Args:
+        event: Event model instance
+        **options: Passed to EmailCampaign (max_workers, per_host_limit)
+
+    Returns:
+        EmailCampaign: Campaign rendering EVENT_REMINDER_TEMPLATE
+    """
+    return EmailCampaign(
+        f"Reminder: {event.title} - PSRA Event",
+        'event_reminder',
+        EVENT_REMINDER_TEMPLATE,
+        context={
+            'event': {
+                'title': event.title,
+                'presenter': event.presenter,
+                'event_url': event.event_url,
+            },
+            'event_date_str': event.event_date.strftime('%B %d, %Y'),
+            'event_time_str': event.event_time.strftime('%I:%M %p') if event.event_time else 'TBD',
+        },
+        **options
+    )
+
+
+def new_research_campaign(research, **options) -> EmailCampaign:
+    """
+    Build the new publication alert campaign for a research item.
+
+    Args:
+        research: Research model instance
+        **options: Passed to EmailCampaign (max_workers, per_host_limit)
+
+    Returns:
+        EmailCampaign: Campaign rendering NEW_RESEARCH_TEMPLATE
+    """
+    return EmailCampaign(
+        f"New Research: {research.title[:50]}... - PSRA",
+        'new_research',
+        NEW_RESEARCH_TEMPLATE,
+        context={
+            'research': {
+                'title': research.title,
+                'author': {'name': research.author.name if research.author else ''},
+                'department': research.department,
+                'year': research.year,
+                'doi_url': research.doi_url,
+            },
+        },
+        **options
+    )
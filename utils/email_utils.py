@@ -1,7 +1,63 @@
-from flask import current_app, render_template_string, url_for
+from flask import current_app, url_for
 from flask_mail import Message
-from models import User, ApplicationStatus
+from models import db, User, ApplicationStatus
+import hashlib
 import logging
+import smtplib
+import threading
+from itertools import islice
+
+from utils.constants import EMAIL_BATCH_SIZE
+
+
+# Compiled email templates keyed by (name, content hash), shared by every sender
+_compiled_templates = {}
+_compiled_templates_lock = threading.Lock()
+
+
+def get_email_template(name, source):
+    """
+    Get the compiled Jinja template for an email, compiling it on first use.
+
+    render_template_string parses and compiles its source on every call;
+    this compiles each template once per process. Keying on a hash of the
+    source means an edited template is recompiled rather than served stale.
+
+    Args:
+        name (str): Template name, e.g. 'event_reminder'
+        source (str): Jinja template source
+
+    Returns:
+        Template: Compiled template bound to the app's Jinja environment
+    """
+    key = (name, hashlib.sha1(source.encode('utf-8')).hexdigest())
+    template = _compiled_templates.get(key)
+    if template is None:
+        with _compiled_templates_lock:
+            template = _compiled_templates.get(key)
+            if template is None:
+                template = current_app.jinja_env.from_string(source)
+                _compiled_templates[key] = template
+    return template
+
+
+def render_email_template(name, source, **context):
+    """
+    Render an email body from the compiled-template registry.
+
+    Unlike render_template_string, page context processors are not run:
+    email bodies never use them, and they would look up the logged-in
+    user's unread count for every message rendered.
+
+    Args:
+        name (str): Template name, e.g. 'event_reminder'
+        source (str): Jinja template source
+        **context: Template variables
+
+    Returns:
+        str: Rendered HTML
+    """
+    return get_email_template(name, source).render(**context)
 
 
 def is_mail_configured():
@@ -31,7 +87,10 @@ def is_mail_configured():
 
 def send_email(subject, recipients, html_body, text_body=None):
     """
-    Send an email using Flask-Mail with error handling.
+    Send an email, queueing it in the outbox unless MAIL_USE_OUTBOX is off.
+
+    Queued emails are delivered by the `flask email-worker` process, so
+    request handlers do not wait on the SMTP server.
 
     Args:
         subject (str): Email subject
@@ -39,6 +98,76 @@ def send_email(subject, recipients, html_body, text_body=None):
         html_body (str): HTML content of the email
         text_body (str, optional): Plain text version of the email
 
+    Returns:
+        tuple: (success: bool, error_message: str or None)
+    """
+    if not current_app.config.get('MAIL_USE_OUTBOX', True):
+        return deliver_email(subject, recipients, html_body, text_body)
+
+    is_configured, config_error = is_mail_configured()
+    if not is_configured:
+        current_app.logger.error(f"Email not queued - {config_error}")
+        return False, config_error
+
+    if not recipients:
+        error_msg = "No recipients provided"
+        current_app.logger.warning(f"Email not queued - {error_msg}")
+        return False, error_msg
+
+    try:
+        from services.outbox_service import OutboxService
+        OutboxService.enqueue(subject, recipients, html_body, text_body)
+        current_app.logger.info(f"Email queued for {len(recipients)} recipients: {subject}")
+        return True, None
+
+    except Exception as e:
+        # Leave the caller's session usable, as the inline SMTP path does
+        db.session.rollback()
+        error_msg = str(e)
+        current_app.logger.error(f"Failed to queue email: {error_msg}")
+        return False, error_msg
+
+
+def build_message(subject, recipients, html_body, text_body=None, sender=None):
+    """
+    Build a Flask-Mail message with the configured default sender.
+
+    Args:
+        subject (str): Email subject
+        recipients (list): List of recipient email addresses
+        html_body (str): HTML content of the email
+        text_body (str, optional): Plain text version of the email
+        sender (str, optional): Sender address, defaults to MAIL_DEFAULT_SENDER
+
+    Returns:
+        Message: The message ready to send
+    """
+    sender = sender or current_app.config.get('MAIL_DEFAULT_SENDER') or current_app.config.get('MAIL_USERNAME')
+
+    msg = Message(
+        subject=subject,
+        sender=sender,
+        recipients=recipients,
+        html=html_body
+    )
+
+    if text_body:
+        msg.body = text_body
+
+    return msg
+
+
+def deliver_email(subject, recipients, html_body, text_body=None, sender=None):
+    """
+    Deliver an email immediately using Flask-Mail with error handling.
+
+    Args:
+        subject (str): Email subject
+        recipients (list): List of recipient email addresses
+        html_body (str): HTML content of the email
+        text_body (str, optional): Plain text version of the email
+        sender (str, optional): Sender address, defaults to MAIL_DEFAULT_SENDER
+
     Returns:
         tuple: (success: bool, error_message: str or None)
     """
@@ -53,18 +182,7 @@ def send_email(subject, recipients, html_body, text_body=None):
         return False, error_msg
     
     try:
-        sender = current_app.config.get('MAIL_DEFAULT_SENDER') or current_app.config.get('MAIL_USERNAME')
-
-        msg = Message(
-            subject=subject,
-            sender=sender,
-            recipients=recipients,
-            html=html_body
-        )
-
-        if text_body:
-            msg.body = text_body
-
+        msg = build_message(subject, recipients, html_body, text_body, sender)
         current_app.extensions['mail'].send(msg)
         current_app.logger.info(f"Email sent successfully to {len(recipients)} recipients: {subject}")
         return True, None
@@ -74,6 +192,160 @@ def send_email(subject, recipients, html_body, text_body=None):
         current_app.logger.error(f"Failed to send email: {error_msg}")
         return False, error_msg
 
+
+class PooledMailSender:
+    """
+    Send many messages over one authenticated SMTP connection.
+
+    The connection comes from Flask-Mail's ``mail.connect()`` and is
+    reopened after MAIL_MAX_PER_CONNECTION messages, or when the server
+    drops it. A message that fails on a broken connection is retried once
+    on a fresh one. Use as a context manager so the connection is closed.
+    """
+
+    def __init__(self, max_per_connection=None):
+        self.max_per_connection = max_per_connection or current_app.config.get('MAIL_MAX_PER_CONNECTION', 100)
+        self.connection = None
+        self.sent_on_connection = 0
+        self.connections_opened = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+    def _connect(self):
+        self.connection = current_app.extensions['mail'].connect().__enter__()
+        self.sent_on_connection = 0
+        self.connections_opened += 1
+
+    def close(self):
+        """Close the current connection, ignoring errors from a dead socket."""
+        if self.connection is not None:
+            try:
+                self.connection.__exit__(None, None, None)
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.connection = None
+
+    def send(self, message):
+        """
+        Send one message, reconnecting if needed.
+
+        Args:
+            message: Flask-Mail Message instance
+
+        Returns:
+            tuple: (success: bool, error_message: str or None)
+        """
+        for attempt in range(2):
+            try:
+                if self.connection is None or self.sent_on_connection >= self.max_per_connection:
+                    self.close()
+                    self._connect()
+                self.connection.send(message)
+                self.sent_on_connection += 1
+                return True, None
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused,
+                    smtplib.SMTPDataError) as e:
+                # Rejected by the server; the connection itself is still usable
+                return False, str(e)
+            except smtplib.SMTPAuthenticationError as e:
+                self.close()
+                return False, str(e)
+            except (smtplib.SMTPException, OSError) as e:
+                self.close()
+                if attempt == 0:
+                    current_app.logger.warning(f"SMTP connection lost, reconnecting: {e}")
+                    continue
+                return False, str(e)
+            except Exception as e:
+                return False, str(e)
+
+
+def deliver_emails(messages, max_per_connection=None):
+    """
+    Deliver several messages over a pooled SMTP connection.
+
+    Args:
+        messages (list): Flask-Mail Message instances
+        max_per_connection (int, optional): Messages sent before reconnecting
+
+    Returns:
+        list: One (success, error_message) tuple per message, in order
+    """
+    is_configured, config_error = is_mail_configured()
+    if not is_configured:
+        current_app.logger.error(f"Emails not sent - {config_error}")
+        return [(False, config_error)] * len(messages)
+
+    with PooledMailSender(max_per_connection) as sender:
+        outcomes = [sender.send(message) for message in messages]
+
+    sent = sum(1 for success, _ in outcomes if success)
+    current_app.logger.info(f"Delivered {sent} of {len(messages)} emails over {sender.connections_opened} connections")
+    return outcomes
+
+
+def send_bulk_email(subject, emails, html_body, text_body=None):
+    """
+    Send the same email to many recipients, one message per recipient.
+
+    With the outbox enabled the messages are queued EMAIL_BATCH_SIZE at a
+    time and the worker delivers them over a pooled connection; otherwise
+    they are delivered inline over a pooled connection. `emails` may be a
+    generator, so recipients are never all held in memory at once.
+
+    Args:
+        subject (str): Email subject
+        emails (iterable): Recipient email addresses
+        html_body (str): HTML content of the email
+        text_body (str, optional): Plain text version of the email
+
+    Returns:
+        tuple: (success_count, failure_count, first_error_message)
+    """
+    emails = (email for email in emails if email)
+
+    is_configured, config_error = is_mail_configured()
+    if not is_configured:
+        current_app.logger.error(f"Bulk email not sent - {config_error}")
+        failure_count = sum(1 for _ in emails)
+        if not failure_count:
+            return 0, 0, "No recipients found"
+        return 0, failure_count, config_error
+
+    success_count = failure_count = 0
+    first_error = None
+
+    if current_app.config.get('MAIL_USE_OUTBOX', True):
+        from services.outbox_service import OutboxService
+        while True:
+            chunk = list(islice(emails, EMAIL_BATCH_SIZE))
+            if not chunk:
+                break
+            try:
+                success_count += OutboxService.enqueue_many(subject, chunk, html_body, text_body)
+            except Exception as e:
+                current_app.logger.error(f"Failed to queue bulk email: {str(e)}")
+                failure_count += len(chunk)
+                first_error = first_error or str(e)
+    else:
+        with PooledMailSender() as sender:
+            for email in emails:
+                success, error = sender.send(build_message(subject, [email], html_body, text_body))
+                if success:
+                    success_count += 1
+                else:
+                    failure_count += 1
+                    first_error = first_error or error
+
+    if not success_count and not failure_count:
+        return 0, 0, "No recipients found"
+    return success_count, failure_count, first_error
+
+
 def send_event_notification(event):
     """
     Send event notification email to all users.
@@ -84,12 +356,7 @@ def send_event_notification(event):
     Returns:
         tuple: (success_count, failure_count)
     """
-    # Get all users with valid email addresses
-    users = User.query.filter(User.email.isnot(None)).all()
-
-    if not users:
-        logging.warning("No users found with email addresses for event notification")
-        return 0, 0
+    from services.user_service import UserService
 
     # Prepare event details
     event_date_str = event.event_date.strftime('%B %d, %Y')
@@ -171,7 +438,7 @@ def send_event_notification(event):
     """
 
     # Render the HTML template
-    html_body = render_template_string(html_template,
+    html_body = render_email_template('event_notification', html_template,
                                      event=event,
                                      event_date_str=event_date_str,
                                      event_time_str=event_time_str)
@@ -197,43 +464,22 @@ def send_event_notification(event):
 
     text_body += "\nVisit our events page to learn more!\n\nBest regards,\nPSRA Team"
 
-    # Send emails in batches to avoid overwhelming the mail server
-    success_count = 0
-    failure_count = 0
-    batch_size = 50
-
-    for i in range(0, len(users), batch_size):
-        batch_users = users[i:i + batch_size]
-        batch_emails = [user.email for user in batch_users if user.email]
+    # One message per recipient, streamed from the database and sent over a pooled connection
+    recipients = UserService.iter_recipients(User.email.isnot(None))
+    success_count, failure_count, _ = send_bulk_email(
+        subject, (user.email for user in recipients), html_body, text_body
+    )
 
-        if batch_emails:
-            success, error = send_email(subject, batch_emails, html_body, text_body)
-            if success:
-                success_count += len(batch_emails)
-            else:
-                failure_count += len(batch_emails)
+    if not success_count and not failure_count:
+        logging.warning("No users found with email addresses for event notification")
+        return 0, 0
 
     current_app.logger.info(f"Event notification sent: {success_count} successful, {failure_count} failed")
     return success_count, failure_count
 
 
-def send_event_reminder_email(user, event):
-    """
-    Send an event reminder email to a user.
-    
-    Args:
-        user: User model instance
-        event: Event model instance
-        
-    Returns:
-        bool: True if email sent successfully, False otherwise
-    """
-    event_date_str = event.event_date.strftime('%B %d, %Y')
-    event_time_str = event.event_time.strftime('%I:%M %p') if event.event_time else 'TBD'
-    
-    subject = f"Reminder: {event.title} - PSRA Event"
-    
-    html_template = """
+# Shared by send_event_reminder_email and the event reminder campaign
+EVENT_REMINDER_TEMPLATE = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -279,27 +525,32 @@ def send_event_reminder_email(user, event):
     </body>
     </html>
     """
-    
-    html_body = render_template_string(html_template, user=user, event=event, 
-                                        event_date_str=event_date_str, event_time_str=event_time_str)
-    
-    return send_email(subject, [user.email], html_body)
 
 
-def send_new_research_email(user, research):
+def send_event_reminder_email(user, event):
     """
-    Send a new research publication notification email.
+    Send an event reminder email to a user.
     
     Args:
         user: User model instance
-        research: Research model instance
+        event: Event model instance
         
     Returns:
         bool: True if email sent successfully, False otherwise
     """
-    subject = f"New Research: {research.title[:50]}... - PSRA"
+    event_date_str = event.event_date.strftime('%B %d, %Y')
+    event_time_str = event.event_time.strftime('%I:%M %p') if event.event_time else 'TBD'
     
-    html_template = """
+    subject = f"Reminder: {event.title} - PSRA Event"
+    
+    html_body = render_email_template('event_reminder', EVENT_REMINDER_TEMPLATE, user=user, event=event, 
+                                        event_date_str=event_date_str, event_time_str=event_time_str)
+    
+    return send_email(subject, [user.email], html_body)
+
+
+# Shared by send_new_research_email and the new research campaign
+NEW_RESEARCH_TEMPLATE = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -345,8 +596,22 @@ def send_new_research_email(user, research):
     </body>
     </html>
     """
+
+
+def send_new_research_email(user, research):
+    """
+    Send a new research publication notification email.
     
-    html_body = render_template_string(html_template, user=user, research=research)
+    Args:
+        user: User model instance
+        research: Research model instance
+        
+    Returns:
+        bool: True if email sent successfully, False otherwise
+    """
+    subject = f"New Research: {research.title[:50]}... - PSRA"
+    
+    html_body = render_email_template('new_research', NEW_RESEARCH_TEMPLATE, user=user, research=research)
     
     return send_email(subject, [user.email], html_body)
 
@@ -357,20 +622,11 @@ def send_announcement_email(announcement, recipients):
     
     Args:
         announcement: Announcement model instance
-        recipients: List of User model instances
+        recipients: Iterable of users or Recipient tuples (anything with an email)
         
     Returns:
         tuple: (success_count, failure_count, first_error_message)
     """
-    if not recipients:
-        current_app.logger.warning("No recipients for announcement")
-        return 0, 0, "No recipients found"
-    
-    is_configured, config_error = is_mail_configured()
-    if not is_configured:
-        current_app.logger.error(f"Announcement not sent - {config_error}")
-        return 0, len(recipients), config_error
-    
     subject = f"[PSRA Announcement] {announcement.subject}"
     
     html_template = """
@@ -408,7 +664,7 @@ def send_announcement_email(announcement, recipients):
     </html>
     """
     
-    html_body = render_template_string(html_template, body=announcement.body)
+    html_body = render_email_template('announcement', html_template, body=announcement.body)
     
     text_body = f"""
 PSRA Announcement
@@ -419,23 +675,14 @@ Best regards,
 PSRA Team
 """
     
-    success_count = 0
-    failure_count = 0
-    first_error = None
-    batch_size = 50
+    # One message per recipient, sent over a pooled connection
+    success_count, failure_count, first_error = send_bulk_email(
+        subject, (user.email for user in recipients), html_body, text_body
+    )
     
-    for i in range(0, len(recipients), batch_size):
-        batch_recipients = recipients[i:i + batch_size]
-        batch_emails = [user.email for user in batch_recipients if user.email]
-        
-        if batch_emails:
-            success, error = send_email(subject, batch_emails, html_body, text_body)
-            if success:
-                success_count += len(batch_emails)
-            else:
-                failure_count += len(batch_emails)
-                if first_error is None:
-                    first_error = error
+    if not success_count and not failure_count:
+        current_app.logger.warning("No recipients for announcement")
+        return 0, 0, first_error
     
     current_app.logger.info(f"Announcement sent: {success_count} successful, {failure_count} failed")
     return success_count, failure_count, first_error
@@ -513,7 +760,7 @@ def send_research_status_email(user, research, status, reason=None):
     </html>
     """
     
-    html_body = render_template_string(html_template, user=user, title=title, 
+    html_body = render_email_template('research_status', html_template, user=user, title=title, 
                                         author_name=author_name, status_message=status_message,
                                         status_color=status_color, reason=reason)
     
@@ -589,7 +836,7 @@ def send_mentorship_request_email(alumni, student, message):
     
     with current_app.app_context():
         manage_url = url_for('hub.manage_mentorships', _external=True)
-        html_body = render_template_string(html_template, 
+        html_body = render_email_template('mentorship_request', html_template, 
                                          alumni=alumni, 
                                          student=student, 
                                          message=message,
@@ -678,7 +925,7 @@ def send_mentorship_response_email(student, alumni, status, message=None):
     </html>
     """
     
-    html_body = render_template_string(html_template, 
+    html_body = render_email_template('mentorship_response', html_template, 
                                      student=student, 
                                      alumni=alumni, 
                                      status=status,
@@ -765,7 +1012,7 @@ def send_project_application_email(researcher, student, project, motivation_lett
     
     with current_app.app_context():
         manage_url = url_for('hub.manage_projects', _external=True)
-        html_body = render_template_string(html_template, 
+        html_body = render_email_template('project_application', html_template, 
                                          researcher=researcher, 
                                          student=student, 
                                          project=project,
@@ -865,7 +1112,7 @@ def send_project_application_response_email(student, researcher, project, status
     
     with current_app.app_context():
         message_url = url_for('forum.conversation', user_id=researcher.id, _external=True)
-        html_body = render_template_string(html_template,
+        html_body = render_email_template('project_application_response', html_template,
                                          student=student,
                                          researcher=researcher,
                                          project=project,
@@ -0,0 +1,205 @@
+"""
+Name Index Module
+
+An in-process index for name autocomplete, so answering a keystroke does
+not need the database.
+
+Names whose start, or the start of a later word, matches the query are
+found by binary search over sorted keys and ranked in that order. Only
+when those leave the result short does a trigram lookup add fuzzy
+matches: names containing at least ``min_similarity`` of the query's
+trigrams, which survives a typo.
+"""
+
+import heapq
+import math
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+def normalize_name(name: str) -> str:
+    """
+    Lowercase a name, strip accents and reduce it to space-separated words.
+
+    Args:
+        name: Raw name or query
+
+    Returns:
+        Normalized name
+    """
+    decomposed = unicodedata.normalize('NFKD', name or '')
+    plain = ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+    return ' '.join(re.findall(r'\w+', plain))
+
+
+def trigrams(normalized: str) -> Set[str]:
+    """Trigrams of each word, padded so word starts and ends are distinct."""
+    grams = set()
+    for word in normalized.split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _suffixes(normalized: str) -> List[str]:
+    """The name from the start of each word after the first."""
+    words = normalized.split()
+    return [' '.join(words[i:]) for i in range(1, len(words))]
+
+
+class NameIndex:
+    """
+    Thread-safe autocomplete index of (id, name) pairs.
+
+    Args:
+        min_similarity: Share of the query's trigrams a fuzzy match must contain
+        timer: Clock used to age the index
+    """
+
+    def __init__(self, min_similarity: float = 0.5, timer: Callable[[], float] = time.monotonic):
+        self.min_similarity = min_similarity
+        self.timer = timer
+        self._names: Dict[int, Tuple[str, str, Set[str]]] = {}
+        self._starts: List[Tuple[str, int]] = []
+        self._word_starts: List[Tuple[str, int]] = []
+        self._postings: Dict[str, Set[int]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def load(self, entries: Iterable[Tuple[int, str]]) -> None:
+        """
+        Replace the index contents.
+
+        Args:
+            entries: (id, name) pairs
+        """
+        names, starts, word_starts, postings = {}, [], [], {}
+        for entry_id, name in entries:
+            normalized = normalize_name(name)
+            grams = trigrams(normalized)
+            names[entry_id] = (name, normalized, grams)
+            starts.append((normalized, entry_id))
+            word_starts.extend((suffix, entry_id) for suffix in _suffixes(normalized))
+            for gram in grams:
+                postings.setdefault(gram, set()).add(entry_id)
+        starts.sort()
+        word_starts.sort()
+        with self._lock:
+            self._names, self._starts, self._word_starts, self._postings = names, starts, word_starts, postings
+            self._loaded_at = self.timer()
+
+    def is_stale(self, max_age: float) -> bool:
+        """Whether the index was never loaded or was loaded over ``max_age`` seconds ago."""
+        with self._lock:
+            return self._loaded_at is None or self.timer() - self._loaded_at >= max_age
+
+    def clear(self) -> None:
+        """Empty the index and mark it for reloading."""
+        with self._lock:
+            self._names, self._starts, self._word_starts, self._postings = {}, [], [], {}
+            self._loaded_at = None
+
+    def add(self, entry_id: int, name: str) -> None:
+        """
+        Add a name, replacing any previous name for the same id.
+
+        Args:
+            entry_id: Entry ID
+            name: Display name
+        """
+        normalized = normalize_name(name)
+        grams = trigrams(normalized)
+        with self._lock:
+            self._discard(entry_id)
+            self._names[entry_id] = (name, normalized, grams)
+            insort(self._starts, (normalized, entry_id))
+            for suffix in _suffixes(normalized):
+                insort(self._word_starts, (suffix, entry_id))
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add(entry_id)
+
+    def remove(self, entry_id: int) -> None:
+        """
+        Remove a name if present.
+
+        Args:
+            entry_id: Entry ID
+        """
+        with self._lock:
+            self._discard(entry_id)
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, str]]:
+        """
+        Find the best matching names for a query.
+
+        Args:
+            query: Text typed so far
+            limit: Maximum results to return
+
+        Returns:
+            List of (id, name) pairs: name prefixes, then word prefixes,
+            each ordered by the matched text, then fuzzy matches, best first
+        """
+        normalized = normalize_name(query)
+        if not normalized or limit < 1:
+            return []
+
+        with self._lock:
+            found = []
+            seen = set()
+            for keys in (self._starts, self._word_starts):
+                position = bisect_left(keys, (normalized,))
+                while position < len(keys) and len(found) < limit:
+                    key, entry_id = keys[position]
+                    if not key.startswith(normalized):
+                        break
+                    if entry_id not in seen:
+                        seen.add(entry_id)
+                        found.append((entry_id, self._names[entry_id][0]))
+                    position += 1
+            if len(found) < limit:
+                found.extend(self._fuzzy(normalized, limit - len(found), seen))
+        return found
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._names)
+
+    def _fuzzy(self, normalized: str, limit: int, exclude: Set[int]) -> List[Tuple[int, str]]:
+        query_grams = trigrams(normalized)
+        need = max(1, math.ceil(self.min_similarity * len(query_grams)))
+
+        # A name sharing `need` trigrams must hold one of the rarest
+        # len - need + 1 of them, so common trigrams never widen the scan
+        rarest = sorted(query_grams, key=lambda gram: len(self._postings.get(gram, ())))
+        candidates = set()
+        for gram in rarest[:len(query_grams) - need + 1]:
+            candidates.update(self._postings.get(gram, ()))
+
+        ranked = []
+        for entry_id in candidates - exclude:
+            name, candidate, grams = self._names[entry_id]
+            common = len(query_grams & grams)
+            if common >= need:
+                ranked.append((normalized not in candidate, -common, candidate, entry_id, name))
+        return [(entry_id, name) for *_, entry_id, name in heapq.nsmallest(limit, ranked)]
+
+    def _discard(self, entry_id: int) -> None:
+        previous = self._names.pop(entry_id, None)
+        if previous is None:
+            return
+        _, normalized, grams = previous
+        for keys, key in [(self._starts, normalized)] + [(self._word_starts, s) for s in _suffixes(normalized)]:
+            position = bisect_left(keys, (key, entry_id))
+            if position < len(keys) and keys[position] == (key, entry_id):
+                del keys[position]
+        for gram in grams:
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(entry_id)
+                if not ids:
+                    del self._postings[gram]
@@ -5,11 +5,21 @@ This module provides functions for sending various types of notifications
 including event reminders, new research alerts, and submission status updates.
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-from sqlalchemy import and_
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any, Tuple
+from sqlalchemy import and_, case, union_all
+from sqlalchemy.exc import IntegrityError
 
-from models import db, User, Event, Research, NotificationLog
+from models import db, User, Event, Research, NotificationLog, NotificationCampaign, NotificationDailyStat
+from services.user_service import UserService
+from utils.constants import (
+    CAMPAIGN_STATUS_COMPLETED,
+    CAMPAIGN_STATUS_RUNNING,
+    EMAIL_DISPATCH_WORKERS,
+    NOTIFICATION_LOG_CHUNK_SIZE,
+    NOTIFICATION_PRUNE_CHUNK_SIZE,
+)
 
 
 def log_notification(
@@ -50,18 +60,302 @@ def log_notification(
     return log
 
 
-def send_event_reminder(event, user=None, send_email_func=None) -> int:
+class NotificationLogWriter:
+    """
+    Buffer NotificationLog rows and write them in bulk.
+
+    Rows are inserted with a single executemany per chunk instead of a
+    commit per recipient. Use it as a context manager so anything still
+    buffered is written when the block exits, even on error, unless the
+    error was a failed write. Tracked campaign progress is saved in the
+    same transaction as each chunk.
+    """
+
+    def __init__(self, chunk_size: int = NOTIFICATION_LOG_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.written = 0
+        self.write_seconds = 0.0
+        self._rows: List[Dict[str, Any]] = []
+        self._progress: List['CampaignProgress'] = []
+        self._write_error: Optional[BaseException] = None
+
+    def track(self, progress: 'CampaignProgress') -> None:
+        """Checkpoint a campaign's cursor whenever its log rows are written."""
+        self._progress.append(progress)
+
+    def untrack(self, progress: 'CampaignProgress') -> None:
+        self._progress.remove(progress)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is None or exc is not self._write_error:
+            self.flush()
+        return False
+
+    def add(
+        self,
+        user_id: Optional[int],
+        notification_type: str,
+        recipient_email: str,
+        subject: str,
+        reference_id: Optional[int] = None,
+        status: str = 'sent',
+        error_message: Optional[str] = None
+    ) -> None:
+        """
+        Buffer a log entry, writing the buffer once it reaches chunk_size.
+
+        Args:
+            user_id: User ID (can be None for bulk notifications)
+            notification_type: Type of notification
+            recipient_email: Email address sent to
+            subject: Email subject
+            reference_id: Optional reference ID (event_id, research_id, etc.)
+            status: 'sent' or 'failed'
+            error_message: Error details if failed
+        """
+        self._rows.append({
+            'user_id': user_id,
+            'notification_type': notification_type,
+            'reference_id': reference_id,
+            'recipient_email': recipient_email,
+            'subject': subject,
+            'sent_at': datetime.utcnow(),
+            'status': status,
+            'error_message': error_message
+        })
+        if len(self._rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write all buffered entries in one transaction.
+
+        The buffer is only cleared once the transaction commits. If the
+        write fails, the session is rolled back, the entries stay buffered
+        and the error is raised.
+
+        Returns:
+            int: Number of entries written
+        """
+        if not self._rows:
+            return 0
+
+        start = time.perf_counter()
+        try:
+            # A Core insert keeps the chunk in one executemany; the ORM bulk path
+            # would split it by which columns happen to be NULL
+            db.session.execute(NotificationLog.__table__.insert(), self._rows)
+            for progress in self._progress:
+                progress.checkpoint()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            self._write_error = e
+            raise
+        count = len(self._rows)
+        self._rows = []
+        self.write_seconds += time.perf_counter() - start
+        self.written += count
+        return count
+
+    @property
+    def rows_per_second(self) -> float:
+        """Write throughput across all flushes so far."""
+        if not self.write_seconds:
+            return 0.0
+        return self.written / self.write_seconds
+
+
+def start_campaign(notification_type: str, reference_id: int) -> NotificationCampaign:
+    """
+    Get the campaign for a notification, creating it on the first run.
+
+    Args:
+        notification_type: Type of notification, e.g. 'event_reminder'
+        reference_id: ID of the event, research, etc. being announced
+
+    Returns:
+        NotificationCampaign: The existing or newly created campaign
+    """
+    campaign = NotificationCampaign.query.filter_by(
+        notification_type=notification_type, reference_id=reference_id
+    ).first()
+    if campaign:
+        return campaign
+
+    try:
+        campaign = NotificationCampaign(
+            notification_type=notification_type,
+            reference_id=reference_id,
+            status=CAMPAIGN_STATUS_RUNNING
+        )
+        db.session.add(campaign)
+        db.session.commit()
+    except IntegrityError:
+        # Another run created it first
+        db.session.rollback()
+        campaign = NotificationCampaign.query.filter_by(
+            notification_type=notification_type, reference_id=reference_id
+        ).one()
+    return campaign
+
+
+class CampaignProgress:
+    """
+    Per-recipient cursor for one run of a campaign.
+
+    Recipients are issued in user ID order but, with concurrent dispatch,
+    finish out of order. The saved cursor is therefore the highest ID below
+    which every issued recipient has a recorded result; recipients past it
+    that were already sent are skipped on resume through NotificationLog.
+    """
+
+    def __init__(self, campaign: NotificationCampaign):
+        self.campaign_id = campaign.id
+        self.cursor = campaign.last_user_id
+        self._last_issued = campaign.last_user_id
+        self._in_flight = set()
+        self._sent = 0
+        self._failed = 0
+
+    def recipients(self, recipients: Iterable) -> Iterator:
+        """Pass recipients through, noting each one as in flight."""
+        for recipient in recipients:
+            self._in_flight.add(recipient.id)
+            self._last_issued = recipient.id
+            yield recipient
+
+    def record(self, user_id: int, success: bool) -> None:
+        """Note a recipient's result; call before logging it."""
+        self._in_flight.discard(user_id)
+        if success:
+            self._sent += 1
+        else:
+            self._failed += 1
+
+    def checkpoint(self) -> None:
+        """Stage the cursor and counters in the current transaction."""
+        cursor = min(self._in_flight) - 1 if self._in_flight else self._last_issued
+        self.cursor = max(self.cursor, cursor)
+        NotificationCampaign.query.filter_by(id=self.campaign_id).update({
+            'last_user_id': self.cursor,
+            'sent_count': NotificationCampaign.sent_count + self._sent,
+            'failed_count': NotificationCampaign.failed_count + self._failed,
+            'updated_at': datetime.utcnow()
+        }, synchronize_session=False)
+        self._sent = self._failed = 0
+
+    def complete(self) -> None:
+        """Save the final cursor and mark the campaign completed."""
+        self.checkpoint()
+        now = datetime.utcnow()
+        NotificationCampaign.query.filter_by(id=self.campaign_id).update({
+            'status': CAMPAIGN_STATUS_COMPLETED,
+            'completed_at': now
+        }, synchronize_session=False)
+        db.session.commit()
+
+
+def _send_each(recipients: Iterable, send: Callable) -> Iterator[Tuple[Any, bool, Optional[str]]]:
+    """Call send for each recipient in turn, turning exceptions into failures."""
+    for recipient in recipients:
+        try:
+            send(recipient)
+            yield recipient, True, None
+        except Exception as e:
+            yield recipient, False, str(e)
+
+
+def run_campaign(
+    notification_type: str,
+    reference_id: int,
+    subject: str,
+    criteria: List,
+    deliver: Callable[[Iterable], Iterator[Tuple[Any, bool, Optional[str]]]],
+    log_writer: NotificationLogWriter
+) -> int:
+    """
+    Send a notification to every matching user exactly once, resuming if interrupted.
+
+    A completed campaign is skipped. Otherwise recipients after the saved
+    cursor are streamed, minus anyone NotificationLog already records as
+    sent, and each result is logged.
+
+    Args:
+        notification_type: Type of notification
+        reference_id: ID of the event, research, etc.
+        subject: Subject recorded in the notification log
+        criteria: SQLAlchemy filters selecting the audience
+        deliver: Takes recipients and yields (recipient, success, error) tuples
+        log_writer: NotificationLogWriter for the results
+
+    Returns:
+        int: Count of notifications sent in this run
+    """
+    campaign = start_campaign(notification_type, reference_id)
+    if campaign.status == CAMPAIGN_STATUS_COMPLETED:
+        return 0
+
+    already_sent = db.session.query(NotificationLog.id).filter(
+        NotificationLog.notification_type == notification_type,
+        NotificationLog.reference_id == reference_id,
+        NotificationLog.user_id == User.id,
+        NotificationLog.status == 'sent'
+    ).exists()
+    recipients = UserService.iter_recipients(*criteria, User.id > campaign.last_user_id, ~already_sent)
+
+    progress = CampaignProgress(campaign)
+    log_writer.track(progress)
+    count = 0
+    try:
+        for user, success, error in deliver(progress.recipients(recipients)):
+            progress.record(user.id, success)
+            log_writer.add(
+                user_id=user.id,
+                notification_type=notification_type,
+                recipient_email=user.email,
+                subject=subject,
+                reference_id=reference_id,
+                status='sent' if success else 'failed',
+                error_message=error
+            )
+            count += success
+    finally:
+        # Record whatever was delivered, even on a crash, so a re-run resumes after it
+        try:
+            log_writer.flush()
+        finally:
+            log_writer.untrack(progress)
+    progress.complete()
+    return count
+
+
+def send_event_reminder(event, user=None, send_email_func=None, log_writer=None,
+                        max_workers=EMAIL_DISPATCH_WORKERS) -> int:
     """
     Send event reminder notification to users.
     
+    Without send_email_func, reminders to all opted-in users are rendered
+    and sent concurrently. Bulk sends run as a campaign that reaches each
+    user once; re-running after a crash resumes where it stopped.
+    
     Args:
         event: Event model instance or event_id
         user: Optional specific user (if None, sends to all opted-in users)
         send_email_func: Optional email function to use
+        log_writer: Optional NotificationLogWriter shared across calls
+        max_workers: Threads used for the campaign
         
     Returns:
         int: Count of notifications sent
     """
+    if log_writer is None:
+        with NotificationLogWriter() as log_writer:
+            return send_event_reminder(event, user, send_email_func, log_writer, max_workers)
+
     from utils.email_utils import send_event_reminder_email
     
     # Handle both Event object and ID
@@ -81,7 +375,7 @@ def send_event_reminder(event, user=None, send_email_func=None) -> int:
                 else:
                     send_event_reminder_email(user, event)
                 
-                log_notification(
+                log_writer.add(
                     user_id=user.id,
                     notification_type='event_reminder',
                     recipient_email=user.email,
@@ -91,7 +385,7 @@ def send_event_reminder(event, user=None, send_email_func=None) -> int:
                 )
                 count += 1
             except Exception as e:
-                log_notification(
+                log_writer.add(
                     user_id=user.id,
                     notification_type='event_reminder',
                     recipient_email=user.email,
@@ -101,88 +395,58 @@ def send_event_reminder(event, user=None, send_email_func=None) -> int:
                     error_message=str(e)
                 )
     else:
-        # Send to all opted-in users
-        users = User.query.filter_by(event_reminders_enabled=True).all()
-        for u in users:
-            try:
-                if send_email_func:
-                    send_email_func(u, event)
-                else:
-                    send_event_reminder_email(u, event)
-                
-                log_notification(
-                    user_id=u.id,
-                    notification_type='event_reminder',
-                    recipient_email=u.email,
-                    subject=f"Reminder: {event.title} - PSRA Event",
-                    reference_id=event.id,
-                    status='sent'
-                )
-                count += 1
-            except Exception as e:
-                log_notification(
-                    user_id=u.id,
-                    notification_type='event_reminder',
-                    recipient_email=u.email,
-                    subject=f"Reminder: {event.title} - PSRA Event",
-                    reference_id=event.id,
-                    status='failed',
-                    error_message=str(e)
-                )
+        # Send to all opted-in users once, resuming an interrupted run
+        if send_email_func:
+            deliver = lambda users: _send_each(users, lambda u: send_email_func(u, event))
+        else:
+            from utils.email_dispatch import event_reminder_campaign
+            deliver = event_reminder_campaign(event, max_workers=max_workers).send
+        count = run_campaign(
+            'event_reminder', event.id, f"Reminder: {event.title} - PSRA Event",
+            [User.event_reminders_enabled == True], deliver, log_writer
+        )
     
     return count
 
 
-def send_new_research_alert(research, send_email_func=None) -> int:
+def send_new_research_alert(research, send_email_func=None, log_writer=None,
+                            max_workers=EMAIL_DISPATCH_WORKERS) -> int:
     """
     Send new research publication alert to opted-in users.
     
+    Without send_email_func, alerts are rendered and sent concurrently.
+    Each user is alerted once per research; re-running after a crash
+    resumes where it stopped.
+    
     Args:
         research: Research model instance or research_id
         send_email_func: Optional email function to use (receives user and research)
+        log_writer: Optional NotificationLogWriter shared across calls
+        max_workers: Threads used for the campaign
         
     Returns:
         int: Count of notifications sent
     """
-    from utils.email_utils import send_new_research_email
-    
+    if log_writer is None:
+        with NotificationLogWriter() as log_writer:
+            return send_new_research_alert(research, send_email_func, log_writer, max_workers)
+
     # Handle both Research object and ID
     if isinstance(research, int):
         research = Research.query.get(research)
         if not research:
             return 0
     
-    count = 0
-    
-    # Send to all opted-in users
-    users = User.query.filter_by(new_research_alerts_enabled=True).all()
-    
-    for user in users:
-        try:
-            if send_email_func:
-                send_email_func(user, research)
-            else:
-                send_new_research_email(user, research)
-            
-            log_notification(
-                user_id=user.id,
-                notification_type='new_research',
-                recipient_email=user.email,
-                subject=f"New Research: {research.title[:50]}...",
-                reference_id=research.id,
-                status='sent'
-            )
-            count += 1
-        except Exception as e:
-            log_notification(
-                user_id=user.id,
-                notification_type='new_research',
-                recipient_email=user.email,
-                subject=f"New Research: {research.title[:50]}...",
-                reference_id=research.id,
-                status='failed',
-                error_message=str(e)
-            )
+    # Send to all opted-in users once, resuming an interrupted run
+    if send_email_func:
+        deliver = lambda users: _send_each(users, lambda u: send_email_func(u, research))
+    else:
+        from utils.email_dispatch import new_research_campaign
+        deliver = new_research_campaign(research, max_workers=max_workers).send
+    count = run_campaign(
+        'new_research', research.id, f"New Research: {research.title[:50]}...",
+        [User.new_research_alerts_enabled == True], deliver, log_writer
+    )
     
     return count
 
@@ -302,23 +566,31 @@ def get_upcoming_events_for_reminder(days_ahead: int = 1) -> List[Event]:
     ).all()
 
 
-def send_scheduled_event_reminders(send_email_func=None) -> int:
+def send_scheduled_event_reminders(send_email_func=None, log_writer=None,
+                                   max_workers=EMAIL_DISPATCH_WORKERS) -> int:
     """
     Send reminders for events happening tomorrow.
     This is intended to be run as a scheduled task.
     
     Args:
         send_email_func: Optional email function to use
+        log_writer: Optional NotificationLogWriter shared across events
+        max_workers: Threads used for each event's campaign
         
     Returns:
         int: Total count of notifications sent
     """
+    if log_writer is None:
+        with NotificationLogWriter() as log_writer:
+            return send_scheduled_event_reminders(send_email_func, log_writer, max_workers)
+
     events = get_upcoming_events_for_reminder(days_ahead=1)
     
     total_sent = 0
     
     for event in events:
-        count = send_event_reminder(event, send_email_func=send_email_func)
+        count = send_event_reminder(event, send_email_func=send_email_func, log_writer=log_writer,
+                                    max_workers=max_workers)
         total_sent += count
     
     return total_sent
@@ -343,24 +615,128 @@ def get_notification_history(user_id: Optional[int] = None, limit: int = 50) ->
     return query.order_by(NotificationLog.sent_at.desc()).limit(limit).all()
 
 
-def get_notification_stats() -> Dict[str, Any]:
+def get_notification_stats(now: Optional[datetime] = None) -> Dict[str, Any]:
     """
-    Get notification statistics.
+    Get notification statistics with a single grouped query.
+    
+    Every breakdown comes from one GROUP BY over (notification_type, status),
+    with the time windows computed as conditional aggregates. Raw log rows
+    and the daily rollup left behind by prune_notification_logs are grouped
+    separately and combined with UNION ALL, so both tables are read in one
+    statement however many figures are reported. Rolled-up days count
+    towards a window when the day falls inside it.
     
+    Args:
+        now: Reference time for the windows (defaults to utcnow)
+        
     Returns:
-        dict: Dictionary with notification statistics
+        dict: Totals, 'last_24_hours'/'last_7_days'/'last_30_days' counts,
+        and 'by_type', 'by_status' and 'by_type_status' breakdowns
     """
-    total_sent = NotificationLog.query.filter_by(status='sent').count()
-    total_failed = NotificationLog.query.filter_by(status='failed').count()
+    now = now or datetime.utcnow()
+    windows = {
+        'last_24_hours': now - timedelta(hours=24),
+        'last_7_days': now - timedelta(days=7),
+        'last_30_days': now - timedelta(days=30),
+    }
     
-    # By type
-    type_stats = db.session.query(
+    raw = db.select(
         NotificationLog.notification_type,
-        db.func.count(NotificationLog.id)
-    ).group_by(NotificationLog.notification_type).all()
-    
-    return {
-        'total_sent': total_sent,
-        'total_failed': total_failed,
-        'by_type': dict(type_stats)
-    }
\ No newline at end of file
+        NotificationLog.status,
+        db.func.count(NotificationLog.id),
+        *[db.func.sum(case((NotificationLog.sent_at >= since, 1), else_=0)) for since in windows.values()]
+    ).group_by(NotificationLog.notification_type, NotificationLog.status)
+    rolled_up = db.select(
+        NotificationDailyStat.notification_type,
+        NotificationDailyStat.status,
+        db.func.sum(NotificationDailyStat.count),
+        *[db.func.sum(case((NotificationDailyStat.day >= since.date(), NotificationDailyStat.count), else_=0))
+          for since in windows.values()]
+    ).group_by(NotificationDailyStat.notification_type, NotificationDailyStat.status)
+    rows = db.session.execute(union_all(raw, rolled_up)).all()
+    
+    stats = {
+        'total': 0,
+        'by_type': {},
+        'by_status': {},
+        'by_type_status': {},
+        **{name: 0 for name in windows}
+    }
+    for notification_type, status, count, *window_counts in rows:
+        stats['total'] += count
+        stats['by_type'][notification_type] = stats['by_type'].get(notification_type, 0) + count
+        stats['by_status'][status] = stats['by_status'].get(status, 0) + count
+        by_status = stats['by_type_status'].setdefault(notification_type, {})
+        by_status[status] = by_status.get(status, 0) + count
+        for name, window_count in zip(windows, window_counts):
+            stats[name] += window_count or 0
+    
+    stats['total_sent'] = stats['by_status'].get('sent', 0)
+    stats['total_failed'] = stats['by_status'].get('failed', 0)
+    return stats
+
+
+def prune_notification_logs(older_than_days: int,
+                            chunk_size: int = NOTIFICATION_PRUNE_CHUNK_SIZE,
+                            now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Roll old notification log rows into daily counts and delete them.
+    
+    Rows sent before midnight ``older_than_days`` days ago are processed
+    oldest first, ``chunk_size`` at a time. Each chunk is counted by
+    (day, notification_type, status), added to NotificationDailyStat and
+    deleted in the same transaction, so an interrupted run never loses or
+    double counts rows and can simply be started again.
+    
+    Args:
+        older_than_days: Keep raw rows from this many most recent days
+        chunk_size: Rows rolled up and deleted per transaction
+        now: Reference time for the cutoff (defaults to utcnow)
+        
+    Returns:
+        dict: 'deleted' rows, 'chunks' committed and rollup 'days' touched
+    """
+    now = now or datetime.utcnow()
+    cutoff = datetime.combine((now - timedelta(days=older_than_days)).date(), datetime.min.time())
+    day = db.func.date(NotificationLog.sent_at)
+    result = {'deleted': 0, 'chunks': 0, 'days': 0}
+    days = set()
+    
+    while True:
+        last_id = db.session.query(NotificationLog.id).filter(
+            NotificationLog.sent_at < cutoff
+        ).order_by(NotificationLog.id).offset(chunk_size - 1).limit(1).scalar()
+        # The final chunk is shorter than chunk_size: take everything left
+        chunk = [NotificationLog.sent_at < cutoff]
+        if last_id is not None:
+            chunk.append(NotificationLog.id <= last_id)
+        
+        counts = db.session.query(
+            day, NotificationLog.notification_type, NotificationLog.status, db.func.count(NotificationLog.id)
+        ).filter(*chunk).group_by(day, NotificationLog.notification_type, NotificationLog.status).all()
+        if not counts:
+            break
+        
+        for sent_on, notification_type, status, count in counts:
+            # SQLite returns date() as an ISO string
+            if isinstance(sent_on, str):
+                sent_on = date.fromisoformat(sent_on)
+            stat = NotificationDailyStat.query.filter_by(
+                day=sent_on, notification_type=notification_type, status=status
+            ).first()
+            if stat is None:
+                stat = NotificationDailyStat(day=sent_on, notification_type=notification_type,
+                                             status=status, count=0)
+                db.session.add(stat)
+            stat.count += count
+            days.add(sent_on)
+        
+        result['deleted'] += NotificationLog.query.filter(*chunk).delete(synchronize_session=False)
+        result['chunks'] += 1
+        db.session.commit()
+        
+        if last_id is None:
+            break
+    
+    result['days'] = len(days)
+    return result
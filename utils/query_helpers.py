@@ -5,8 +5,11 @@ Provides common database query patterns to reduce duplicate code
 across the application.
 """
 
-from typing import List, Optional, Type, TypeVar
+from datetime import datetime
+from typing import List, Optional, Tuple, Type, TypeVar
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import and_, insert, or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Query
 
 T = TypeVar('T')
@@ -65,6 +68,77 @@ def paginate_query(query: Query, page: int, per_page: int = 20, error_out: bool
     return query.paginate(page=page, per_page=per_page, error_out=error_out)
 
 
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """
+    Encode a keyset pagination cursor from a row's timestamp and ID.
+    
+    Args:
+        created_at: Timestamp of the last row on the current page
+        item_id: ID of the last row on the current page
+    
+    Returns:
+        Opaque cursor string safe to pass in a query string
+    """
+    return f"{created_at.isoformat()}_{item_id}"
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Args:
+        cursor: Cursor string from the client (may be None or malformed)
+    
+    Returns:
+        (created_at, item_id) tuple, or None if the cursor is missing or invalid
+    """
+    if not cursor:
+        return None
+    try:
+        created_at, item_id = cursor.rsplit('_', 1)
+        return datetime.fromisoformat(created_at), int(item_id)
+    except ValueError:
+        return None
+
+
+def keyset_before(created_column, id_column, created_at: datetime, item_id: int):
+    """
+    Build a filter selecting rows strictly older than a (created_at, id) position.
+    
+    Args:
+        created_column: Timestamp column the query is ordered by
+        id_column: Primary key column used as the tie-breaker
+        created_at: Timestamp of the cursor row
+        item_id: ID of the cursor row
+    
+    Returns:
+        SQLAlchemy boolean expression
+    """
+    return or_(
+        created_column < created_at,
+        and_(created_column == created_at, id_column < item_id)
+    )
+
+
+def keyset_after(created_column, id_column, created_at: datetime, item_id: int):
+    """
+    Build a filter selecting rows strictly newer than a (created_at, id) position.
+    
+    Args:
+        created_column: Timestamp column the query is ordered by
+        id_column: Primary key column used as the tie-breaker
+        created_at: Timestamp of the cursor row
+        item_id: ID of the cursor row
+    
+    Returns:
+        SQLAlchemy boolean expression
+    """
+    return or_(
+        created_column > created_at,
+        and_(created_column == created_at, id_column > item_id)
+    )
+
+
 def search_query(query: Query, model, search_term: str, *fields) -> Query:
     """
     Apply a search filter to a query across multiple fields.
@@ -171,3 +245,39 @@ def delete_conversation_messages(db: SQLAlchemy, Message, user_id: int, other_us
     ).delete()
     db.session.commit()
     return result
+
+
+def insert_ignoring_conflict(session, model, values: dict, conflict_columns: List[str]) -> Optional[int]:
+    """
+    Insert a row unless it would violate a unique key, in one statement.
+    
+    Uses ``INSERT ... ON CONFLICT DO NOTHING RETURNING id``, supported by
+    both SQLite and PostgreSQL, so concurrent inserts of the same key never
+    raise an IntegrityError. Other databases get a plain insert inside a
+    savepoint, rolled back if the key already exists.
+    
+    Args:
+        session: SQLAlchemy session to execute in
+        model: Model class to insert into
+        values: Column values of the new row
+        conflict_columns: Columns of the unique key that may conflict
+    
+    Returns:
+        ID of the inserted row, or None if the key already existed
+    """
+    dialect = session.get_bind(mapper=model).dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        try:
+            with session.begin_nested():
+                return session.execute(insert(model).values(**values)).inserted_primary_key[0]
+        except IntegrityError:
+            return None
+    
+    statement = dialect_insert(model).values(**values).on_conflict_do_nothing(
+        index_elements=conflict_columns
+    ).returning(model.id)
+    return session.execute(statement).scalar()
@@ -0,0 +1,468 @@
+"""
+Search Index Module
+
+Full-text search indexes kept beside the regular tables. On SQLite each
+index is an FTS5 virtual table; on PostgreSQL it is a table of weighted
+``tsvector`` documents with a GIN index. Other databases have no index and
+callers fall back to substring matching.
+
+Indexes are created with the schema (``db.create_all`` and migrations) and
+kept in sync from SQLAlchemy mapper events, inside the flush that changes
+the indexed rows.
+"""
+
+import html
+import re
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+
+from markupsafe import Markup
+from sqlalchemy import Float, Integer, bindparam, event, inspect, text
+
+from models import db, Research, Researcher, Post, Comment
+
+
+# Relative weight of each field, highest first (PostgreSQL weight labels)
+_WEIGHTS = {'A': 10.0, 'B': 4.0, 'C': 2.0, 'D': 1.0}
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+# Endings trimmed from query words so highlighting matches the indexed stems
+# ("studies" and "studying" both keep "stud"); longest first
+_SUFFIXES = ('ations', 'ation', 'ments', 'ment', 'ings', 'ing', 'ies', 'ied', 'ers', 'er', 'es', 'ed', 'ly', 's', 'y', 'e')
+_MIN_STEM = 3
+
+
+def search_terms(query: str) -> List[str]:
+    """
+    Split a user query into lowercase word tokens.
+
+    Everything except letters, digits and underscores is dropped, so the
+    tokens are safe to place in FTS5 and tsquery syntax.
+
+    Args:
+        query: Raw search text
+
+    Returns:
+        List of tokens
+    """
+    return [token.lower() for token in _TOKEN.findall(query or '')]
+
+
+def search_stems(query: str) -> List[str]:
+    """
+    Trim each query token to an approximate English stem.
+
+    The index stems words (Porter in FTS5, the english configuration in
+    PostgreSQL), so a query word also finds its other forms. Text words
+    starting with a returned stem are treated as matches.
+
+    Args:
+        query: Raw search text
+
+    Returns:
+        List of stems, in query order
+    """
+    stems = []
+    for term in search_terms(query):
+        for suffix in _SUFFIXES:
+            if term.endswith(suffix) and len(term) - len(suffix) >= _MIN_STEM:
+                term = term[:-len(suffix)]
+                # "running" -> "runn" -> "run"
+                if (suffix in ('ing', 'ed', 'er') and term[-1] == term[-2]
+                        and term[-1] not in 'aeioulsz' and len(term) > _MIN_STEM):
+                    term = term[:-1]
+                # "studying" -> "study" -> "stud", as "studies" -> "stud"
+                if term[-1] == 'y' and term[-2] not in 'aeiou' and len(term) > _MIN_STEM:
+                    term = term[:-1]
+                break
+        stems.append(term)
+    return stems
+
+
+def _term_matches(content: str, stems: List[str]) -> List[re.Match]:
+    return [match for match in _TOKEN.finditer(content or '')
+            if any(match.group().lower().startswith(stem) for stem in stems)]
+
+
+def has_match(content: str, query: str) -> bool:
+    """
+    Check whether text contains a word matching the query.
+
+    Words are matched on their stem, as in highlight.
+
+    Args:
+        content: Text to check
+        query: Raw search text
+
+    Returns:
+        True if highlight would mark something in the text
+    """
+    return bool(_term_matches(content, search_stems(query)))
+
+
+def highlight(content: str, query: str, size: int = 200) -> Markup:
+    """
+    Cut an HTML-safe excerpt around the first query match and mark every match.
+
+    Words are matched on their stem, as the index matches them.
+
+    Args:
+        content: Text to excerpt
+        query: Raw search text
+        size: Approximate excerpt length in characters
+
+    Returns:
+        Escaped excerpt with matches wrapped in ``<mark>``
+    """
+    content = content or ''
+    matches = _term_matches(content, search_stems(query))
+
+    start = 0
+    if matches and matches[0].start() > size // 3:
+        start = content.rfind(' ', 0, matches[0].start() - size // 3) + 1
+    end = len(content)
+    if end - start > size:
+        end = content.rfind(' ', start, start + size)
+        if end <= start:
+            end = start + size
+
+    pieces, position = [], start
+    for match in matches:
+        if match.start() < start:
+            continue
+        if match.end() > end:
+            break
+        pieces.append(html.escape(content[position:match.start()]))
+        pieces.append(f'<mark>{html.escape(match.group())}</mark>')
+        position = match.end()
+    pieces.append(html.escape(content[position:end]))
+    return Markup(('…' if start else '') + ''.join(pieces) + ('…' if end < len(content) else ''))
+
+
+class SearchIndex:
+    """
+    Full-text index over the rows produced by a source query.
+
+    Args:
+        table: Name of the index table
+        fields: (column, weight) pairs in the source, weight 'A' to 'D'
+        source: SELECT returning ``id`` and every field column, or a
+            function building it for a backend name
+        parent: Source column holding the ID that hits are reported under,
+            when several indexed rows belong to one result (default: the
+            row's own ID)
+    """
+
+    def __init__(
+        self,
+        table: str,
+        fields: List[Tuple[str, str]],
+        source: Union[str, Callable[[str], str]],
+        parent: Optional[str] = None
+    ):
+        self.table = table
+        self.fields = fields
+        self.source = source
+        self.parent = parent
+
+    @staticmethod
+    def backend(connection) -> Optional[str]:
+        name = connection.dialect.name
+        return name if name in ('sqlite', 'postgresql') else None
+
+    def source_sql(self, backend: str) -> str:
+        """The source SELECT for a backend."""
+        return self.source(backend) if callable(self.source) else self.source
+
+    def create(self, connection) -> None:
+        """Create the index table if the database supports full-text search."""
+        backend = self.backend(connection)
+        if backend == 'sqlite':
+            columns = [column for column, _ in self.fields]
+            if self.parent:
+                columns.append(f'{self.parent} UNINDEXED')
+            connection.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} "
+                f"USING fts5({', '.join(columns)}, tokenize='porter unicode61')"
+            ))
+        elif backend == 'postgresql':
+            parent = f'{self.parent} INTEGER NOT NULL, ' if self.parent else ''
+            connection.execute(text(
+                f'CREATE TABLE IF NOT EXISTS {self.table} '
+                f'(id INTEGER PRIMARY KEY, {parent}document TSVECTOR NOT NULL)'
+            ))
+            connection.execute(text(
+                f'CREATE INDEX IF NOT EXISTS ix_{self.table}_document ON {self.table} USING GIN (document)'
+            ))
+
+    def drop(self, connection) -> None:
+        """Drop the index table."""
+        if self.backend(connection):
+            connection.execute(text(f'DROP TABLE IF EXISTS {self.table}'))
+
+    def refresh(self, connection, ids: Optional[Iterable[int]] = None) -> None:
+        """
+        Re-index source rows, or every row when ``ids`` is None.
+
+        Args:
+            connection: Connection in the transaction that changed the rows
+            ids: Source row IDs to re-index
+        """
+        backend = self.backend(connection)
+        if not backend:
+            return
+        if ids is not None:
+            ids = list(ids)
+            if not ids:
+                return
+
+        where, params = '', {}
+        if ids is not None:
+            where, params = 'WHERE src.id IN :ids', {'ids': ids}
+        self.remove(connection, ids)
+        parent = [self.parent] if self.parent else []
+
+        if backend == 'sqlite':
+            columns = [column for column, _ in self.fields] + parent
+            statement = text(
+                f'INSERT INTO {self.table} (rowid, {", ".join(columns)}) '
+                f'SELECT src.id, {", ".join(f"src.{column}" for column in columns)} '
+                f'FROM ({self.source_sql(backend)}) AS src {where}'
+            )
+        else:
+            document = ' || '.join(
+                f"setweight(to_tsvector('english', coalesce(src.{column}, '')), '{weight}')"
+                for column, weight in self.fields
+            )
+            statement = text(
+                f'INSERT INTO {self.table} (id, {"".join(f"{column}, " for column in parent)}document) '
+                f'SELECT src.id, {"".join(f"src.{column}, " for column in parent)}{document} '
+                f'FROM ({self.source_sql(backend)}) AS src {where}'
+            )
+        if ids is not None:
+            statement = statement.bindparams(bindparam('ids', expanding=True))
+        connection.execute(statement, params)
+
+    def remove(self, connection, ids: Optional[Iterable[int]] = None) -> None:
+        """
+        Drop rows from the index, or every row when ``ids`` is None.
+
+        Args:
+            connection: Connection in the transaction that changed the rows
+            ids: Source row IDs to remove
+        """
+        backend = self.backend(connection)
+        if not backend:
+            return
+        key = 'rowid' if backend == 'sqlite' else 'id'
+        if ids is None:
+            connection.execute(text(f'DELETE FROM {self.table}'))
+            return
+        statement = text(f'DELETE FROM {self.table} WHERE {key} IN :ids').bindparams(
+            bindparam('ids', expanding=True)
+        )
+        connection.execute(statement, {'ids': list(ids)})
+
+    def search(self, query: str):
+        """
+        Build a subquery of matching row IDs and relevance scores.
+
+        Every token must match, as a word prefix, in some field of one
+        indexed row. Higher scores are better matches; with a parent
+        column, the scores of a parent's matching rows are added up.
+
+        Args:
+            query: Raw search text
+
+        Returns:
+            Subquery with ``id`` and ``score`` columns, or None when the
+            database has no full-text index or the query has no words
+        """
+        terms = search_terms(query)
+        backend = self.backend(db.session.connection())
+        if not terms or not backend:
+            return None
+
+        hits = self.hits_sql(backend, 'match')
+        if self.parent:
+            hits = f'SELECT id, SUM(score) AS score FROM ({hits}) AS matches GROUP BY id'
+        statement = text(hits).bindparams(match=self.match_expression(backend, terms))
+        return statement.columns(id=Integer, score=Float).subquery(f'{self.table}_hits')
+
+    def hits_sql(self, backend: str, param: str) -> str:
+        """A SELECT of ``id`` and ``score`` for rows matching the ``param`` expression."""
+        if backend == 'sqlite':
+            weights = ', '.join(str(_WEIGHTS[weight]) for _, weight in self.fields)
+            return (
+                f'SELECT {self.parent or "rowid"} AS id, -bm25({self.table}, {weights}) AS score '
+                f'FROM {self.table} WHERE {self.table} MATCH :{param}'
+            )
+        return (
+            f"SELECT {self.parent or 'id'} AS id, ts_rank(document, to_tsquery('english', :{param})) AS score "
+            f"FROM {self.table} WHERE document @@ to_tsquery('english', :{param})"
+        )
+
+    @staticmethod
+    def match_expression(backend: str, terms: List[str]) -> str:
+        """The MATCH or tsquery text requiring every term as a word prefix."""
+        if backend == 'sqlite':
+            return ' '.join(f'"{term}"*' for term in terms)
+        return ' & '.join(f'{term}:*' for term in terms)
+
+
+def search_together(query: str, indexes: List[SearchIndex]):
+    """
+    Build a subquery of IDs matching a query across several indexes.
+
+    Each token must match, as a word prefix, in some row of one of the
+    indexes reported under the ID, so a post matches when one word is in
+    its title and another in a comment. An ID's score adds up the scores
+    of its matching rows.
+
+    Args:
+        query: Raw search text
+        indexes: Indexes reporting hits under the same IDs
+
+    Returns:
+        Subquery with ``id`` and ``score`` columns, or None when the
+        database has no full-text index or the query has no words
+    """
+    terms = search_terms(query)
+    backend = SearchIndex.backend(db.session.connection())
+    if not terms or not backend:
+        return None
+
+    selects, params = [], {}
+    for position, term in enumerate(terms):
+        for index in indexes:
+            param = f'match_{len(params)}'
+            selects.append(f'SELECT id, score, {position} AS term FROM ({index.hits_sql(backend, param)}) AS {param}')
+            params[param] = index.match_expression(backend, [term])
+    statement = text(
+        f'SELECT id, SUM(score) AS score FROM ({" UNION ALL ".join(selects)}) AS hits '
+        f'GROUP BY id HAVING COUNT(DISTINCT term) = {len(terms)}'
+    ).bindparams(**params)
+    return statement.columns(id=Integer, score=Float).subquery(f'{indexes[0].table}_hits')
+
+
+RESEARCH_INDEX = SearchIndex(
+    'research_search',
+    [('title', 'A'), ('researcher_name', 'B')],
+    'SELECT research.id AS id, research.title AS title, researcher.name AS researcher_name '
+    'FROM research JOIN researcher ON researcher.id = research.researcher_id',
+)
+
+FORUM_INDEX = SearchIndex(
+    'forum_search',
+    [('title', 'A'), ('content', 'B')],
+    'SELECT post.id AS id, post.title AS title, post.content AS content FROM post',
+)
+
+# One row per comment, so adding a comment never re-reads its thread;
+# hits are grouped under the post (see search_together)
+COMMENT_INDEX = SearchIndex(
+    'comment_search',
+    [('content', 'C')],
+    'SELECT comment.id AS id, comment.post_id AS post_id, comment.content AS content FROM comment',
+    parent='post_id',
+)
+
+SEARCH_INDEXES = [RESEARCH_INDEX, FORUM_INDEX, COMMENT_INDEX]
+
+
+def is_search_table(name: str) -> bool:
+    """Whether a table belongs to a search index (including FTS5 shadow tables)."""
+    return any(name == index.table or name.startswith(f'{index.table}_') for index in SEARCH_INDEXES)
+
+
+def rebuild_search_indexes(tables: Optional[Iterable[str]] = None) -> int:
+    """
+    Re-index search indexes from their source tables.
+
+    Args:
+        tables: Names of the index tables to rebuild (None for all)
+
+    Returns:
+        Number of indexes rebuilt (0 when the database has no full-text support)
+    """
+    connection = db.session.connection()
+    if not SearchIndex.backend(connection):
+        return 0
+    indexes = [index for index in SEARCH_INDEXES if tables is None or index.table in tables]
+    for index in indexes:
+        index.create(connection)
+        index.refresh(connection)
+    db.session.commit()
+    return len(indexes)
+
+
+@event.listens_for(db.metadata, 'after_create')
+def _create_search_indexes(target, connection, **kw):
+    for index in SEARCH_INDEXES:
+        index.create(connection)
+
+
+@event.listens_for(db.metadata, 'before_drop')
+def _drop_search_indexes(target, connection, **kw):
+    for index in SEARCH_INDEXES:
+        index.drop(connection)
+
+
+def _changed(target, *attributes: str) -> bool:
+    state = inspect(target)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+
+@event.listens_for(Research, 'after_insert')
+def _index_new_research(mapper, connection, target):
+    RESEARCH_INDEX.refresh(connection, [target.id])
+
+
+@event.listens_for(Research, 'after_update')
+def _reindex_research(mapper, connection, target):
+    if _changed(target, 'title', 'researcher_id'):
+        RESEARCH_INDEX.refresh(connection, [target.id])
+
+
+@event.listens_for(Research, 'after_delete')
+def _unindex_research(mapper, connection, target):
+    RESEARCH_INDEX.remove(connection, [target.id])
+
+
+@event.listens_for(Researcher, 'after_update')
+def _reindex_researcher_papers(mapper, connection, target):
+    if _changed(target, 'name'):
+        ids = connection.execute(
+            db.select(Research.id).where(Research.researcher_id == target.id)
+        ).scalars().all()
+        RESEARCH_INDEX.refresh(connection, ids)
+
+
+@event.listens_for(Post, 'after_insert')
+def _index_new_post(mapper, connection, target):
+    FORUM_INDEX.refresh(connection, [target.id])
+
+
+@event.listens_for(Post, 'after_update')
+def _reindex_post(mapper, connection, target):
+    if _changed(target, 'title', 'content'):
+        FORUM_INDEX.refresh(connection, [target.id])
+
+
+@event.listens_for(Post, 'after_delete')
+def _unindex_post(mapper, connection, target):
+    FORUM_INDEX.remove(connection, [target.id])
+
+
+@event.listens_for(Comment, 'after_insert')
+def _index_new_comment(mapper, connection, target):
+    COMMENT_INDEX.refresh(connection, [target.id])
+
+
+@event.listens_for(Comment, 'after_update')
+def _reindex_comment(mapper, connection, target):
+    if _changed(target, 'content', 'post_id'):
+        COMMENT_INDEX.refresh(connection, [target.id])
+
+
+@event.listens_for(Comment, 'after_delete')
+def _unindex_comment(mapper, connection, target):
+    COMMENT_INDEX.remove(connection, [target.id])
@@ -0,0 +1,120 @@
+"""
+Socket.IO Message Queue Module
+
+Cross-process fan-out for Socket.IO emits. Every worker process publishes
+its emits to a shared queue and replays everything published by the other
+workers, so ``emit(..., room=...)`` reaches sockets held by any worker.
+
+The default backend is a SQLite file on local disk, which needs no extra
+services and suits several workers on one host. Redis can be used instead
+for multi-host deployments.
+"""
+
+import os
+import pickle
+import sqlite3
+import time
+from contextlib import closing
+from typing import Any, Optional
+
+import socketio
+
+
+class SQLiteQueueManager(socketio.PubSubManager):
+    """
+    Socket.IO client manager that uses a SQLite table as its pub/sub channel.
+
+    Publishing appends a row; each process polls for rows newer than the
+    last one it has seen. Rows older than ``retention`` seconds are pruned
+    by publishers, so the file stays small.
+    """
+    name = 'sqlite'
+
+    def __init__(self, path: str, channel: str = 'socketio', write_only: bool = False,
+                 logger: Any = None, poll_interval: float = 0.05, retention: float = 60):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._publish_count = 0
+        self._create_table()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10, isolation_level=None)
+
+    def _create_table(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS socketio_queue ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                'channel TEXT NOT NULL, '
+                'payload BLOB NOT NULL, '
+                'created_at REAL NOT NULL)'
+            )
+
+    def _publish(self, data):
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                'INSERT INTO socketio_queue (channel, payload, created_at) VALUES (?, ?, ?)',
+                (self.channel, pickle.dumps(data), now)
+            )
+            self._publish_count += 1
+            if self._publish_count % 100 == 0:
+                conn.execute('DELETE FROM socketio_queue WHERE created_at < ?', (now - self.retention,))
+
+    def _listen(self):
+        with closing(self._connect()) as conn:
+            # Only deliver messages published after this process started listening
+            last_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM socketio_queue').fetchone()[0]
+            while True:
+                try:
+                    rows = conn.execute(
+                        'SELECT id, payload FROM socketio_queue WHERE id > ? AND channel = ? ORDER BY id',
+                        (last_id, self.channel)
+                    ).fetchall()
+                except sqlite3.OperationalError:
+                    self._get_logger().exception('Cannot read from the socketio queue')
+                    rows = []
+
+                for row_id, payload in rows:
+                    last_id = row_id
+                    yield payload
+
+                if not rows:
+                    self.server.sleep(self.poll_interval)
+
+
+def create_client_manager(app) -> Optional[socketio.PubSubManager]:
+    """
+    Build the Socket.IO client manager configured by SOCKETIO_MESSAGE_QUEUE.
+
+    Supported values are ``sqlite:///<path>`` (relative paths resolve
+    against the instance folder), ``redis://...`` and an empty value, which
+    keeps Socket.IO's single-process manager.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        A client manager instance, or None for the single-process default
+    """
+    url = app.config.get('SOCKETIO_MESSAGE_QUEUE')
+    if not url:
+        return None
+
+    if url.startswith('sqlite:///'):
+        path = url[len('sqlite:///'):]
+        if not os.path.isabs(path):
+            path = os.path.join(app.instance_path, path)
+        return SQLiteQueueManager(path)
+
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        # Requires the optional `redis` package
+        return socketio.RedisManager(url)
+
+    raise ValueError(f'Unsupported SOCKETIO_MESSAGE_QUEUE: {url}')
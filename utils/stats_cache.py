@@ -0,0 +1,228 @@
+"""
+Stats Cache Module
+
+Caches the site-wide counters shown on the home page. Entries expire after
+STATS_CACHE_TTL seconds and are dropped as soon as a commit inserts or
+deletes a row they count, via SQLAlchemy mapper events.
+
+The backend is chosen by STATS_CACHE_URL:
+
+* empty (default): a per-process cache. Invalidation only reaches the
+  worker that made the change, so other workers may serve counts up to
+  the TTL old; keep the TTL short.
+* ``sqlite:///<path>``: a small SQLite file shared by every worker on the
+  host, so invalidation is seen everywhere at once.
+* ``redis://...``: a Redis server, for multi-host deployments.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Any, Dict, Optional
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from models import db, User, Research, Event, University
+from utils.ttl_cache import TTLCache
+
+
+HOME_STATS_KEY = 'home_stats'
+
+# Models counted on the home page, with the column whose updates change the count
+_COUNTED_MODELS = {
+    User: None,
+    Research: 'is_approved',
+    Event: None,
+    University: 'is_active',
+}
+
+
+class LocalStatsCache:
+    """Per-process backend; each worker keeps and invalidates its own copy."""
+
+    def __init__(self, ttl: float):
+        self._cache = TTLCache(maxsize=64, ttl=ttl)
+
+    def get(self, key: str) -> Optional[Any]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        self._cache.set(key, value)
+
+    def delete(self, key: str) -> None:
+        self._cache.pop(key)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+class SQLiteStatsCache:
+    """Backend shared by every worker on one host through a SQLite file."""
+
+    def __init__(self, path: str, ttl: float):
+        self.path = path
+        self.ttl = ttl
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS stats_cache ('
+                'key TEXT PRIMARY KEY, '
+                'value TEXT NOT NULL, '
+                'expires_at REAL NOT NULL)'
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10, isolation_level=None)
+
+    def get(self, key: str) -> Optional[Any]:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                'SELECT value FROM stats_cache WHERE key = ? AND expires_at > ?', (key, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO stats_cache (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, json.dumps(value), time.time() + self.ttl)
+            )
+
+    def delete(self, key: str) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute('DELETE FROM stats_cache WHERE key = ?', (key,))
+
+    def clear(self) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute('DELETE FROM stats_cache')
+
+
+class RedisStatsCache:
+    """Backend shared across hosts through Redis."""
+
+    def __init__(self, url: str, ttl: float, prefix: str = 'stats_cache:'):
+        # Requires the optional `redis` package
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._redis.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, value: Any) -> None:
+        self._redis.set(self.prefix + key, json.dumps(value), ex=max(1, int(self.ttl)))
+
+    def delete(self, key: str) -> None:
+        self._redis.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        keys = list(self._redis.scan_iter(match=self.prefix + '*'))
+        if keys:
+            self._redis.delete(*keys)
+
+
+def create_stats_cache(app):
+    """
+    Build the stats cache backend configured by STATS_CACHE_URL.
+
+    Relative ``sqlite:///`` paths resolve against the instance folder.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        A stats cache backend
+    """
+    url = app.config.get('STATS_CACHE_URL')
+    ttl = app.config.get('STATS_CACHE_TTL', 60)
+    if not url:
+        return LocalStatsCache(ttl)
+
+    if url.startswith('sqlite:///'):
+        path = url[len('sqlite:///'):]
+        if not os.path.isabs(path):
+            path = os.path.join(app.instance_path, path)
+        return SQLiteStatsCache(path, ttl)
+
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisStatsCache(url, ttl)
+
+    raise ValueError(f'Unsupported STATS_CACHE_URL: {url}')
+
+
+def init_stats_cache(app) -> None:
+    """
+    Attach the configured stats cache to the app and register invalidation hooks.
+
+    Args:
+        app: Flask application instance
+    """
+    app.extensions['stats_cache'] = create_stats_cache(app)
+    if not event.contains(Session, 'after_commit', _invalidate_after_commit):
+        for model, column in _COUNTED_MODELS.items():
+            event.listen(model, 'after_insert', _mark_stale)
+            event.listen(model, 'after_delete', _mark_stale)
+            if column:
+                event.listen(model, 'after_update', _mark_stale_if_changed(column))
+        event.listen(Session, 'after_commit', _invalidate_after_commit)
+
+
+def get_home_stats() -> Dict[str, int]:
+    """
+    Get the home page counters, from the cache when fresh.
+
+    On a miss all four counts are read in one statement.
+
+    Returns:
+        dict: active_members_count, research_pubs_count,
+        events_hosted_count and partner_unis_count
+    """
+    cache = current_app.extensions['stats_cache']
+    stats = cache.get(HOME_STATS_KEY)
+    if stats is None:
+        row = db.session.query(
+            db.session.query(db.func.count(User.id)).scalar_subquery(),
+            db.session.query(db.func.count(Research.id)).filter(Research.is_approved.is_(True)).scalar_subquery(),
+            db.session.query(db.func.count(Event.id)).scalar_subquery(),
+            db.session.query(db.func.count(University.id)).filter(University.is_active.is_(True)).scalar_subquery(),
+        ).one()
+        stats = dict(zip(
+            ('active_members_count', 'research_pubs_count', 'events_hosted_count', 'partner_unis_count'), row
+        ))
+        cache.set(HOME_STATS_KEY, stats)
+    return stats
+
+
+def invalidate_home_stats() -> None:
+    """Drop the cached home page counters."""
+    current_app.extensions['stats_cache'].delete(HOME_STATS_KEY)
+
+
+def _mark_stale(mapper, connection, target) -> None:
+    # Flush happens before commit; invalidating now would let another request
+    # re-cache the old counts before this transaction is visible
+    session = object_session(target)
+    if session is not None:
+        session.info['home_stats_stale'] = True
+
+
+def _mark_stale_if_changed(column: str):
+    def listener(mapper, connection, target):
+        if inspect(target).attrs[column].history.has_changes():
+            _mark_stale(mapper, connection, target)
+    return listener
+
+
+def _invalidate_after_commit(session) -> None:
+    if session.info.pop('home_stats_stale', False) and has_app_context():
+        invalidate_home_stats()
@@ -0,0 +1,109 @@
+"""
+TTL Cache Module
+
+A small thread-safe in-process cache with per-entry expiry and a hard
+size cap, for state that must not grow without bound in long-lived
+workers.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Bounded mapping whose entries expire ``ttl`` seconds after they are set.
+
+    When the cache is full, the least recently set entry is evicted first.
+    Expired entries are dropped lazily on access, and from the oldest end
+    when making room, so a full cache never scans every entry.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a value if present and not expired.
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing or expired
+
+        Returns:
+            The cached value or default
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at <= self.timer():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting expired and then oldest entries when full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Lifetime in seconds (defaults to the cache TTL)
+        """
+        now = self.timer()
+        with self._lock:
+            self._data.pop(key, None)
+            if len(self._data) >= self.maxsize:
+                self._evict(now)
+            self._data[key] = (now + (self.ttl if ttl is None else ttl), value)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Remove a key and return its value if it had not expired.
+
+        Args:
+            key: Cache key
+            default: Value returned when the key is missing or expired
+
+        Returns:
+            The removed value or default
+        """
+        with self._lock:
+            item = self._data.pop(key, None)
+            if item is None or item[0] <= self.timer():
+                return default
+            return item[1]
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def _evict(self, now: float) -> None:
+        # Entries are kept in the order they were set, so with the default
+        # TTL the expired ones are all at the front
+        while self._data:
+            key, (expires_at, _) = next(iter(self._data.items()))
+            if expires_at > now:
+                break
+            del self._data[key]
+        while len(self._data) >= self.maxsize:
+            self._data.popitem(last=False)
+
+
+_MISSING = object()